@@ -0,0 +1,112 @@
+"""Chart image export benchmark: matplotlib/Agg engine vs Plotly/kaleido.
+
+Renders the gauge, donut and volume breakdown PNGs for a batch of
+synthetic projects with each engine:
+
+- agg serial: in this process, one project after another
+- agg parallel: across a RenderQueue process pool (cold pool, then warm)
+- kaleido serial: the app's Plotly figures through pio.write_image
+  (skipped with the reason when kaleido or Chrome is unavailable)
+
+    python benchmarks/chart_export_benchmark.py [--projects 12] [--workers 4]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dva_core  # noqa: E402
+from dva_core.mpl_charts import CHART_FILES  # noqa: E402
+
+
+def synthetic_projects(count, seed=7):
+    rng = random.Random(seed)
+    projects = []
+    for i in range(count):
+        length, width, height = (rng.uniform(4, 24) for _ in range(3))
+        box_mm3 = dva_core.units.convert(length * width * height, 'cubic inches', 'cubic mm')
+        projects.append(dva_core.normalize_project({
+            'project_number': 1000 + i,
+            'box_length': length, 'box_width': width, 'box_height': height,
+            'box_volume_mm3': box_mm3,
+            'total_product_volume_mm3': box_mm3 * rng.uniform(0.2, 0.98),
+        }))
+    return projects
+
+
+def report(name, seconds, projects):
+    images = projects * len(CHART_FILES)
+    print(f"{name:<22} {seconds:7.2f} s  {seconds / projects * 1000:7.0f} ms/project  "
+          f"{images / seconds:6.1f} images/s")
+
+
+def bench_agg_serial(projects, root):
+    start = time.perf_counter()
+    for project in projects:
+        dva_core.jobs.render_project_charts(project, root)
+    return time.perf_counter() - start
+
+
+def bench_agg_parallel(projects, root, workers):
+    queue = dva_core.RenderQueue(workers)
+    args = [(project, root) for project in projects]
+    try:
+        timings = []
+        for _ in range(2):
+            start = time.perf_counter()
+            jobs = queue.run_batch('charts', dva_core.jobs.render_project_charts, args)
+            timings.append(time.perf_counter() - start)
+            failed = [job.error for job in jobs if job.status != 'done']
+            if failed:
+                raise RuntimeError(failed[0])
+        return timings
+    finally:
+        queue.shutdown()
+
+
+def bench_kaleido(projects, root):
+    from dva_core import plotly_charts
+
+    start = time.perf_counter()
+    for project in projects:
+        metrics = dva_core.project_metrics(project)
+        unit = project['box_result_unit']
+        box_vol = dva_core.units.from_mm3(metrics['box_volume_mm3'], unit)
+        product_vol = dva_core.units.from_mm3(metrics['product_volume_mm3'], unit)
+        charts = [
+            ('chart_gauge.png', plotly_charts.create_efficiency_gauge(metrics['efficiency_pct']), 350, 250),
+            ('chart_donut.png', plotly_charts.create_donut_chart(metrics['efficiency_pct']), 350, 250),
+            ('chart_breakdown.png', plotly_charts.create_volume_comparison_chart(box_vol, product_vol, unit), 700, 200),
+        ]
+        dva_core.jobs.export_chart_images_kaleido(
+            os.path.join(root, f"project_{project['project_number']}"),
+            [(name, fig.to_json(), w, h) for name, fig, w, h in charts])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--projects', type=int, default=12)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    projects = synthetic_projects(args.projects)
+    print(f"{args.projects} projects x {len(CHART_FILES)} charts, {args.workers} workers, "
+          f"{os.cpu_count()} CPUs")
+    with tempfile.TemporaryDirectory() as root:
+        report('agg serial', bench_agg_serial(projects, root), args.projects)
+        cold, warm = bench_agg_parallel(projects, root, args.workers)
+        report('agg parallel (cold)', cold, args.projects)
+        report('agg parallel (warm)', warm, args.projects)
+        try:
+            report('kaleido serial', bench_kaleido(projects, root), args.projects)
+        except Exception as e:
+            print(f"{'kaleido serial':<22} unavailable: {type(e).__name__}: {' '.join(str(e).split())[:120]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Cold-start benchmark: time to first render of streamlit_app.py.
+
+Each run starts a fresh Python process in a scratch copy of the app, then
+times `import streamlit` plus one full script run through Streamlit's
+AppTest harness (the same work the server does for a new session). It
+also lists which heavy libraries that first render imported.
+
+    python benchmarks/startup_benchmark.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['pandas', 'pyarrow', 'matplotlib', 'plotly.express', 'plotly.graph_objects']
+
+RUN_ONCE = """
+import json, sys, time
+start = time.perf_counter()
+import streamlit
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+at = AppTest.from_file('streamlit_app.py', default_timeout=120).run()
+rendered = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - start,
+    'first_render_s': rendered - start,
+    'exceptions': len(at.exception),
+    'loaded': [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def run_once(workdir):
+    """One cold start in a new interpreter; returns its timing dict"""
+    result = subprocess.run([sys.executable, '-c', RUN_ONCE], cwd=workdir,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        shutil.copy(os.path.join(REPO_ROOT, 'streamlit_app.py'), workdir)
+        shutil.copytree(os.path.join(REPO_ROOT, 'dva_core'), os.path.join(workdir, 'dva_core'),
+                        ignore=shutil.ignore_patterns('__pycache__'))
+        # First run seeds the data stores and bytecode caches; it is not counted
+        warmup = run_once(workdir)
+        runs = [run_once(workdir) for _ in range(args.runs)]
+
+    renders = [r['first_render_s'] for r in runs]
+    imports = [r['import_s'] for r in runs]
+    print(f"runs: {args.runs}")
+    print(f"import streamlit:     median {statistics.median(imports) * 1000:7.0f} ms")
+    print(f"time to first render: median {statistics.median(renders) * 1000:7.0f} ms "
+          f"(min {min(renders) * 1000:.0f}, max {max(renders) * 1000:.0f})")
+    print(f"individual runs (ms): {', '.join(f'{t * 1000:.0f}' for t in renders)}")
+    print(f"heavy modules loaded: {', '.join(warmup['loaded']) or 'none'}")
+    if any(r['exceptions'] for r in runs):
+        print("warning: the app raised exceptions during the first render")
+
+
+if __name__ == '__main__':
+    main()
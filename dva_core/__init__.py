@@ -0,0 +1,105 @@
+"""Streamlit-free compute core of the Displacement Volume Analyzer.
+
+Importable from batch jobs and worker processes; the Streamlit app is a
+thin UI over these functions. The sample table helpers need pandas and
+are imported on first access, so importing the package stays cheap.
+"""
+import importlib
+
+from . import units
+from .efficiency import EfficiencyBand, efficiency_band, gauge_band
+from .figure_cache import FigureCache
+from .jobs import RenderJob, RenderQueue
+from .project_cache import SharedProjectCache
+from .project_frame import ProjectFrame
+from .project_index import ProjectIndex
+from .project_journal import JournaledProjectStore
+from .project_store import (
+    JsonProjectStore,
+    SqliteProjectStore,
+    migrate_json_to_sqlite,
+    open_project_store,
+)
+from .records import PROJECT_DEFAULTS, normalize_project, project_metrics
+from .volume import (
+    BOX_EDGES,
+    VOLUME_COLUMNS,
+    WEIGHT_UNITS,
+    box_volume_mm3,
+    calculate_volume,
+    calculate_volumes_batch,
+    volume_breakdown,
+    volume_breakdown_batch,
+    volume_efficiency,
+)
+
+__all__ = [
+    'units',
+    'EfficiencyBand',
+    'efficiency_band',
+    'gauge_band',
+    'FigureCache',
+    'RenderJob',
+    'RenderQueue',
+    'JournaledProjectStore',
+    'JsonProjectStore',
+    'SqliteProjectStore',
+    'migrate_json_to_sqlite',
+    'open_project_store',
+    'SharedProjectCache',
+    'ProjectFrame',
+    'ProjectIndex',
+    'PROJECT_DEFAULTS',
+    'normalize_project',
+    'project_metrics',
+    'PARQUET_AVAILABLE',
+    'JsonSampleStore',
+    'ParquetSampleStore',
+    'migrate_json_samples',
+    'open_sample_store',
+    'typed_samples',
+    'SAMPLE_CSV_COLUMNS',
+    'filter_samples',
+    'iter_sample_import',
+    'normalize_sample_columns',
+    'paginate',
+    'prepare_sample_import',
+    'BOX_EDGES',
+    'VOLUME_COLUMNS',
+    'WEIGHT_UNITS',
+    'box_volume_mm3',
+    'calculate_volume',
+    'calculate_volumes_batch',
+    'volume_breakdown',
+    'volume_breakdown_batch',
+    'volume_efficiency',
+]
+
+# Exports loaded on first attribute access (PEP 562): name -> submodule
+_LAZY_EXPORTS = {
+    'PARQUET_AVAILABLE': 'sample_store',
+    'JsonSampleStore': 'sample_store',
+    'ParquetSampleStore': 'sample_store',
+    'migrate_json_samples': 'sample_store',
+    'open_sample_store': 'sample_store',
+    'typed_samples': 'sample_store',
+    'SAMPLE_CSV_COLUMNS': 'samples',
+    'filter_samples': 'samples',
+    'iter_sample_import': 'samples',
+    'normalize_sample_columns': 'samples',
+    'paginate': 'samples',
+    'prepare_sample_import': 'samples',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
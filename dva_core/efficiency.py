@@ -0,0 +1,39 @@
+"""Efficiency classification shared by the charts, overview and reports."""
+from collections import namedtuple
+
+EfficiencyBand = namedtuple('EfficiencyBand', ['label', 'color'])
+
+# (lower bound %, band), checked top-down
+EFFICIENCY_BANDS = [
+    (85, EfficiencyBand('Excellent', '#10b981')),
+    (75, EfficiencyBand('Good', '#3b82f6')),
+    (60, EfficiencyBand('Fair', '#f59e0b')),
+    (float('-inf'), EfficiencyBand('Poor', '#ef4444')),
+]
+
+# Finer scale used by the efficiency gauge
+GAUGE_BANDS = [
+    (95, EfficiencyBand('OPTIMAL', '#10b981')),
+    (85, EfficiencyBand('EXCELLENT', '#3b82f6')),
+    (75, EfficiencyBand('GOOD', '#8b5cf6')),
+    (60, EfficiencyBand('MODERATE', '#f59e0b')),
+    (40, EfficiencyBand('POOR', '#f97316')),
+    (float('-inf'), EfficiencyBand('CRITICAL', '#ef4444')),
+]
+
+
+def _classify(pct, bands):
+    for lower, band in bands:
+        if pct >= lower:
+            return band
+    return bands[-1][1]
+
+
+def efficiency_band(efficiency_pct):
+    """Excellent/Good/Fair/Poor band and color for a volume efficiency"""
+    return _classify(efficiency_pct, EFFICIENCY_BANDS)
+
+
+def gauge_band(efficiency_pct):
+    """OPTIMAL..CRITICAL status and color used by the efficiency gauge"""
+    return _classify(efficiency_pct, GAUGE_BANDS)
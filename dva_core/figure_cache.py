@@ -0,0 +1,87 @@
+"""Bounded LRU cache of serialized chart figures.
+
+Figure builders are pure functions of a few numbers and a unit string,
+so identical inputs across reruns, sections and tabs can share one
+serialized figure. Numeric inputs are rounded to a fixed number of
+significant digits for the key only, so float noise from unit conversions
+still hits; the builder always gets the original values. Entries are
+evicted least-recently-used once either the entry count or the total
+JSON size passes its limit. stats() reports hits, misses, evictions and
+the current size; the app shows them under "Debug Figure Cache".
+"""
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 256
+# Keys tell apart any values that display differently, but not float noise
+DEFAULT_SIGNIFICANT_DIGITS = 12
+
+
+def round_input(value, digits=DEFAULT_SIGNIFICANT_DIGITS):
+    """Round floats to significant digits; other values pass through"""
+    if isinstance(value, float):
+        return float(f"{value:.{digits}g}")
+    return value
+
+
+class FigureCache:
+    """Thread-safe, size-aware LRU of figure JSON keyed on builder and rounded inputs"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_entries=DEFAULT_MAX_ENTRIES,
+                 digits=DEFAULT_SIGNIFICANT_DIGITS):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.digits = digits
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_json(self, builder, *args, **kwargs):
+        """Serialized figure for builder(*args, **kwargs), built only on a miss"""
+        # Keyed on the builder's code too, so an edited builder never serves stale figures
+        key = (builder.__qualname__, hash(builder.__code__.co_code),
+               tuple(round_input(a, self.digits) for a in args),
+               tuple(sorted((k, round_input(v, self.digits)) for k, v in kwargs.items())))
+
+        with self._lock:
+            figure_json = self._entries.get(key)
+            if figure_json is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return figure_json
+            self.misses += 1
+
+        # Build outside the lock; two sessions missing together both build once
+        figure_json = builder(*args, **kwargs).to_json()
+
+        with self._lock:
+            if key not in self._entries and len(figure_json) <= self.max_bytes:
+                self._entries[key] = figure_json
+                self._bytes += len(figure_json)
+                while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= len(evicted)
+                    self.evictions += 1
+        return figure_json
+
+    def stats(self):
+        """Lookup counters since start-up plus the current entry count and JSON bytes"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
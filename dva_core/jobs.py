@@ -0,0 +1,247 @@
+"""Background render jobs on a local process pool.
+
+RenderQueue runs snapshot and chart-image rendering in worker processes
+so a save returns immediately. Every submitted job gets a RenderJob record
+whose status moves queued -> running -> done or failed; callers poll it
+with job(). A failed attempt is retried up to max_retries times, and a
+worker crash replaces the pool before the retry. on_success callbacks run
+in the parent process once the result is in, e.g. to attach artifact
+paths to a project record.
+
+The task functions at the bottom are what the workers execute; they only
+take plain, picklable arguments. Chart images render with matplotlib
+(export_chart_images) by default; export_chart_images_kaleido keeps the
+Plotly/kaleido path, which needs Chrome.
+"""
+import itertools
+import multiprocessing
+import os
+import site
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+DEFAULT_WORKERS = 2
+DEFAULT_RETRIES = 2
+
+# Errors a retry cannot fix: a missing renderer stays missing
+PERMANENT_ERRORS = (ImportError, TypeError, ValueError)
+
+# Stand-in __main__ while workers start; it has no file, so they skip re-running it
+_WORKER_MAIN = types.ModuleType('__mp_worker_main__')
+_spawn_lock = threading.Lock()
+# Workers put this on their sys.path at startup and import tasks from dva_core by name
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _submit(pool, task, args):
+    """pool.submit, keeping the app script out of newly spawned workers.
+
+    Streamlit installs the running script as sys.modules['__main__'], and a
+    spawned worker re-executes __main__ on startup. Workers are only spawned
+    inside submit(), so __main__ is swapped out for that call.
+    """
+    with _spawn_lock:
+        main = sys.modules['__main__']
+        sys.modules['__main__'] = _WORKER_MAIN
+        try:
+            return pool.submit(task, *args)
+        finally:
+            # Leave it alone if a new script run installed its own __main__ meanwhile
+            if sys.modules['__main__'] is _WORKER_MAIN:
+                sys.modules['__main__'] = main
+
+
+class RenderJob:
+    """Status and outcome of one queued render"""
+
+    def __init__(self, job_id, kind, project_number):
+        self.id = job_id
+        self.kind = kind
+        self.project_number = project_number
+        self.status = 'queued'
+        self.attempts = 0
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self._finished = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'failed')
+
+    def wait(self, timeout=None):
+        """Block until the job is done or failed; returns whether it finished"""
+        return self._finished.wait(timeout)
+
+
+class RenderQueue:
+    """Process-pool job queue with per-job status and retry on failure"""
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, max_retries=DEFAULT_RETRIES):
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._pool = None
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # Workers are started lazily, on the first submit. Spawned, not
+                # forked: the Streamlit server is multithreaded. The parent's
+                # sys.path is no help: Streamlit only has the app directory on
+                # it while a script runs, so each worker adds the package root
+                # itself (a stdlib initializer, importable before dva_core is).
+                self._pool = ProcessPoolExecutor(self.max_workers,
+                                                 mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=site.addsitedir,
+                                                 initargs=(_PACKAGE_ROOT,))
+            return self._pool
+
+    def _reset_pool(self, broken):
+        with self._lock:
+            if self._pool is broken:
+                self._pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, kind, task, *args, project_number=None, on_success=None):
+        """Queue task(*args) in a worker process; returns the RenderJob at once"""
+        job = RenderJob(next(self._ids), kind, project_number)
+        with self._lock:
+            self._jobs[job.id] = job
+        threading.Thread(target=self._run, args=(job, task, args, on_success),
+                         name=f'render-job-{job.id}', daemon=True).start()
+        return job
+
+    def _run(self, job, task, args, on_success):
+        while True:
+            job.attempts += 1
+            pool = self._get_pool()
+            try:
+                future = _submit(pool, task, args)
+                job.status = 'running'
+                result = future.result()
+            except BrokenProcessPool as e:
+                # A worker died (e.g. out of memory); the whole pool is unusable
+                self._reset_pool(pool)
+                error = e
+            except Exception as e:
+                error = e
+            else:
+                try:
+                    if on_success is not None:
+                        on_success(result)
+                except Exception as e:
+                    job.error = f"Rendered, but attaching the result failed: {e}"
+                job.result = result
+                job.status = 'done'
+                break
+            if isinstance(error, PERMANENT_ERRORS) or job.attempts > self.max_retries:
+                job.error = f"{type(error).__name__}: {error}"
+                job.status = 'failed'
+                break
+            job.status = 'queued'
+        job.finished_at = time.time()
+        job._finished.set()
+
+    def run_batch(self, kind, task, arg_tuples, timeout=None):
+        """Run task(*args) for every args tuple across the pool and wait for all.
+
+        Returns the RenderJobs in input order; check each status, since a
+        failed job does not stop the others.
+        """
+        jobs = [self.submit(kind, task, *args) for args in arg_tuples]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for job in jobs:
+            job.wait(None if deadline is None else max(0, deadline - time.monotonic()))
+        return jobs
+
+    def job(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, project_number=None):
+        """All jobs, or the jobs of one project, oldest first"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        if project_number is not None:
+            jobs = [j for j in jobs if j.project_number == project_number]
+        return jobs
+
+    def prune(self, max_age_s=3600):
+        """Forget finished jobs older than max_age_s"""
+        cutoff = time.time() - max_age_s
+        with self._lock:
+            for job_id, job in list(self._jobs.items()):
+                if job.finished and job.finished_at < cutoff:
+                    del self._jobs[job_id]
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+# ── Worker tasks ─────────────────────────────────────────────────────────
+def render_snapshot(length, width, height, product_volume_pct, dimension_unit, project_number):
+    """Render the matplotlib 3D snapshot; returns its path"""
+    from .mpl_charts import create_3d_snapshot
+    return create_3d_snapshot(length, width, height, product_volume_pct,
+                              dimension_unit, project_number=project_number)
+
+
+def export_chart_images(project_dir, efficiency_pct, box_volume, product_volume, unit):
+    """Render the gauge, donut and breakdown PNGs with matplotlib; returns {filename: path}"""
+    from .mpl_charts import render_chart_images
+    return render_chart_images(efficiency_pct, box_volume, product_volume, unit, project_dir)
+
+
+def render_project_charts(project, root='dva_projects', snapshot=False):
+    """Render every chart image for a saved project record into root/project_{N}.
+
+    Volumes are shown in the project's result unit. With snapshot=True the
+    3D preview is rendered too (always into dva_projects, like the app).
+    Returns {filename: path}.
+    """
+    from .mpl_charts import render_chart_images
+    from .records import normalize_project, project_metrics
+    from .units import from_mm3
+
+    record = normalize_project(project)
+    metrics = project_metrics(record)
+    unit = record['box_result_unit']
+    paths = render_chart_images(metrics['efficiency_pct'],
+                                from_mm3(metrics['box_volume_mm3'], unit),
+                                from_mm3(metrics['product_volume_mm3'], unit),
+                                unit, os.path.join(root, f"project_{record['project_number']}"))
+    if snapshot:
+        path = render_snapshot(record['box_length'], record['box_width'], record['box_height'],
+                               metrics['efficiency_pct'], record['dimension_unit'],
+                               record['project_number'])
+        paths[os.path.basename(path)] = path
+    return paths
+
+
+def export_chart_images_kaleido(project_dir, charts):
+    """Write Plotly figures to PNG with kaleido (needs Chrome).
+
+    charts is a list of (filename, figure_json, width, height). Returns
+    {filename: path} for the written images.
+    """
+    import plotly.io as pio
+
+    os.makedirs(project_dir, exist_ok=True)
+    paths = {}
+    for filename, figure_json, width, height in charts:
+        path = os.path.join(project_dir, filename)
+        pio.write_image(pio.from_json(figure_json, skip_invalid=True), path, format='png',
+                        width=width, height=height, scale=2)
+        paths[filename] = path
+    return paths
@@ -0,0 +1,291 @@
+"""Matplotlib renderers: the 3D volume snapshot and static PDF chart images.
+
+This is the default chart export engine. It draws on Agg canvases, so it
+needs neither kaleido nor a browser, and every call uses its own Figure,
+so worker processes and threads can render in parallel. Importing this
+module loads matplotlib (about a second on a cold start), so callers
+import it only when they render.
+"""
+import os
+import threading
+
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend for server-side rendering
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from mpl_toolkits.mplot3d import Axes3D  # noqa: F401  (registers the 3d projection)
+from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
+
+from .efficiency import gauge_band
+from .volume import BOX_EDGES
+
+# One snapshot figure per process, shared by all sessions
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def _figure(figsize, facecolor):
+    """Agg-backed figure with one axes, outside pyplot's global figure registry"""
+    fig = Figure(figsize=figsize, facecolor=facecolor)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot(111)
+
+
+def _snapshot_template():
+    """Figure and 3D axes for snapshots, configured once per process and reused.
+
+    Callers hold _snapshot_lock while drawing and saving.
+    """
+    global _snapshot
+    if _snapshot is not None:
+        return _snapshot
+    fig_m = Figure(figsize=(7, 5), facecolor='#0f172a')
+    FigureCanvasAgg(fig_m)
+    ax    = fig_m.add_subplot(111, projection='3d')
+    ax.set_facecolor('#0f172a')
+    ax.grid(False)
+    for pane in (ax.xaxis.pane, ax.yaxis.pane, ax.zaxis.pane):
+        pane.fill = False
+        pane.set_edgecolor('none')
+    ax.set_axis_off()
+    # Layer by explicit zorder (fill < grid/leaders < edges) like separate ax.plot lines
+    ax.computed_zorder = False
+    fig_m.tight_layout(pad=0)
+    _snapshot = (fig_m, ax)
+    return _snapshot
+
+
+def create_3d_snapshot(length, width, height, product_volume_pct,
+                        dimension_unit='inches', project_number=None,
+                        elev=22, azim=-55):
+    """
+    Render a static PNG of the 3D volume preview using matplotlib.
+    Saves to dva_projects/project_{N}/3d_preview.png and returns the path.
+    
+    Parameters:
+    - elev: Camera elevation angle in degrees (default: 22)
+    - azim: Camera azimuth angle in degrees (default: -55)
+    """
+    l, w, h = length/2, width/2, height/2
+
+    # Box wireframe (blue)
+    bv = [[-l,-w,-h],[l,-w,-h],[l,w,-h],[-l,w,-h],
+          [-l,-w, h],[l,-w, h],[l,w, h],[-l,w, h]]
+    edge_segments = [[bv[a], bv[b]] for a, b in BOX_EDGES]
+
+    # Grid (light grey, same 3-face pattern as interactive view)
+    gc = '#4b5563'
+    n  = 5
+    grid_segments = []
+    for i in range(n+1):
+        gx=-l+2*l*i/n; gy=-w+2*w*i/n; gz=-h+2*h*i/n
+        grid_segments += [
+            [[-l,gy,-h],[l,gy,-h]], [[gx,-w,-h],[gx,w,-h]],
+            [[gx,-w,-h],[gx,-w,h]], [[-l,-w,gz],[l,-w,gz]],
+            [[-l,-w,gz],[-l,w,gz]], [[-l,gy,-h],[-l,gy,h]],
+        ]
+
+    # Dimension callout leaders (length, width, height)
+    tc = '#b0b8c4'
+    callout_segments = [
+        [[0, -w, -h], [0, -w*1.2, -h*1.15]],
+        [[l, 0, -h], [l*1.2, 0, -h*1.1]],
+        [[-l, w, 0], [-l*1.2, w*1.15, 0]],
+    ]
+
+    with _snapshot_lock:
+        fig_m, ax = _snapshot_template()
+        # Drop the previous snapshot's artists; axes styling is kept
+        for artist in [*ax.collections, *ax.texts]:
+            artist.remove()
+
+        # One collection per line style instead of one artist per segment
+        ax.add_collection3d(Line3DCollection(edge_segments, colors='#3b82f6', linewidths=1.8, zorder=3))
+        ax.add_collection3d(Line3DCollection(grid_segments, colors=gc, linewidths=0.5, alpha=0.6, zorder=2))
+        ax.add_collection3d(Line3DCollection(callout_segments, colors=tc, linewidths=1.5, zorder=2))
+
+        # Liquid fill (green)
+        if product_volume_pct > 0:
+            fh = -h + height * (product_volume_pct / 100)
+            def quad(a,b,c,d): return [list(a),list(b),list(c),list(d)]
+            faces = [
+                quad([-l,-w,-h],[l,-w,-h],[l,w,-h],[-l,w,-h]),
+                quad([-l,-w,fh],[l,-w,fh],[l,w,fh],[-l,w,fh]),
+                quad([-l,-w,-h],[l,-w,-h],[l,-w,fh],[-l,-w,fh]),
+                quad([-l, w,-h],[l, w,-h],[l, w,fh],[-l, w,fh]),
+                quad([-l,-w,-h],[-l,w,-h],[-l,w,fh],[-l,-w,fh]),
+                quad([l,-w,-h],[l,w,-h],[l,w,fh],[l,-w,fh]),
+            ]
+            ax.add_collection3d(Poly3DCollection(faces, alpha=0.35,
+                facecolor='#10b981', edgecolor='#059669', lw=0.5, zorder=1))
+
+        # Collections don't autoscale like ax.plot, so fit the limits to the segments
+        points = np.asarray(edge_segments + callout_segments, dtype=float).reshape(-1, 3)
+        ax.auto_scale_xyz(points[:, 0], points[:, 1], points[:, 2], had_data=False)
+
+        # Use provided camera angles
+        ax.view_init(elev=elev, azim=azim)
+        ax.set_box_aspect([length, width, height])
+
+        ax.text(0, -w*1.2, -h*1.15, f'L {length:.0f} {dimension_unit}',
+                color=tc, fontsize=8, ha='center', va='top', weight='bold')
+        ax.text(l*1.2, 0, -h*1.1, f'W {width:.0f} {dimension_unit}',
+                color=tc, fontsize=8, ha='left', va='center', weight='bold')
+        ax.text(-l*1.2, w*1.15, 0, f'H {height:.0f} {dimension_unit}',
+                color=tc, fontsize=8, ha='right', va='center', weight='bold')
+
+        if project_number is not None:
+            folder = os.path.join('dva_projects', f'project_{project_number}')
+        else:
+            folder = os.path.join('dva_projects', 'unsaved')
+        os.makedirs(folder, exist_ok=True)
+        img_path = os.path.join(folder, '3d_preview.png')
+        fig_m.savefig(img_path, dpi=150, bbox_inches='tight',
+                      facecolor='#0f172a', edgecolor='none')
+    return img_path
+
+
+def create_pdf_efficiency_gauge_matplotlib(efficiency_pct, output_path):
+    """Create efficiency gauge using matplotlib for PDF"""
+    fig, ax = _figure(figsize=(3.5, 2.5), facecolor='white')
+    ax.set_xlim(-1.2, 1.2)
+    ax.set_ylim(-0.2, 1.2)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    
+    # Background arc (grey)
+    theta = np.linspace(0, 180, 100)
+    x_bg = np.cos(np.radians(theta))
+    y_bg = np.sin(np.radians(theta))
+    ax.fill_between(x_bg, 0, y_bg, color='#e5e7eb', alpha=0.3)
+    
+    # Efficiency arc, colored like the app's gauge
+    _, color = gauge_band(efficiency_pct)
+    
+    theta_fill = np.linspace(0, 180 * (min(max(efficiency_pct, 0), 100) / 100), 100)
+    x_fill = np.cos(np.radians(theta_fill))
+    y_fill = np.sin(np.radians(theta_fill))
+    ax.fill_between(x_fill, 0, y_fill, color=color, alpha=0.8)
+    
+    # Border arc
+    ax.plot(x_bg, y_bg, color='#374151', linewidth=2)
+    
+    # Center text
+    ax.text(0, 0.3, f'{efficiency_pct:.1f}%', 
+            ha='center', va='center', fontsize=24, fontweight='bold', color='#1f2937')
+    ax.text(0, 0.05, 'Volume Efficiency', 
+            ha='center', va='center', fontsize=9, color='#6b7280')
+    
+    # Tick marks
+    for i in range(0, 101, 25):
+        angle = np.radians(180 * (i / 100))
+        x1, y1 = np.cos(angle) * 0.95, np.sin(angle) * 0.95
+        x2, y2 = np.cos(angle) * 1.05, np.sin(angle) * 1.05
+        ax.plot([x1, x2], [y1, y2], color='#374151', linewidth=1.5)
+        ax.text(x2 * 1.15, y2 * 1.15, f'{i}%', 
+                ha='center', va='center', fontsize=7, color='#6b7280')
+    
+    fig.tight_layout(pad=0.1)
+    fig.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white')
+    return output_path
+
+
+def create_pdf_donut_chart_matplotlib(efficiency_pct, output_path):
+    """Create donut chart using matplotlib for PDF"""
+    fig, ax = _figure(figsize=(3.5, 2.5), facecolor='white')
+    
+    # Data
+    used_pct = min(max(efficiency_pct, 0), 100)
+    sizes = [used_pct, 100 - used_pct]
+    colors = ['#10b981', '#3b82f6']
+    labels = ['Product', 'Remaining']
+    
+    # Create donut
+    wedges, texts = ax.pie(sizes, colors=colors, startangle=90, 
+                            counterclock=False, wedgeprops=dict(width=0.5))
+    
+    # Center text
+    ax.text(0, 0.1, f'{efficiency_pct:.1f}%', 
+            ha='center', va='center', fontsize=20, fontweight='bold', color='#1f2937')
+    ax.text(0, -0.15, 'Efficiency', 
+            ha='center', va='center', fontsize=8, color='#6b7280')
+    
+    # Legend
+    ax.legend(labels, loc='upper right', fontsize=8, frameon=False)
+    
+    ax.set_aspect('equal')
+    fig.tight_layout(pad=0.1)
+    fig.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white')
+    return output_path
+
+
+def create_pdf_breakdown_bar_matplotlib(box_vol, product_vol, unit, output_path):
+    """Create volume breakdown bar using matplotlib for PDF"""
+    fig, ax = _figure(figsize=(7, 2), facecolor='white')
+    
+    remaining_vol = box_vol - product_vol
+    
+    # Bar dimensions
+    bar_height = 0.6
+    y_pos = 0.5
+    
+    # Box volume bar (background)
+    ax.barh(y_pos, box_vol, height=bar_height, color='#3b82f6', alpha=0.3, 
+            edgecolor='#2563eb', linewidth=2)
+    
+    # Product volume bar
+    ax.barh(y_pos, product_vol, height=bar_height, color='#10b981', alpha=0.8,
+            edgecolor='#059669', linewidth=1.5)
+    
+    # Labels
+    ax.text(box_vol / 2, y_pos, f'Box: {box_vol:.2f} {unit}', 
+            ha='center', va='center', fontsize=10, fontweight='bold', color='#1e40af')
+    
+    if product_vol > box_vol * 0.1:  # Only show if big enough
+        ax.text(product_vol / 2, y_pos, f'Product: {product_vol:.2f}', 
+                ha='center', va='center', fontsize=9, color='white', fontweight='bold')
+    
+    if remaining_vol > box_vol * 0.05:
+        ax.text(product_vol + remaining_vol / 2, y_pos, f'Remaining: {remaining_vol:.2f}',
+                ha='center', va='center', fontsize=9, color='#1e40af')
+    
+    ax.set_xlim(0, max(box_vol, product_vol, 1e-9) * 1.05)
+    ax.set_ylim(0, 1)
+    ax.set_xlabel(f'Volume ({unit})', fontsize=10, color='#374151')
+    ax.set_title('Volume Breakdown', fontsize=11, fontweight='bold', color='#1f2937', pad=10)
+    ax.set_yticks([])
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_visible(False)
+    ax.grid(axis='x', alpha=0.3, linestyle='--')
+    
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white')
+    return output_path
+
+
+# Chart images exported per project, by kind
+CHART_FILES = {
+    'gauge': 'chart_gauge.png',
+    'donut': 'chart_donut.png',
+    'breakdown': 'chart_breakdown.png',
+}
+
+
+def render_chart_images(efficiency_pct, box_volume, product_volume, unit, output_dir,
+                        kinds=tuple(CHART_FILES)):
+    """Render the efficiency chart PNGs into output_dir; returns {filename: path}"""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for kind in kinds:
+        filename = CHART_FILES[kind]
+        path = os.path.join(output_dir, filename)
+        if kind == 'gauge':
+            create_pdf_efficiency_gauge_matplotlib(efficiency_pct, path)
+        elif kind == 'donut':
+            create_pdf_donut_chart_matplotlib(efficiency_pct, path)
+        else:
+            create_pdf_breakdown_bar_matplotlib(box_volume, product_volume, unit, path)
+        paths[filename] = path
+    return paths
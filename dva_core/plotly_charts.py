@@ -0,0 +1,755 @@
+"""Plotly chart builders for the analyzer, overview and results views.
+
+Each builder is a pure function of a few numbers and unit strings, so the
+app can serve them through the shared FigureCache and background workers
+can rebuild the same figures.
+"""
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from .efficiency import EFFICIENCY_BANDS, efficiency_band, gauge_band
+from .volume import BOX_EDGES, volume_breakdown_batch
+
+# Above this many projects the comparison figure draws WebGL (Scattergl) traces
+WEBGL_THRESHOLD = 150
+
+
+def create_efficiency_gauge(efficiency_percentage):
+    """Create animated gauge chart for volume efficiency"""
+    # Determine color and status
+    status, color = gauge_band(efficiency_percentage)
+    
+    fig = go.Figure(go.Indicator(
+        mode = "gauge+number+delta",
+        value = efficiency_percentage,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': f"<b>{status}</b>", 'font': {'size': 24, 'color': color}},
+        number = {
+            'suffix': "%",
+            'font': {'size': 48, 'color': color},
+            'valueformat': '.1f'
+        },
+        delta = {
+            'reference': 85,
+            'increasing': {'color': "#10b981"},
+            'decreasing': {'color': "#ef4444"}
+        },
+        gauge = {
+            'axis': {
+                'range': [None, 100],
+                'tickwidth': 2,
+                'tickcolor': "rgba(148, 163, 184, 0.3)",
+                'tickfont': {'color': '#94a3b8', 'size': 12}
+            },
+            'bar': {'color': color, 'thickness': 0.7},
+            'bgcolor': "rgba(255,255,255,0.05)",
+            'borderwidth': 2,
+            'bordercolor': "rgba(148, 163, 184, 0.2)",
+            'steps': [
+                {'range': [0, 40], 'color': 'rgba(239, 68, 68, 0.1)'},
+                {'range': [40, 60], 'color': 'rgba(249, 115, 22, 0.1)'},
+                {'range': [60, 75], 'color': 'rgba(245, 158, 11, 0.1)'},
+                {'range': [75, 85], 'color': 'rgba(139, 92, 246, 0.1)'},
+                {'range': [85, 95], 'color': 'rgba(59, 130, 246, 0.1)'},
+                {'range': [95, 100], 'color': 'rgba(16, 185, 129, 0.1)'}
+            ],
+            'threshold': {
+                'line': {'color': "#60a5fa", 'width': 3},
+                'thickness': 0.75,
+                'value': 85
+            }
+        }
+    ))
+    
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font={'color': "#e2e8f0"},
+        height=300,
+        margin=dict(l=20, r=20, t=60, b=20)
+    )
+    
+    return fig
+
+
+def line_segments_trace(segments, color, width):
+    """One Scatter3d trace for many same-style segments, split by NaN gaps"""
+    points = np.asarray(segments, dtype=float).reshape(-1, 2, 3)
+    gaps = np.full((len(points), 1, 3), np.nan)
+    xyz = np.concatenate([points, gaps], axis=1).reshape(-1, 3)
+    return go.Scatter3d(
+        x=xyz[:, 0], y=xyz[:, 1], z=xyz[:, 2],
+        mode='lines',
+        line=dict(color=color, width=width),
+        showlegend=False,
+        hoverinfo='skip'
+    )
+
+
+def text_labels_trace(points, labels, textposition, textfont):
+    """One text-only Scatter3d trace for many labels sharing a font"""
+    xyz = np.asarray(points, dtype=float).reshape(-1, 3)
+    return go.Scatter3d(
+        x=xyz[:, 0], y=xyz[:, 1], z=xyz[:, 2],
+        mode='text', text=labels,
+        textfont=textfont,
+        textposition=textposition,
+        showlegend=False, hoverinfo='skip'
+    )
+
+
+def create_3d_box_visualization(length, width, height, product_volume_pct, dimension_unit='inches'):
+    """Create interactive 3D box with dimension labels"""
+    
+    # Determine color based on efficiency
+    box_color = efficiency_band(product_volume_pct).color
+    
+    # Define vertices of box (centered at origin)
+    l, w, h = length/2, width/2, height/2
+    vertices = [
+        [-l, -w, -h], [l, -w, -h], [l, w, -h], [-l, w, -h],  # Bottom
+        [-l, -w, h], [l, -w, h], [l, w, h], [-l, w, h]   # Top
+    ]
+    
+    fig = go.Figure()
+    
+    # Draw all 12 edges as one trace
+    fig.add_trace(line_segments_trace([[vertices[a], vertices[b]] for a, b in BOX_EDGES], box_color, 6))
+    
+    # Add semi-transparent faces
+    faces_i = [0, 0, 0, 0, 4, 4]
+    faces_j = [1, 3, 4, 1, 5, 7]
+    faces_k = [2, 7, 5, 5, 6, 6]
+    
+    fig.add_trace(go.Mesh3d(
+        x=[v[0] for v in vertices],
+        y=[v[1] for v in vertices],
+        z=[v[2] for v in vertices],
+        i=faces_i,
+        j=faces_j,
+        k=faces_k,
+        color=box_color,
+        opacity=0.15,
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    
+    # Dimension annotations — no efficiency label
+    # Length: label at LEFT end of the line
+    fig.add_trace(go.Scatter3d(
+        x=[-l, l],
+        y=[-w-0.3*w, -w-0.3*w],
+        z=[-h, -h],
+        mode='lines+text',
+        line=dict(color='#b0b8c4', width=2),
+        text=[f'{length:.1f} {dimension_unit}', ''],
+        textposition='top left',
+        textfont=dict(size=12, color='#b0b8c4'),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+
+    # Width: label BELOW the line (bottom center at far end)
+    fig.add_trace(go.Scatter3d(
+        x=[l+0.3*l, l+0.3*l],
+        y=[-w, w],
+        z=[-h, -h],
+        mode='lines+text',
+        line=dict(color='#b0b8c4', width=2),
+        text=['', f'{width:.1f} {dimension_unit}'],
+        textposition='bottom center',
+        textfont=dict(size=12, color='#b0b8c4'),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+
+    # Height: label at top (middle right)
+    fig.add_trace(go.Scatter3d(
+        x=[-l-0.3*l, -l-0.3*l],
+        y=[w, w],
+        z=[-h, h],
+        mode='lines+text',
+        line=dict(color='#b0b8c4', width=2),
+        text=['', f'{height:.1f} {dimension_unit}'],
+        textposition='middle right',
+        textfont=dict(size=12, color='#b0b8c4'),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    
+    fig.update_layout(
+        scene=dict(
+            xaxis=dict(visible=False, showgrid=False, zeroline=False, showticklabels=False),
+            yaxis=dict(visible=False, showgrid=False, zeroline=False, showticklabels=False),
+            zaxis=dict(visible=False, showgrid=False, zeroline=False, showticklabels=False),
+            bgcolor='rgba(15, 23, 42, 0.4)',
+            camera=dict(
+                eye=dict(x=1.5, y=1.5, z=1.2),
+                up=dict(x=0, y=0, z=1)
+            ),
+            aspectmode='data'
+        ),
+        height=486,  # Reduced by 19% total for better fit
+        margin=dict(l=0, r=0, t=0, b=0),
+        paper_bgcolor='rgba(0,0,0,0)',
+        showlegend=False
+    )
+    
+    return fig
+
+
+def create_3d_volume_preview(length, width, height, product_volume_pct, dimension_unit='inches', 
+                            product_volume=None, product_weight=None, product_quantity=1):
+    """Create clean 3D Volume Preview with liquid fill - ONLY measurement numbers on graphic"""
+    
+    # Colors
+    box_color = '#3b82f6'  # Blue for box
+    liquid_color = '#10b981'  # Green for liquid/product
+    
+    # Calculate liquid fill height based on volume percentage
+    fill_height = height * (product_volume_pct / 100)
+    
+    # Define vertices for SECONDARY PACKAGING BOX (full size, centered at origin)
+    l, w, h = length/2, width/2, height/2
+    box_vertices = [
+        [-l, -w, -h], [l, -w, -h], [l, w, -h], [-l, w, -h],  # Bottom
+        [-l, -w, h], [l, -w, h], [l, w, h], [-l, w, h]   # Top
+    ]
+    
+    fig = go.Figure()
+    
+    # === DRAW SECONDARY PACKAGING BOX (BLUE WIREFRAME) ===
+    # Line segments of one style are batched into a single NaN-separated trace
+    fig.add_trace(line_segments_trace([[box_vertices[a], box_vertices[b]] for a, b in BOX_EDGES], box_color, 6))
+    
+    # Add semi-transparent box faces
+    faces_i = [0, 0, 0, 0, 4, 4]
+    faces_j = [1, 3, 4, 1, 5, 7]
+    faces_k = [2, 7, 5, 5, 6, 6]
+    
+    fig.add_trace(go.Mesh3d(
+        x=[v[0] for v in box_vertices],
+        y=[v[1] for v in box_vertices],
+        z=[v[2] for v in box_vertices],
+        i=faces_i,
+        j=faces_j,
+        k=faces_k,
+        color=box_color,
+        opacity=0.08,
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    
+    # === DRAW LIQUID FILL (GREEN) - Product volume as liquid ===
+    if product_volume_pct > 0:
+        liquid_vertices = [
+            [-l, -w, -h], [l, -w, -h], [l, w, -h], [-l, w, -h],  # Bottom (same as box)
+            [-l, -w, -h + fill_height], [l, -w, -h + fill_height],  # Top of liquid
+            [l, w, -h + fill_height], [-l, w, -h + fill_height]
+        ]
+        
+        # Draw liquid as solid mesh (semi-transparent green)
+        fig.add_trace(go.Mesh3d(
+            x=[v[0] for v in liquid_vertices],
+            y=[v[1] for v in liquid_vertices],
+            z=[v[2] for v in liquid_vertices],
+            i=faces_i,
+            j=faces_j,
+            k=faces_k,
+            color=liquid_color,
+            opacity=0.4,
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+        
+        # Add liquid surface line (top edge of liquid)
+        liquid_surface_edges = [[4,5], [5,6], [6,7], [7,4]]  # Top edges
+        fig.add_trace(line_segments_trace(
+            [[liquid_vertices[a], liquid_vertices[b]] for a, b in liquid_surface_edges], liquid_color, 5))
+    
+    # === GRID PLANES (behind cube, dark grey) ===
+    num_ticks = 5
+    grid_col  = '#9ca3af'   # light grey for grid lines
+    scale_col = '#b0b8c4'   # light grey for rulers and labels
+
+    # Helper: collect a grid line (all drawn as one trace below)
+    grid_segments = []
+    def grid_line(x0,y0,z0, x1,y1,z1):
+        grid_segments.append([[x0, y0, z0], [x1, y1, z1]])
+
+    # Bottom face grid (z = -h plane) — x-rows and y-columns
+    for i in range(num_ticks + 1):
+        gx = -l + 2*l * i / num_ticks
+        gy = -w + 2*w * i / num_ticks
+        grid_line(-l, gy, -h,  l, gy, -h)   # row (along x)
+        grid_line(gx, -w, -h, gx,  w, -h)   # column (along y)
+
+    # Front face grid (y = -w plane) — x-columns and z-rows
+    for i in range(num_ticks + 1):
+        gx = -l + 2*l * i / num_ticks
+        gz = -h + 2*h * i / num_ticks
+        grid_line(gx, -w, -h, gx, -w,  h)   # column (along z)
+        grid_line(-l, -w, gz,  l, -w, gz)   # row (along x)
+
+    # Left face grid (x = -l plane) — y-columns and z-rows
+    for i in range(num_ticks + 1):
+        gy = -w + 2*w * i / num_ticks
+        gz = -h + 2*h * i / num_ticks
+        grid_line(-l, gy, -h, -l, gy,  h)   # column (along z)
+        grid_line(-l, -w, gz, -l,  w, gz)   # row (along y)
+
+    fig.add_trace(line_segments_trace(grid_segments, grid_col, 1.5))
+
+    # === DIMENSION CALLOUTS (lines pointing away from box ~20%) ══════════════
+    dim_col = '#b0b8c4'  # light grey for dimension labels and lines
+    
+    # Length callout: bottom front edge, extend down/forward 20%
+    # Width callout: right center edge, extend right 20%
+    # Height callout: left back edge, extend left/back 20%
+    callout_starts = [[0, -w, -h], [l, 0, -h], [-l, w, 0]]
+    callout_ends = [[0, -w * 1.2, -h * 1.15], [l * 1.2, 0, -h * 1.1], [-l * 1.2, w * 1.15, 0]]
+    fig.add_trace(line_segments_trace(list(zip(callout_starts, callout_ends)), dim_col, 2))
+    fig.add_trace(text_labels_trace(
+        callout_ends,
+        [f'L: {length:.1f} {dimension_unit}', f'W: {width:.1f} {dimension_unit}',
+         f'H: {height:.1f} {dimension_unit}'],
+        ['bottom center', 'middle right', 'middle left'],
+        dict(size=11, color=dim_col, family='Arial Black')))
+
+    # === NUMERIC SCALE LABELS (on grid edges) ═══════════════════════════════
+    label_col  = '#9ca3af'  # light grey matching grid
+    label_size = 9
+
+    scale_points, scale_labels, scale_positions = [], [], []
+    for i in range(num_ticks + 1):
+        # Length scale (bottom face, front edge y=-w)
+        scale_points.append([-l + 2*l * i / num_ticks, -w * 1.25, -h])
+        scale_labels.append(str(int(round(i * length / num_ticks))))
+        scale_positions.append('bottom center')
+        # Width scale (bottom face, right edge x=l)
+        scale_points.append([l * 1.25, -w + 2*w * i / num_ticks, -h])
+        scale_labels.append(str(int(round(i * width / num_ticks))))
+        scale_positions.append('middle right')
+        # Height scale (left face, back edge x=-l, y=w)
+        scale_points.append([-l * 1.25, w, -h + 2*h * i / num_ticks])
+        scale_labels.append(str(int(round(i * height / num_ticks))))
+        scale_positions.append('middle left')
+    fig.add_trace(text_labels_trace(scale_points, scale_labels, scale_positions,
+                                    dict(size=label_size, color=label_col)))
+
+    fig.update_layout(
+        scene=dict(
+            xaxis=dict(visible=False, showgrid=False, zeroline=False, showticklabels=False),
+            yaxis=dict(visible=False, showgrid=False, zeroline=False, showticklabels=False),
+            zaxis=dict(visible=False, showgrid=False, zeroline=False, showticklabels=False),
+            bgcolor='rgba(15, 23, 42, 0.4)',
+            camera=dict(
+                eye=dict(x=1.7, y=1.7, z=1.4),
+                up=dict(x=0, y=0, z=1)
+            ),
+            aspectmode='data'
+        ),
+        height=420,
+        margin=dict(l=0, r=0, t=0, b=0),
+        paper_bgcolor='rgba(0,0,0,0)',
+        showlegend=False
+    )
+    
+    return fig
+
+
+def create_volume_comparison_chart(box_volume, product_volume, unit='cubic inches'):
+    """Create horizontal stacked bar chart for volume comparison"""
+    efficiency = (product_volume / box_volume * 100) if box_volume > 0 else 0
+    remaining = box_volume - product_volume
+    
+    fig = go.Figure()
+    
+    # Product volume bar
+    fig.add_trace(go.Bar(
+        y=['Utilization'],
+        x=[product_volume],
+        name='Product Volume',
+        orientation='h',
+        marker=dict(
+            color='#3b82f6',
+            line=dict(color='#2563eb', width=2)
+        ),
+        text=f'{product_volume:.2f} {unit}<br>({efficiency:.1f}%)',
+        textposition='inside',
+        textfont=dict(color='white', size=14),
+        hovertemplate=f'Product: {product_volume:.2f} {unit}<br>Efficiency: {efficiency:.1f}%<extra></extra>'
+    ))
+    
+    # Remaining space bar
+    fig.add_trace(go.Bar(
+        y=['Utilization'],
+        x=[remaining],
+        name='Remaining Space',
+        orientation='h',
+        marker=dict(
+            color='#10b981' if remaining > 0 else '#ef4444',
+            line=dict(color='#059669' if remaining > 0 else '#dc2626', width=2)
+        ),
+        text=f'{remaining:.2f} {unit}<br>({100-efficiency:.1f}%)',
+        textposition='inside',
+        textfont=dict(color='white', size=14),
+        hovertemplate=f'Remaining: {remaining:.2f} {unit}<br>Free: {100-efficiency:.1f}%<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        barmode='stack',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#e2e8f0'),
+        xaxis=dict(
+            title=dict(text=f'Volume ({unit})', font=dict(color='#94a3b8')),
+            gridcolor='rgba(148, 163, 184, 0.2)',
+            zerolinecolor='rgba(148, 163, 184, 0.3)'
+        ),
+        yaxis=dict(
+            showticklabels=False,
+            showgrid=False
+        ),
+        height=150,
+        margin=dict(l=0, r=0, t=30, b=40),
+        showlegend=True,
+        legend=dict(
+            orientation='h',
+            yanchor='bottom',
+            y=1.02,
+            xanchor='center',
+            x=0.5,
+            font=dict(size=12)
+        ),
+        hovermode='closest'
+    )
+    
+    return fig
+
+
+def create_donut_chart(efficiency_percentage):
+    """Create donut chart for space distribution"""
+    remaining_pct = 100 - efficiency_percentage
+    
+    # Determine colors based on efficiency
+    product_color = efficiency_band(efficiency_percentage).color
+    
+    remaining_color = '#94a3b8' if remaining_pct > 0 else '#ef4444'
+    
+    fig = go.Figure(data=[go.Pie(
+        labels=['Product Volume', 'Free Space'],
+        values=[efficiency_percentage, remaining_pct],
+        hole=.6,
+        marker=dict(
+            colors=[product_color, remaining_color],
+            line=dict(color='rgba(10, 25, 41, 0.8)', width=3)
+        ),
+        textinfo='label+percent',
+        textfont=dict(size=13, color='white'),
+        hovertemplate='<b>%{label}</b><br>%{value:.1f}%<extra></extra>',
+        pull=[0.05, 0]
+    )])
+    
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#e2e8f0'),
+        showlegend=True,
+        legend=dict(
+            orientation='h',
+            yanchor='bottom',
+            y=-0.15,
+            xanchor='center',
+            x=0.5,
+            font=dict(size=12)
+        ),
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=60),
+        annotations=[dict(
+            text=f'<b>{efficiency_percentage:.1f}%</b><br><span style="font-size:12px">Filled</span>',
+            x=0.5, y=0.5,
+            font=dict(size=24, color=product_color),
+            showarrow=False
+        )]
+    )
+    
+    return fig
+
+
+def create_mini_efficiency_bar(efficiency_pct):
+    """Create mini horizontal bar chart for project efficiency"""
+    # Determine color based on efficiency
+    label, color = efficiency_band(efficiency_pct)
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=[efficiency_pct],
+        y=[''],
+        orientation='h',
+        marker=dict(
+            color=color,
+            line=dict(color='rgba(255,255,255,0.2)', width=1)
+        ),
+        hovertemplate=f'<b>{efficiency_pct:.1f}% Filled</b><br>{label} Efficiency<extra></extra>',
+        showlegend=False,
+        hoverlabel=dict(
+            bgcolor=color,
+            font=dict(color='white', size=14, family='DM Sans')
+        )
+    ))
+    
+    fig.update_layout(
+        xaxis=dict(
+            range=[0, 100],
+            showticklabels=False,
+            showgrid=False,
+            zeroline=False
+        ),
+        yaxis=dict(
+            showticklabels=False,
+            showgrid=False
+        ),
+        height=35,
+        margin=dict(l=0, r=0, t=0, b=0),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        hovermode='closest'
+    )
+    
+    return fig
+
+
+def create_volume_breakdown_bar(product_volume, remaining_volume, unit):
+    """Create volume breakdown stacked bar chart showing product vs remaining"""
+    total = product_volume + remaining_volume
+    product_pct = (product_volume / total * 100) if total > 0 else 0
+    remaining_pct = (remaining_volume / total * 100) if total > 0 else 0
+    
+    fig = go.Figure()
+    
+    # Product volume (filled portion) - GREEN (always green for product)
+    fig.add_trace(go.Bar(
+        x=[product_volume],
+        y=['Volume'],
+        orientation='h',
+        name='Product Volume',
+        marker=dict(color='#10b981'),  # Green for product
+        text=f'{product_volume:.2f} {unit}',
+        textposition='inside',
+        textfont=dict(size=18),  # 50% larger (was 12, now 18)
+        hovertemplate=f'<b>Product Volume</b><br>{product_volume:.2f} {unit}<br>{product_pct:.1f}%<extra></extra>',
+        showlegend=True
+    ))
+    
+    # Remaining volume (empty space) - BLUE
+    fig.add_trace(go.Bar(
+        x=[remaining_volume],
+        y=['Volume'],
+        orientation='h',
+        name='Remaining Space',
+        marker=dict(color='#3b82f6'),  # Blue for remaining
+        text=f'{remaining_volume:.2f} {unit}' if remaining_volume > 0 else '',
+        textposition='inside',
+        textfont=dict(size=18),  # 50% larger (was 12, now 18)
+        hovertemplate=f'<b>Remaining Space</b><br>{remaining_volume:.2f} {unit}<br>{remaining_pct:.1f}%<extra></extra>',
+        showlegend=True
+    ))
+    
+    fig.update_layout(
+        barmode='stack',
+        height=78,  # Increased by 30% from 60px for better legibility
+        margin=dict(l=0, r=0, t=0, b=0),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(
+            showticklabels=False,
+            showgrid=False,
+            zeroline=False
+        ),
+        yaxis=dict(
+            showticklabels=False,
+            showgrid=False
+        ),
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="center",
+            x=0.5,
+            font=dict(size=15)  # 50% larger legend (was 10, now 15)
+        ),
+        hovermode='closest'
+    )
+    
+    return fig
+
+
+def band_colors(efficiency_pct):
+    """efficiency_band colors for a whole array of efficiencies"""
+    pct = np.asarray(efficiency_pct, dtype=float)
+    return np.select([pct >= lower for lower, _ in EFFICIENCY_BANDS],
+                     [band.color for _, band in EFFICIENCY_BANDS],
+                     EFFICIENCY_BANDS[-1][1].color)
+
+
+def bar_segments(starts, ends, rows):
+    """x/y arrays drawing one horizontal segment per row, NaN-separated for a line trace"""
+    gap = np.full(len(rows), np.nan)
+    x = np.column_stack([starts, ends, gap]).ravel()
+    y = np.column_stack([rows, rows, gap]).ravel()
+    return x, y
+
+
+def create_volume_comparison_multiples(labels, product_volumes, box_volumes, unit,
+                                       webgl_threshold=WEBGL_THRESHOLD):
+    """One figure comparing every project: volume breakdown and efficiency side by side.
+
+    Takes parallel sequences (volumes already in unit). Up to webgl_threshold
+    projects get labelled stacked bars; above it each bar is a segment of a
+    Scattergl line trace and project names move to the hover text.
+    """
+    breakdown = volume_breakdown_batch(product_volumes, box_volumes)
+    product = breakdown['product_volume_mm3']
+    remaining = breakdown['remaining_volume_mm3']
+    efficiency = breakdown['efficiency_pct']
+    labels = np.asarray(labels, dtype=object)
+    count = len(labels)
+    rows = np.arange(count)
+    free = np.clip(remaining, 0, None)
+    overflow = np.clip(-remaining, 0, None)
+    colors = band_colors(efficiency)
+    webgl = count > webgl_threshold
+    height = int(min(120 + 26 * count, 1400))
+
+    fig = make_subplots(rows=1, cols=2, shared_yaxes=True, horizontal_spacing=0.04,
+                        column_widths=[0.72, 0.28],
+                        subplot_titles=(f'Volume ({unit})', 'Efficiency (%)'))
+    stacks = [('Product Volume', np.zeros(count), product, '#10b981'),
+              ('Remaining Space', product, product + free, '#3b82f6')]
+    if overflow.any():
+        stacks.append(('Overflow', product, product + overflow, '#ef4444'))
+
+    if webgl:
+        # Bars as thick line segments: one WebGL trace per series
+        width = max(1.0, 0.7 * (height - 120) / count)
+        for name, starts, ends, color in stacks:
+            x, y = bar_segments(starts, ends, rows)
+            fig.add_trace(go.Scattergl(
+                x=x, y=y, mode='lines', name=name,
+                line=dict(color=color, width=width),
+                customdata=np.repeat(labels, 3), text=np.repeat(ends - starts, 3),
+                hovertemplate=f'<b>%{{customdata}}</b><br>{name}: %{{text:,.2f}} {unit}<extra></extra>',
+            ), row=1, col=1)
+        fig.add_trace(go.Scattergl(
+            x=efficiency, y=rows, mode='markers', name='Efficiency', showlegend=False,
+            marker=dict(color=colors, size=max(3.0, min(width, 8.0))),
+            customdata=labels,
+            hovertemplate='<b>%{customdata}</b><br>Efficiency: %{x:.1f}%<extra></extra>',
+        ), row=1, col=2)
+    else:
+        for name, starts, ends, color in stacks:
+            fig.add_trace(go.Bar(
+                x=ends - starts, y=rows, base=starts, orientation='h', name=name,
+                marker=dict(color=color), customdata=labels,
+                hovertemplate=f'<b>%{{customdata}}</b><br>{name}: %{{x:,.2f}} {unit}<extra></extra>',
+            ), row=1, col=1)
+        fig.add_trace(go.Bar(
+            x=efficiency, y=rows, orientation='h', name='Efficiency', showlegend=False,
+            marker=dict(color=colors), customdata=labels,
+            text=[f'{e:.1f}%' for e in efficiency], textposition='inside',
+            textfont=dict(color='white'),
+            hovertemplate='<b>%{customdata}</b><br>Efficiency: %{x:.1f}%<extra></extra>',
+        ), row=1, col=2)
+
+    fig.update_layout(
+        barmode='overlay',
+        bargap=0.3,
+        height=height,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#e2e8f0'),
+        margin=dict(l=0, r=0, t=60, b=30),
+        legend=dict(orientation='h', yanchor='bottom', y=1.04, xanchor='center', x=0.5,
+                    font=dict(size=12)),
+        hovermode='closest'
+    )
+    fig.update_xaxes(gridcolor='rgba(148, 163, 184, 0.2)',
+                     zerolinecolor='rgba(148, 163, 184, 0.3)')
+    fig.update_xaxes(range=[0, max(100.0, float(efficiency.max(initial=0)) * 1.05)], row=1, col=2)
+    # First project on top; names as ticks only while they stay legible
+    fig.update_yaxes(autorange='reversed', showgrid=False,
+                     tickmode='array' if not webgl else 'auto',
+                     tickvals=rows if not webgl else None,
+                     ticktext=labels if not webgl else None,
+                     showticklabels=not webgl, row=1, col=1)
+    fig.update_yaxes(autorange='reversed', showgrid=False, row=1, col=2)
+    return fig
+
+
+def portfolio_layout(fig, height, **layout):
+    """Shared look of the portfolio dashboard charts"""
+    fig.update_layout(
+        height=height,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#e2e8f0'),
+        margin=dict(l=0, r=0, t=30, b=30),
+        hovermode='closest',
+        **layout
+    )
+    fig.update_xaxes(gridcolor='rgba(148, 163, 184, 0.2)', zerolinecolor='rgba(148, 163, 184, 0.3)')
+    fig.update_yaxes(gridcolor='rgba(148, 163, 184, 0.2)', zerolinecolor='rgba(148, 163, 184, 0.3)')
+    return fig
+
+
+def create_efficiency_histogram(counts, edges):
+    """Projects per efficiency bin, each bar in its efficiency band color"""
+    edges = np.asarray(edges, dtype=float)
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges) * 0.92,
+        marker=dict(color=band_colors(edges[:-1])),
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        hovertemplate='%{customdata[0]:.0f}–%{customdata[1]:.0f}%: <b>%{y:,}</b> projects<extra></extra>',
+    ))
+    return portfolio_layout(fig, 320, showlegend=False,
+                            xaxis=dict(title='Efficiency (%)'), yaxis=dict(title='Projects'))
+
+
+def create_designer_void_chart(designers, void_volumes, project_counts, unit):
+    """Total void (remaining) volume per designer, largest first"""
+    fig = go.Figure(go.Bar(
+        x=void_volumes,
+        y=designers,
+        orientation='h',
+        marker=dict(color='#3b82f6'),
+        customdata=project_counts,
+        hovertemplate=f'<b>%{{y}}</b><br>Void: %{{x:,.2f}} {unit}<br>%{{customdata:,}} projects<extra></extra>',
+    ))
+    return portfolio_layout(fig, max(320, 40 + 24 * len(designers)), showlegend=False,
+                            xaxis=dict(title=f'Void volume ({unit})'),
+                            yaxis=dict(autorange='reversed'))
+
+
+def create_efficiency_trend_chart(periods, mean_efficiency, project_counts):
+    """Mean efficiency per period (line) over the number of projects (bars)"""
+    fig = make_subplots(specs=[[{'secondary_y': True}]])
+    fig.add_trace(go.Bar(
+        x=periods, y=project_counts, name='Projects',
+        marker=dict(color='rgba(148, 163, 184, 0.35)'),
+        hovertemplate='%{x}: %{y:,} projects<extra></extra>',
+    ), secondary_y=True)
+    fig.add_trace(go.Scatter(
+        x=periods, y=mean_efficiency, name='Mean efficiency', mode='lines+markers',
+        line=dict(color='#10b981', width=3),
+        hovertemplate='%{x}: <b>%{y:.1f}%</b><extra></extra>',
+    ), secondary_y=False)
+    fig.add_hline(y=85, line_dash='dot', line_color='#10b981', opacity=0.5)
+    fig.update_yaxes(title_text='Mean efficiency (%)', secondary_y=False)
+    fig.update_yaxes(title_text='Projects', showgrid=False, secondary_y=True)
+    return portfolio_layout(fig, 340, legend=dict(orientation='h', yanchor='bottom', y=1.02,
+                                                  xanchor='center', x=0.5))
@@ -0,0 +1,150 @@
+"""Process-wide cache of the parsed project list.
+
+One SharedProjectCache per store is shared by every session. projects()
+reparses only when store.version() changes and hands out the same
+read-only records to all callers, so a rerun costs one version check
+instead of a full load and deep comparison. Writes made through the cache
+patch its ProjectIndex, and its ProjectFrame once analytics asked for one,
+in place instead of forcing a reparse. Running ProjectStats are patched on
+the same writes and persisted through the store, so summaries never scan.
+"""
+import threading
+from types import MappingProxyType
+
+from .project_frame import ProjectFrame
+from .project_index import ProjectIndex
+from .project_stats import ProjectStats
+from .project_store import stats_stamp
+
+
+class SharedProjectCache:
+    """Read-only snapshot of a project store, refreshed when its version changes"""
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._version = None
+        self._projects = None
+        self._frame = None
+        self._frame_snapshot = None
+        self._stats = None
+        self._stats_version = None
+        self._stats_snapshot = None
+
+    def _current(self):
+        version = self.store.version()
+        if self._projects is None or version != self._version:
+            # Read the version first: a write racing the load only causes
+            # one extra reparse on the next call, never a stale snapshot.
+            self._projects = ProjectIndex(MappingProxyType(p) for p in self.store.load_all())
+            self._version = version
+            self._frame = self._frame_snapshot = None
+        return self._projects
+
+    def _current_stats(self):
+        # Versioned separately from the index: saved stats that match the
+        # store are used without loading a single project
+        version = self.store.version()
+        if self._stats is None or version != self._stats_version:
+            self._stats_snapshot = None
+            saved = self.store.load_stats()
+            if saved is not None and saved[0] == stats_stamp(version):
+                self._stats = ProjectStats(saved[1])
+            else:
+                # The store changed without its stats: one full pass
+                self._stats = ProjectStats.from_records(self._current())
+                version = self._version
+                self.store.save_stats(stats_stamp(version), self._stats.buckets, replace=True)
+            self._stats_version = version
+        return self._stats
+
+    def projects(self):
+        """ProjectIndex of read-only records; copy with dict(p) before changing one"""
+        with self._lock:
+            return self._current()
+
+    def frame(self):
+        """Columnar ProjectFrame of all projects, for analytics; treat it as read-only.
+
+        Built on first use, then patched row by row by upsert() and delete().
+        Callers share one copy until the next write.
+        """
+        with self._lock:
+            projects = self._current()
+            if self._frame is None:
+                self._frame = ProjectFrame(projects)
+            if self._frame_snapshot is None:
+                self._frame_snapshot = self._frame.copy()
+            return self._frame_snapshot
+
+    def stats(self):
+        """Running ProjectStats of all projects; treat it as read-only.
+
+        Loaded from the store (or rebuilt once if the saved stats are out of
+        date), then kept current by upsert() and delete().
+        """
+        with self._lock:
+            stats = self._current_stats()
+            if self._stats_snapshot is None:
+                self._stats_snapshot = stats.copy()
+            return self._stats_snapshot
+
+    def _save_stats(self, changed):
+        self._stats_version = self.store.version()
+        self.store.save_stats(stats_stamp(self._stats_version), self._stats.bucket_data(changed))
+        self._stats_snapshot = None
+
+    def _upsert(self, project):
+        # Callers hold self._lock
+        in_sync = self._projects is not None and self.store.version() == self._version
+        stats = self._current_stats()
+        number = project['project_number']
+        previous = self._projects.get(number) if in_sync else self.store.get(number)
+        self.store.upsert(project)
+        self._save_stats(stats.replace(previous, project))
+        if in_sync:
+            self._projects.upsert(MappingProxyType(dict(project)))
+            self._version = self.store.version()
+            if self._frame is not None:
+                self._frame.upsert(project)
+                self._frame_snapshot = None
+
+    def upsert(self, project):
+        """Save a project through the store and patch the cached index"""
+        with self._lock:
+            self._upsert(project)
+
+    def patch(self, project_number, **fields):
+        """Update some fields of a stored project atomically; returns the new record or None.
+
+        The read, merge and write happen under one lock, so concurrent patches
+        (e.g. two render jobs attaching results) never drop each other's fields.
+        """
+        with self._lock:
+            current = self._current().get(project_number)
+            if current is None:
+                return None
+            project = {**current, **fields}
+            self._upsert(project)
+            return project
+
+    def delete(self, project_number):
+        """Delete a project through the store and patch the cached index"""
+        with self._lock:
+            in_sync = self._projects is not None and self.store.version() == self._version
+            stats = self._current_stats()
+            previous = self._projects.get(project_number) if in_sync else self.store.get(project_number)
+            self.store.delete(project_number)
+            # Saved even when nothing changed, to stamp the new version
+            self._save_stats(stats.remove(previous) if previous is not None else set())
+            if in_sync:
+                self._projects.remove(project_number)
+                self._version = self.store.version()
+                if self._frame is not None:
+                    self._frame.remove(project_number)
+                    self._frame_snapshot = None
+
+    def invalidate(self):
+        with self._lock:
+            self._projects = None
+            self._frame = self._frame_snapshot = None
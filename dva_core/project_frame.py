@@ -0,0 +1,267 @@
+"""Columnar snapshot of the project store for portfolio analytics.
+
+ProjectFrame keeps one NumPy array per analysed field (efficiency, box,
+product and void volume, date, designer code) with a row per project, so
+dashboard aggregations are single vectorized passes instead of loops over
+record dicts. Rows are patched in place on save and delete: upsert
+overwrites or appends a row (arrays grow by doubling) and remove moves
+the last row into the hole, both constant time.
+
+The aggregation helpers at the bottom return small arrays ready to chart;
+the query helpers filter, sort and page the rows of the project table, so
+only the visible page is ever turned back into records.
+"""
+import numpy as np
+
+from .efficiency import EFFICIENCY_BANDS
+from .records import normalize_project, project_metrics
+
+DEFAULT_CAPACITY = 1024
+NO_DESIGNER = '(none)'
+NO_BOX_BAND = 'No box'
+
+# (column, dtype, empty value) of every per-project array
+FRAME_COLUMNS = [
+    ('project_number', np.int64, 0),
+    ('designer', np.int32, 0),
+    ('date', 'datetime64[D]', np.datetime64('NaT')),
+    ('box_volume_mm3', np.float64, 0.0),
+    ('product_volume_mm3', np.float64, 0.0),
+    ('void_volume_mm3', np.float64, 0.0),
+    ('efficiency_pct', np.float64, 0.0),
+    ('has_box', np.bool_, False),
+    # Casefolded project name (sort key) and name, designer and description (search)
+    ('name_key', object, ''),
+    ('search_text', object, ''),
+]
+
+
+def parse_date(value):
+    """Project date string (YYYY-MM-DD...) as datetime64[D]; NaT when unparseable"""
+    try:
+        return np.datetime64(str(value)[:10], 'D')
+    except ValueError:
+        return np.datetime64('NaT')
+
+
+class ProjectFrame:
+    """Project records as parallel NumPy columns, patched in place on save and delete"""
+
+    def __init__(self, records=(), capacity=DEFAULT_CAPACITY):
+        self._size = 0
+        self._rows = {}
+        self._columns = {name: np.full(capacity, empty, dtype=dtype)
+                         for name, dtype, empty in FRAME_COLUMNS}
+        self.designers = [NO_DESIGNER]
+        self._designer_codes = {NO_DESIGNER: 0}
+        for record in records:
+            self.upsert(record)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, project_number):
+        return project_number in self._rows
+
+    def column(self, name):
+        """Read-only view of one column over the live rows"""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def designer_code(self, name):
+        name = name.strip() if isinstance(name, str) else ''
+        name = name or NO_DESIGNER
+        code = self._designer_codes.get(name)
+        if code is None:
+            code = self._designer_codes[name] = len(self.designers)
+            self.designers.append(name)
+        return code
+
+    # ── Updates ──────────────────────────────────────────────────────────
+    def upsert(self, record):
+        """Insert or overwrite the row of the record's project_number"""
+        project = normalize_project(record)
+        metrics = project_metrics(project)
+        number = project['project_number']
+        row = self._rows.get(number)
+        if row is None:
+            row = self._size
+            if row == len(self._columns['project_number']):
+                self._grow()
+            self._rows[number] = row
+            self._size += 1
+        has_box = project['box_volume_mm3'] > 0
+        values = {
+            'project_number': number,
+            'designer': self.designer_code(project['designer']),
+            'date': parse_date(project['date']),
+            'box_volume_mm3': project['box_volume_mm3'],
+            'product_volume_mm3': metrics['product_volume_mm3'],
+            # Overfilled boxes count as no void, not negative void
+            'void_volume_mm3': max(metrics['remaining_volume_mm3'], 0.0) if has_box else 0.0,
+            'efficiency_pct': metrics['efficiency_pct'],
+            'has_box': has_box,
+            'name_key': str(project['project_name']).casefold(),
+            'search_text': ' '.join(str(project[field]) for field in
+                                    ('project_name', 'designer', 'description')).casefold(),
+        }
+        for name, value in values.items():
+            self._columns[name][row] = value
+
+    def remove(self, project_number):
+        """Drop a project's row; returns whether it was present"""
+        row = self._rows.pop(project_number, None)
+        if row is None:
+            return False
+        last = self._size - 1
+        if row != last:
+            for column in self._columns.values():
+                column[row] = column[last]
+            self._rows[int(self._columns['project_number'][row])] = row
+        for name, _, empty in FRAME_COLUMNS:
+            self._columns[name][last] = empty
+        self._size = last
+        return True
+
+    def _grow(self):
+        for name, _, empty in FRAME_COLUMNS:
+            column = self._columns[name]
+            grown = np.full(max(2 * len(column), DEFAULT_CAPACITY), empty, dtype=column.dtype)
+            grown[:len(column)] = column
+            self._columns[name] = grown
+
+    def copy(self):
+        """Independent frame trimmed to the live rows"""
+        frame = ProjectFrame(capacity=0)
+        frame._size = self._size
+        frame._rows = dict(self._rows)
+        frame._columns = {name: column[:self._size].copy() for name, column in self._columns.items()}
+        frame.designers = list(self.designers)
+        frame._designer_codes = dict(self._designer_codes)
+        return frame
+
+
+# ── Aggregations ─────────────────────────────────────────────────────────
+def frame_mask(frame, designers=None, start=None, end=None, boxed_only=True):
+    """Boolean row mask: projects with a box, by designer names and date range (inclusive)"""
+    mask = frame.column('has_box').copy() if boxed_only else np.ones(len(frame), dtype=bool)
+    if designers:
+        codes = [frame.designers.index(name) for name in designers if name in frame.designers]
+        mask &= np.isin(frame.column('designer'), codes)
+    dates = frame.column('date')
+    if start is not None:
+        mask &= dates >= np.datetime64(start, 'D')
+    if end is not None:
+        mask &= dates <= np.datetime64(end, 'D')
+    return mask
+
+
+def date_span(frame):
+    """First and last valid project date as datetime.date, or (None, None)"""
+    dates = frame.column('date')
+    dates = dates[~np.isnat(dates)]
+    if not len(dates):
+        return None, None
+    return dates.min().item(), dates.max().item()
+
+
+def efficiency_histogram(frame, mask, bin_width=5.0):
+    """Counts of projects per efficiency bin; overfilled boxes land in the last bin"""
+    efficiency = frame.column('efficiency_pct')[mask]
+    top = max(100.0, np.ceil(efficiency.max(initial=0) / bin_width) * bin_width)
+    edges = np.arange(0.0, top + bin_width, bin_width)
+    counts, edges = np.histogram(np.clip(efficiency, 0, top), bins=edges)
+    return counts, edges
+
+
+def void_volume_by_designer(frame, mask):
+    """Designers with projects in mask, with their project count and total void volume (mm³)"""
+    codes = frame.column('designer')[mask]
+    size = len(frame.designers)
+    counts = np.bincount(codes, minlength=size)
+    voids = np.bincount(codes, weights=frame.column('void_volume_mm3')[mask], minlength=size)
+    present = np.flatnonzero(counts)
+    order = present[np.argsort(-voids[present], kind='stable')]
+    return [frame.designers[c] for c in order], counts[order], voids[order]
+
+
+def efficiency_trend(frame, mask, period='M'):
+    """Mean efficiency and project count per calendar period ('M' months, 'W' weeks...)"""
+    dates = frame.column('date')[mask]
+    dated = ~np.isnat(dates)
+    periods = dates[dated].astype(f'datetime64[{period}]')
+    if not len(periods):
+        return periods, np.empty(0), np.empty(0, dtype=np.int64)
+    keys, inverse = np.unique(periods, return_inverse=True)
+    counts = np.bincount(inverse)
+    sums = np.bincount(inverse, weights=frame.column('efficiency_pct')[mask][dated])
+    return keys, sums / counts, counts
+
+
+# ── Project table queries ────────────────────────────────────────────────
+# Sort keys of query_rows(); 'designer' sorts by name, not by code
+SORT_COLUMNS = ('project_number', 'name_key', 'designer', 'date', 'efficiency_pct')
+
+
+def band_labels(frame):
+    """efficiency_band label of every row, NO_BOX_BAND for projects without a box"""
+    pct = frame.column('efficiency_pct')
+    labels = np.select([pct >= lower for lower, _ in EFFICIENCY_BANDS],
+                       [band.label for _, band in EFFICIENCY_BANDS],
+                       EFFICIENCY_BANDS[-1][1].label)
+    return np.where(frame.column('has_box'), labels, NO_BOX_BAND)
+
+
+def search_mask(frame, query):
+    """Rows whose name, designer or description contains query (case-insensitive)"""
+    query = query.strip().casefold()
+    if not query:
+        return np.ones(len(frame), dtype=bool)
+    return np.fromiter((query in text for text in frame.column('search_text')),
+                       dtype=bool, count=len(frame))
+
+
+def _sort_key(frame, column):
+    if column == 'designer':
+        # Rank designer codes by name so the sort is alphabetical
+        ranks = np.empty(len(frame.designers), dtype=np.int64)
+        ranks[sorted(range(len(frame.designers)), key=lambda c: frame.designers[c].casefold())] = \
+            np.arange(len(frame.designers))
+        return ranks[frame.column('designer')]
+    if column == 'name_key':
+        return np.unique(frame.column('name_key'), return_inverse=True)[1]
+    if column == 'date':
+        # NaT is the smallest int64: undated projects sort as the oldest
+        return frame.column('date').view(np.int64)
+    return frame.column(column)
+
+
+def query_rows(frame, search='', designers=None, start=None, end=None, bands=None,
+               sort='project_number', descending=False):
+    """Row positions matching the table filters, in sort order.
+
+    Filters combine: search text, designer names, project date range
+    (inclusive; undated rows drop out once a bound is set) and efficiency
+    band labels from band_labels(). Ties keep project number order.
+    """
+    mask = frame_mask(frame, designers, start, end, boxed_only=False)
+    if bands:
+        mask &= np.isin(band_labels(frame), list(bands))
+    if search:
+        mask &= search_mask(frame, search)
+    rows = np.flatnonzero(mask)
+    order = np.lexsort((frame.column('project_number')[rows], _sort_key(frame, sort)[rows]))
+    rows = rows[order]
+    return rows[::-1] if descending else rows
+
+
+def page_numbers(frame, rows, page, page_size):
+    """Project numbers on a 1-based page of rows, clamped to the last page.
+
+    Returns (numbers, page, page_count), like samples.paginate.
+    """
+    page_count = max(1, -(-len(rows) // page_size))
+    page = min(max(1, page), page_count)
+    start = (page - 1) * page_size
+    return frame.column('project_number')[rows[start:start + page_size]].tolist(), page, page_count
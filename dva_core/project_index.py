@@ -0,0 +1,85 @@
+"""Project collection indexed by project_number.
+
+ProjectIndex replaces the plain project list: lookups, duplicate checks,
+updates and next-number allocation are constant time. It still iterates,
+indexes by position and reports len() like the list it replaces, in
+insertion order. Project numbers are also kept on a max-heap with lazy
+deletion, so the highest number survives removals without a rescan.
+"""
+import heapq
+
+FIRST_PROJECT_NUMBER = 1000
+
+
+class ProjectIndex:
+    """Ordered project records keyed by project_number, with a running max number"""
+
+    def __init__(self, records=()):
+        self._by_number = {}
+        # Negated project numbers; entries of removed projects are dropped when they surface
+        self._number_heap = []
+        self._ordered = None
+        for record in records:
+            self.upsert(record)
+
+    # ── Sequence view ────────────────────────────────────────────────────
+    def _records(self):
+        # Iteration works on an immutable snapshot, so a concurrent upsert
+        # or remove never invalidates an iterator held by another session.
+        ordered = self._ordered
+        if ordered is None:
+            ordered = self._ordered = tuple(self._by_number.values())
+        return ordered
+
+    def __iter__(self):
+        return iter(self._records())
+
+    def __len__(self):
+        return len(self._by_number)
+
+    def __getitem__(self, position):
+        return self._records()[position]
+
+    # ── Keyed access ─────────────────────────────────────────────────────
+    def get(self, project_number, default=None):
+        return self._by_number.get(project_number, default)
+
+    def has(self, project_number):
+        return project_number in self._by_number
+
+    def numbers(self):
+        return list(self._by_number)
+
+    @property
+    def max_number(self):
+        """Highest project number in the index, or None when empty"""
+        heap = self._number_heap
+        while heap and -heap[0] not in self._by_number:
+            heapq.heappop(heap)
+        return -heap[0] if heap else None
+
+    def next_number(self, start=FIRST_PROJECT_NUMBER):
+        """Next free project number: one past the highest, or start when empty"""
+        highest = self.max_number
+        return start if highest is None else highest + 1
+
+    # ── Updates ──────────────────────────────────────────────────────────
+    def upsert(self, record):
+        """Insert or replace the record with the same project_number"""
+        number = record['project_number']
+        if number not in self._by_number:
+            heapq.heappush(self._number_heap, -number)
+            if len(self._number_heap) > 2 * len(self._by_number) + 64:
+                # Too many stale entries; rebuilding is amortized over the pushes
+                self._number_heap = [-n for n in self._by_number] + [-number]
+                heapq.heapify(self._number_heap)
+        self._by_number[number] = record
+        self._ordered = None
+
+    def remove(self, project_number):
+        """Drop a record; returns it, or None if it was not indexed"""
+        record = self._by_number.pop(project_number, None)
+        if record is not None:
+            # Its heap entry goes lazily, once it reaches the top
+            self._ordered = None
+        return record
@@ -0,0 +1,162 @@
+"""Append-only journal mode for the JSON project file.
+
+Saves and deletes append one small change record to a journal next to
+dva_projects.json (the checkpoint) instead of rewriting every project.
+Readers replay the journal over the checkpoint. Once the journal passes a
+size threshold, a background thread folds it into a fresh checkpoint.
+
+Compaction rotates the journal aside before folding it, so appends never
+wait for the fold. Replaying a change record is idempotent (upsert by
+project_number, delete by project_number). A crash at any point therefore
+leaves a state that replays to the same projects. A replace_all() while a
+fold is running wins: the fold sees the generation change and discards
+its result.
+"""
+import json
+import os
+import threading
+
+from .project_store import DEFAULT_JSON_PATH, JsonProjectStore
+
+DEFAULT_COMPACT_THRESHOLD_BYTES = 256 * 1024
+
+
+class JournaledProjectStore:
+    """JSON checkpoint plus an append-only change journal"""
+
+    def __init__(self, path=DEFAULT_JSON_PATH, compact_threshold_bytes=DEFAULT_COMPACT_THRESHOLD_BYTES):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.compacting_path = f"{path}.journal.compacting"
+        self.compact_threshold_bytes = compact_threshold_bytes
+        self._checkpoint = JsonProjectStore(path)
+        self._lock = threading.Lock()
+        self._compaction = None
+        # Bumped by replace_all(), so a fold started before it is not finalized
+        self._generation = 0
+
+    # ── Reading ──────────────────────────────────────────────────────────
+    @staticmethod
+    def _replay(projects, journal_path):
+        """Apply journal records in order onto a project_number -> record dict"""
+        try:
+            f = open(journal_path, 'r')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn final line from an interrupted append
+                    continue
+                if entry.get('op') == 'upsert':
+                    project = entry['project']
+                    projects[project['project_number']] = project
+                elif entry.get('op') == 'delete':
+                    projects.pop(entry['project_number'], None)
+
+    def _read_all(self, include_journal=True):
+        projects = {p['project_number']: p for p in self._checkpoint.load_all()}
+        self._replay(projects, self.compacting_path)
+        if include_journal:
+            self._replay(projects, self.journal_path)
+        return projects
+
+    def load_all(self):
+        with self._lock:
+            return list(self._read_all().values())
+
+    def get(self, project_number):
+        with self._lock:
+            return self._read_all().get(project_number)
+
+    def count(self):
+        return len(self.load_all())
+
+    # Stats live beside the checkpoint; compaction changes version(), so they
+    # are rebuilt once after each fold
+    def load_stats(self):
+        return self._checkpoint.load_stats()
+
+    def save_stats(self, stamp, buckets, replace=False):
+        self._checkpoint.save_stats(stamp, buckets, replace)
+
+    def version(self):
+        """Modification time and size of the checkpoint and both journal files"""
+        with self._lock:
+            return tuple(JsonProjectStore(path).version()
+                         for path in (self.path, self.compacting_path, self.journal_path))
+
+    # ── Writing ──────────────────────────────────────────────────────────
+    def _append(self, entry):
+        line = (json.dumps(entry) + '\n').encode('utf-8')
+        with self._lock:
+            with open(self.journal_path, 'a+b') as f:
+                # Terminate a torn final line so this record stays parseable
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        line = b'\n' + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            journal_size = os.path.getsize(self.journal_path)
+        if journal_size >= self.compact_threshold_bytes:
+            self.compact_in_background()
+
+    def upsert(self, project):
+        """Record an insert or replace of the project with the same project_number"""
+        self._append({'op': 'upsert', 'project': project})
+
+    def delete(self, project_number):
+        self._append({'op': 'delete', 'project_number': project_number})
+
+    def replace_all(self, projects):
+        """Write a fresh checkpoint and discard any journal"""
+        with self._lock:
+            self._generation += 1
+            self._write_checkpoint(projects)
+            for path in (self.journal_path, self.compacting_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _write_checkpoint(self, projects):
+        tmp_path = f"{self.path}.tmp"
+        JsonProjectStore(tmp_path).replace_all(projects)
+        os.replace(tmp_path, self.path)
+
+    # ── Compaction ───────────────────────────────────────────────────────
+    def compact(self):
+        """Fold the journal into a new checkpoint"""
+        with self._lock:
+            generation = self._generation
+            # A leftover compacting file means an earlier fold was interrupted;
+            # fold it again before rotating more entries aside.
+            if not os.path.exists(self.compacting_path):
+                if not os.path.exists(self.journal_path):
+                    return
+                os.replace(self.journal_path, self.compacting_path)
+
+        # New appends go to a fresh journal while the old one is folded
+        projects = self._read_all(include_journal=False)
+        tmp_path = f"{self.path}.compact.tmp"
+        JsonProjectStore(tmp_path).replace_all(list(projects.values()))
+
+        with self._lock:
+            if generation != self._generation or not os.path.exists(self.compacting_path):
+                # replace_all() ran meanwhile; its checkpoint supersedes this fold
+                os.remove(tmp_path)
+                return
+            os.replace(tmp_path, self.path)
+            os.remove(self.compacting_path)
+
+    def compact_in_background(self):
+        """Start a compaction thread unless one is already running"""
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return self._compaction
+            self._compaction = threading.Thread(target=self.compact, name='dva-journal-compaction',
+                                                daemon=True)
+            self._compaction.start()
+            return self._compaction
@@ -0,0 +1,155 @@
+"""Running aggregate statistics over all saved projects.
+
+ProjectStats keeps one bucket for all projects plus one per designer and
+one per project month (YYYY-MM of the project date). Each bucket holds
+the project count and the efficiency sum, box, product and void volume
+totals, so add() and remove() of a record touch at most three buckets
+and never rescan the projects. Efficiency min/max come from a sparse
+0.1% histogram per bucket: removing the current extreme only searches
+that bucket's bins, whose number is bounded by the resolution, not by
+the project count.
+
+Buckets are plain JSON-able dicts; project stores persist them next to
+the projects (see save_stats/load_stats on the stores).
+"""
+from .records import normalize_project, project_metrics
+
+ALL_BUCKET = 'all'
+NO_DESIGNER = '(none)'
+UNDATED = 'undated'
+# Efficiency histogram resolution, in bins per percentage point
+EFFICIENCY_BINS_PER_PCT = 10
+
+TOTAL_FIELDS = ('count', 'boxed', 'efficiency_sum', 'box_volume_mm3',
+                'product_volume_mm3', 'void_volume_mm3')
+
+
+def designer_bucket(designer):
+    designer = designer.strip() if isinstance(designer, str) else ''
+    return f"designer:{designer or NO_DESIGNER}"
+
+
+def month_bucket(date):
+    month = str(date or '')[:7]
+    # YYYY-MM, anything else counts as undated
+    if len(month) == 7 and month[4] == '-' and month[:4].isdigit() and month[5:].isdigit():
+        return f"month:{month}"
+    return f"month:{UNDATED}"
+
+
+def empty_bucket():
+    bucket = {field: 0 for field in TOTAL_FIELDS}
+    bucket['efficiency_bins'] = {}
+    return bucket
+
+
+class ProjectStats:
+    """Count, efficiency and volume totals for all projects, per designer and per month"""
+
+    def __init__(self, buckets=None):
+        self.buckets = buckets if buckets is not None else {}
+        # Cached (min bin, max bin) per bucket, refreshed lazily
+        self._extremes = {}
+
+    @classmethod
+    def from_records(cls, records):
+        stats = cls()
+        for record in records:
+            stats.add(record)
+        return stats
+
+    @staticmethod
+    def _contribution(record):
+        project = normalize_project(record)
+        metrics = project_metrics(project)
+        has_box = project['box_volume_mm3'] > 0
+        names = (ALL_BUCKET, designer_bucket(project['designer']), month_bucket(project['date']))
+        return names, has_box, metrics
+
+    def _apply(self, record, sign):
+        names, has_box, metrics = self._contribution(record)
+        efficiency_bin = str(round(metrics['efficiency_pct'] * EFFICIENCY_BINS_PER_PCT))
+        for name in names:
+            bucket = self.buckets.setdefault(name, empty_bucket())
+            bucket['count'] += sign
+            bucket['box_volume_mm3'] += sign * metrics['box_volume_mm3']
+            bucket['product_volume_mm3'] += sign * metrics['product_volume_mm3']
+            if has_box:
+                bucket['boxed'] += sign
+                bucket['efficiency_sum'] += sign * metrics['efficiency_pct']
+                # Overfilled boxes count as no void, not negative void
+                bucket['void_volume_mm3'] += sign * max(metrics['remaining_volume_mm3'], 0.0)
+                bins = bucket['efficiency_bins']
+                remaining = bins.get(efficiency_bin, 0) + sign
+                if remaining > 0:
+                    bins[efficiency_bin] = remaining
+                else:
+                    bins.pop(efficiency_bin, None)
+                self._update_extremes(name, int(efficiency_bin), sign)
+            if bucket['count'] <= 0:
+                del self.buckets[name]
+                self._extremes.pop(name, None)
+        return set(names)
+
+    def _update_extremes(self, name, efficiency_bin, sign):
+        extremes = self._extremes.get(name)
+        if extremes is None:
+            return
+        low, high = extremes
+        if sign > 0:
+            self._extremes[name] = (min(low, efficiency_bin), max(high, efficiency_bin))
+        elif efficiency_bin in (low, high):
+            # The extreme may have gone; found again on the next read
+            del self._extremes[name]
+
+    def add(self, record):
+        """Count a record in; returns the names of the buckets it changed"""
+        return self._apply(record, 1)
+
+    def remove(self, record):
+        """Take a previously added record out; returns the changed bucket names"""
+        return self._apply(record, -1)
+
+    def replace(self, old_record, new_record):
+        """remove(old_record) (if any) then add(new_record); returns changed bucket names"""
+        changed = self.remove(old_record) if old_record is not None else set()
+        return changed | self.add(new_record)
+
+    # ── Reading ──────────────────────────────────────────────────────────
+    def summary(self, name=ALL_BUCKET):
+        """Totals of one bucket plus mean/min/max efficiency (None without boxed projects)"""
+        bucket = self.buckets.get(name, empty_bucket())
+        summary = {field: bucket[field] for field in TOTAL_FIELDS}
+        del summary['efficiency_sum']
+        boxed = bucket['boxed']
+        summary['mean_efficiency_pct'] = bucket['efficiency_sum'] / boxed if boxed > 0 else None
+        summary['min_efficiency_pct'] = summary['max_efficiency_pct'] = None
+        if bucket['efficiency_bins']:
+            extremes = self._extremes.get(name)
+            if extremes is None:
+                keys = [int(k) for k in bucket['efficiency_bins']]
+                extremes = self._extremes[name] = (min(keys), max(keys))
+            summary['min_efficiency_pct'] = extremes[0] / EFFICIENCY_BINS_PER_PCT
+            summary['max_efficiency_pct'] = extremes[1] / EFFICIENCY_BINS_PER_PCT
+        return summary
+
+    def _grouped(self, prefix):
+        return {name[len(prefix):]: self.summary(name)
+                for name in sorted(self.buckets) if name.startswith(prefix)}
+
+    def by_designer(self):
+        return self._grouped('designer:')
+
+    def by_month(self):
+        """Per YYYY-MM month (plus 'undated'), in month order"""
+        return self._grouped('month:')
+
+    def bucket_data(self, names):
+        """{name: bucket or None} for persisting changed buckets; None marks a deleted one"""
+        return {name: self.buckets.get(name) for name in names}
+
+    def copy(self):
+        stats = ProjectStats({name: {**bucket, 'efficiency_bins': dict(bucket['efficiency_bins'])}
+                              for name, bucket in self.buckets.items()})
+        stats._extremes = dict(self._extremes)
+        return stats
@@ -0,0 +1,266 @@
+"""Project storage backends.
+
+JsonProjectStore keeps the original single-file dva_projects.json format.
+SqliteProjectStore keeps one row per project, so saves and deletes touch a
+single row instead of rewriting every project. Both expose the same API:
+load_all, get, count, upsert, delete, replace_all and version. version()
+changes whenever the stored projects change, so callers can cache load_all().
+
+save_stats/load_stats persist ProjectStats buckets next to the projects,
+stamped with the store version they describe; stats whose stamp does not
+match version() are out of date and should be rebuilt.
+"""
+import json
+import os
+import sqlite3
+from contextlib import closing
+
+DEFAULT_JSON_PATH = 'dva_projects.json'
+DEFAULT_DB_PATH = 'dva_projects.db'
+
+
+def stats_stamp(version):
+    """Store version as the string stats are stamped with"""
+    return json.dumps(version)
+
+
+class JsonProjectStore:
+    """Projects stored as one JSON list, rewritten on every change"""
+
+    def __init__(self, path=DEFAULT_JSON_PATH):
+        self.path = path
+        self.stats_path = f"{path}.stats.json"
+
+    def load_all(self):
+        """Load all projects; a corrupted file is backed up and treated as empty"""
+        if not os.path.exists(self.path):
+            return []
+        try:
+            with open(self.path, 'r') as f:
+                content = f.read().strip()
+            return json.loads(content) if content else []
+        except (json.JSONDecodeError, ValueError):
+            try:
+                os.rename(self.path, f"{self.path}.backup")
+            except OSError:
+                pass
+            return []
+
+    def version(self):
+        """File modification time and size; None when the file does not exist"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self, project_number):
+        return next((p for p in self.load_all() if p['project_number'] == project_number), None)
+
+    def count(self):
+        return len(self.load_all())
+
+    def upsert(self, project):
+        """Insert or replace the project with the same project_number"""
+        projects = self.load_all()
+        for i, p in enumerate(projects):
+            if p['project_number'] == project['project_number']:
+                projects[i] = project
+                break
+        else:
+            projects.append(project)
+        self.replace_all(projects)
+
+    def delete(self, project_number):
+        projects = self.load_all()
+        remaining = [p for p in projects if p['project_number'] != project_number]
+        if len(remaining) != len(projects):
+            self.replace_all(remaining)
+
+    def replace_all(self, projects):
+        with open(self.path, 'w') as f:
+            json.dump(projects, f, indent=2)
+
+    def load_stats(self):
+        """(stamp, buckets) of the saved stats, or None"""
+        try:
+            with open(self.stats_path, 'r') as f:
+                saved = json.load(f)
+            return saved['stamp'], saved['buckets']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save_stats(self, stamp, buckets, replace=False):
+        """Write changed buckets (None deletes one); replace=True drops all others"""
+        saved = None if replace else self.load_stats()
+        merged = dict(saved[1]) if saved else {}
+        for name, bucket in buckets.items():
+            if bucket is None:
+                merged.pop(name, None)
+            else:
+                merged[name] = bucket
+        tmp_path = f"{self.stats_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'stamp': stamp, 'buckets': merged}, f)
+        os.replace(tmp_path, self.stats_path)
+
+
+class SqliteProjectStore:
+    """Projects stored as rows in SQLite, indexed by number, designer and date.
+
+    Each row keeps the full record as JSON next to the indexed columns, so
+    records with optional fields (snapshot_path, secondary packaging) round-trip
+    unchanged.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS projects (
+            project_number INTEGER PRIMARY KEY,
+            project_name   TEXT,
+            designer       TEXT,
+            date           TEXT,
+            last_modified  TEXT,
+            data           TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_projects_designer ON projects(designer);
+        CREATE INDEX IF NOT EXISTS idx_projects_date ON projects(date);
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS project_stats (
+            bucket TEXT PRIMARY KEY,
+            data   TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.executescript(self.SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    @staticmethod
+    def _bump_version(conn):
+        conn.execute("INSERT INTO meta (key, value) VALUES ('version', '1') "
+                     "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+
+    def version(self):
+        """Write counter, incremented in the same transaction as every change"""
+        return int(self.get_meta('version', 0))
+
+    @staticmethod
+    def _row(project):
+        return (
+            int(project['project_number']),
+            project.get('project_name', ''),
+            project.get('designer', ''),
+            project.get('date', ''),
+            project.get('last_modified', ''),
+            json.dumps(project),
+        )
+
+    def load_all(self):
+        with closing(self._connect()) as conn:
+            rows = conn.execute('SELECT data FROM projects ORDER BY project_number').fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def get(self, project_number):
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT data FROM projects WHERE project_number = ?',
+                               (int(project_number),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self):
+        with closing(self._connect()) as conn:
+            return conn.execute('SELECT COUNT(*) FROM projects').fetchone()[0]
+
+    def upsert(self, project):
+        """Insert or replace the project with the same project_number"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                'INSERT INTO projects (project_number, project_name, designer, date, last_modified, data) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(project_number) DO UPDATE SET '
+                'project_name = excluded.project_name, designer = excluded.designer, '
+                'date = excluded.date, last_modified = excluded.last_modified, data = excluded.data',
+                self._row(project))
+            self._bump_version(conn)
+
+    def delete(self, project_number):
+        with closing(self._connect()) as conn, conn:
+            conn.execute('DELETE FROM projects WHERE project_number = ?', (int(project_number),))
+            self._bump_version(conn)
+
+    def replace_all(self, projects):
+        with closing(self._connect()) as conn, conn:
+            conn.execute('DELETE FROM projects')
+            conn.executemany('INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?, ?, ?)',
+                             [self._row(p) for p in projects])
+            self._bump_version(conn)
+
+    def get_meta(self, key, default=None):
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with closing(self._connect()) as conn, conn:
+            conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def load_stats(self):
+        """(stamp, buckets) of the saved stats, or None"""
+        with closing(self._connect()) as conn:
+            stamp = conn.execute("SELECT value FROM meta WHERE key = 'stats_stamp'").fetchone()
+            if stamp is None:
+                return None
+            rows = conn.execute('SELECT bucket, data FROM project_stats').fetchall()
+        return stamp[0], {bucket: json.loads(data) for bucket, data in rows}
+
+    def save_stats(self, stamp, buckets, replace=False):
+        """Write changed bucket rows (None deletes one); replace=True drops all others"""
+        with closing(self._connect()) as conn, conn:
+            if replace:
+                conn.execute('DELETE FROM project_stats')
+            conn.executemany('DELETE FROM project_stats WHERE bucket = ?',
+                             [(name,) for name, bucket in buckets.items() if bucket is None])
+            conn.executemany('INSERT OR REPLACE INTO project_stats (bucket, data) VALUES (?, ?)',
+                             [(name, json.dumps(bucket)) for name, bucket in buckets.items()
+                              if bucket is not None])
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('stats_stamp', ?)", (stamp,))
+
+
+def migrate_json_to_sqlite(json_path=DEFAULT_JSON_PATH, db_path=DEFAULT_DB_PATH):
+    """One-shot import of dva_projects.json into the SQLite store.
+
+    Runs only once per database (recorded in the meta table) and never
+    overwrites projects already in the database. The JSON file is left in
+    place as a backup. Returns the number of projects migrated.
+    """
+    store = SqliteProjectStore(db_path)
+    if store.get_meta('migrated_from_json') is not None:
+        return 0
+
+    migrated = 0
+    if os.path.exists(json_path) and store.count() == 0:
+        projects = JsonProjectStore(json_path).load_all()
+        if projects:
+            store.replace_all(projects)
+            migrated = len(projects)
+    store.set_meta('migrated_from_json', str(migrated))
+    return migrated
+
+
+def open_project_store(backend='sqlite', json_path=DEFAULT_JSON_PATH, db_path=DEFAULT_DB_PATH):
+    """Open the configured project store ('sqlite', 'journal' or 'json')"""
+    if backend == 'json':
+        return JsonProjectStore(json_path)
+    if backend == 'journal':
+        from .project_journal import JournaledProjectStore
+        return JournaledProjectStore(json_path)
+    if backend == 'sqlite':
+        migrate_json_to_sqlite(json_path, db_path)
+        return SqliteProjectStore(db_path)
+    raise ValueError(f"Unknown project store backend: {backend}")
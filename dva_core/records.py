@@ -0,0 +1,48 @@
+"""Project record normalization.
+
+Saved projects have accumulated several shapes over time (legacy
+'product_weight', missing unit fields, no total volume for single-unit
+projects). normalize_project fills every canonical field so callers can
+index records directly instead of repeating .get() fallbacks.
+"""
+from .volume import volume_breakdown
+
+PROJECT_DEFAULTS = {
+    'project_number': 0,
+    'project_name': '',
+    'date': '',
+    'designer': '',
+    'description': '',
+    'contact': '',
+    'weight': 0.0,
+    'weight_unit': 'grams',
+    'primary_volume_mm3': 0.0,
+    'product_quantity': 1,
+    'total_product_volume_mm3': 0.0,
+    'box_length': 0.0,
+    'box_width': 0.0,
+    'box_height': 0.0,
+    'dimension_unit': 'inches',
+    'box_result_unit': 'cubic inches',
+    'box_volume_mm3': 0.0,
+    'last_modified': '',
+}
+
+
+def normalize_project(project):
+    """Return a copy of a project record with every canonical field present"""
+    record = {**PROJECT_DEFAULTS, **project}
+    if 'weight' not in project:
+        record['weight'] = project.get('product_weight', 0.0)
+    if 'total_product_volume_mm3' not in project:
+        record['total_product_volume_mm3'] = record['primary_volume_mm3']
+    record['product_quantity'] = int(record['product_quantity'] or 1)
+    for key in ('weight', 'primary_volume_mm3', 'total_product_volume_mm3',
+                'box_length', 'box_width', 'box_height', 'box_volume_mm3'):
+        record[key] = float(record[key] or 0.0)
+    return record
+
+
+def project_metrics(project):
+    """Volume breakdown (mm³ and %) for a normalized project record"""
+    return volume_breakdown(project['total_product_volume_mm3'], project['box_volume_mm3'])
@@ -0,0 +1,586 @@
+"""PDF project report (ReportLab).
+
+build_report() streams the report: flowables are created one batch of
+projects at a time, only when the layout reaches that batch, and chart
+images for a batch are requested just before it is laid out. Finished
+flowables are dropped as pages fill, and the PDF is written to any binary
+file object (e.g. a SpooledTemporaryFile), so a report over hundreds of
+projects never holds every page's content or a second copy of the output.
+
+With a ReportPageCache (and pypdf installed) a project's pages are kept on
+disk, keyed by a hash of its record and REPORT_TEMPLATE_VERSION, and a
+rebuild lays out only new or modified projects. Cached pages hold just the
+record-dependent body; the page header (logo, title, report date) is drawn
+over each project's first page while stitching, so it is never stale and
+the logo is embedded once per report.
+
+The cache trades memory for speed: pypdf stitches the whole report in
+memory before writing it out, so peak memory grows with the page count
+(roughly 14 MB at 250 projects, 52 MB at 1000) instead of staying flat.
+Reports over the cache's max_projects therefore always use the streaming
+build; the cache is off unless one is passed in.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import (Flowable, Frame, Image as RLImage, PageBreak, Paragraph,
+                                SimpleDocTemplate, Spacer, Table, TableStyle)
+
+from .records import normalize_project, project_metrics
+from .units import from_mm3
+
+try:
+    import pypdf
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+DEFAULT_BATCH_SIZE = 25
+LOGO_PATH = 'dva_logo.png'
+DEFAULT_PAGE_CACHE_DIR = 'dva_report_cache'
+DEFAULT_PAGE_CACHE_ENTRIES = 2000
+# Larger reports stream instead: stitching holds every page in memory
+DEFAULT_PAGE_CACHE_MAX_PROJECTS = 200
+# Part of every cached page's key: bump it whenever the project page layout
+# changes, so pages laid out by older code are not reused
+REPORT_TEMPLATE_VERSION = 1
+
+# ── Page / column geometry ───────────────────────────────────────
+PW  = 7.5  * inch   # usable page width
+TW  = PW              # tables span full page width
+KW  = 1.5  * inch   # key column inside tables
+VW  = TW   - KW     # value column
+
+# Page margins
+TOP_M  = 0.4 * inch
+SIDE_M = 0.5 * inch
+
+# Header: +20% height (0.72"), logo 1:1 square
+HDR_H  = 0.72 * inch
+LOGO_H = HDR_H * 0.80
+LOGO_W = LOGO_H * 1.0   # dva_logo.png is 400×400 (1:1)
+
+# ── Styles ───────────────────────────────────────────────────────
+styles = getSampleStyleSheet()
+s_title = ParagraphStyle('DVATitle', parent=styles['Normal'],
+            fontSize=18, fontName='Helvetica-Bold',
+            textColor=colors.HexColor('#1565C0'),
+            alignment=TA_LEFT, spaceAfter=1)
+s_sub   = ParagraphStyle('DVASub', parent=styles['Normal'],
+            fontSize=3.75, textColor=colors.HexColor('#546E7A'),
+            alignment=TA_LEFT, spaceAfter=0)
+s_sec   = ParagraphStyle('DVASec', parent=styles['Normal'],
+            fontSize=8.5, fontName='Helvetica-Bold',
+            textColor=colors.white, spaceAfter=0, spaceBefore=0)
+s_strip_left  = ParagraphStyle('LS', parent=styles['Normal'],
+            fontSize=8, textColor=colors.white,
+            fontName='Helvetica-Bold')
+s_strip_right = ParagraphStyle('RS', parent=styles['Normal'],
+            fontSize=8, textColor=colors.HexColor('#B0BEC5'),
+            alignment=TA_RIGHT)
+s_cmp_hdr = ParagraphStyle('CH', parent=styles['Normal'],
+            fontSize=7.5, textColor=colors.white,
+            fontName='Helvetica-Bold', alignment=TA_CENTER)
+
+
+def fmv(v, u, d=4):
+    """mm³ value formatted in unit u"""
+    return f"{from_mm3(v, u):,.{d}f}"
+
+
+def new_doc(output):
+    """Letter document with the report margins"""
+    return SimpleDocTemplate(output, pagesize=letter,
+        topMargin=TOP_M, bottomMargin=TOP_M,
+        leftMargin=SIDE_M, rightMargin=SIDE_M)
+
+
+def page_frame(doc):
+    """A frame matching doc's body frame, for drawing flowables onto a bare canvas"""
+    return Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height)
+
+
+def tiny():  return Spacer(1, 0.07*inch)
+def micro(): return Spacer(1, 0.03*inch)
+
+
+# ── Table style ──────────────────────────────────────────────────
+def kv_style(key_bg):
+    return TableStyle([
+        ('BACKGROUND',    (0,0),(0,-1), colors.HexColor(key_bg)),
+        ('BACKGROUND',    (1,0),(1,-1), colors.HexColor('#FAFAFA')),
+        ('TEXTCOLOR',     (0,0),(-1,-1), colors.HexColor('#1A1A1A')),
+        ('FONTNAME',      (0,0),(0,-1), 'Helvetica-Bold'),
+        ('FONTNAME',      (1,0),(1,-1), 'Helvetica'),
+        ('FONTSIZE',      (0,0),(-1,-1), 8),
+        ('ALIGN',         (0,0),(0,-1), 'RIGHT'),
+        ('ALIGN',         (1,0),(1,-1), 'LEFT'),
+        ('TOPPADDING',    (0,0),(-1,-1), 3),
+        ('BOTTOMPADDING', (0,0),(-1,-1), 3),
+        ('LEFTPADDING',   (0,0),(-1,-1), 5),
+        ('RIGHTPADDING',  (0,0),(-1,-1), 5),
+        ('GRID',          (0,0),(-1,-1), 0.4, colors.HexColor('#CFD8DC')),
+        ('VALIGN',        (0,0),(-1,-1), 'TOP'),
+    ])
+
+
+def sec_hdr(label, bg='#1565C0'):
+    t = Table([[Paragraph(label, s_sec)]], colWidths=[TW])
+    t.setStyle(TableStyle([
+        ('BACKGROUND',    (0,0),(0,0), colors.HexColor(bg)),
+        ('TOPPADDING',    (0,0),(0,0), 4),
+        ('BOTTOMPADDING', (0,0),(0,0), 4),
+        ('LEFTPADDING',   (0,0),(0,0), 6),
+        ('RIGHTPADDING',  (0,0),(0,0), 6),
+    ]))
+    return t
+
+
+def kv_table(rows, key_bg):
+    t = Table(rows, colWidths=[KW, VW])
+    t.setStyle(kv_style(key_bg))
+    return t
+
+
+def build_header(logo_path=LOGO_PATH):
+    title_p = Paragraph('Displacement Volume Analyzer', s_title)
+    sub_p   = Paragraph(
+        "Archimedes' Principle  |  Water at 4\xb0C (1 g/mL)", s_sub)
+    if logo_path and os.path.exists(logo_path):
+        try:
+            logo = RLImage(logo_path,
+                           width=LOGO_W, height=LOGO_H)
+            right_w = 0.6 * inch
+            mid_w   = PW - LOGO_W - right_w - 0.12*inch
+            hdr = Table(
+                [[logo, [title_p, micro(), sub_p], '']],
+                colWidths=[LOGO_W + 0.12*inch, mid_w, right_w])
+        except Exception:
+            hdr = Table([['', [title_p, micro(), sub_p], '']],
+                        colWidths=[0, PW, 0])
+    else:
+        hdr = Table([['', [title_p, micro(), sub_p], '']],
+                    colWidths=[0, PW, 0])
+    hdr.setStyle(TableStyle([
+        ('VALIGN',        (0,0),(-1,-1), 'MIDDLE'),
+        ('LEFTPADDING',   (0,0),(-1,-1), 4),
+        ('RIGHTPADDING',  (0,0),(-1,-1), 4),
+        ('TOPPADDING',    (0,0),(-1,-1), 6),
+        ('BOTTOMPADDING', (0,0),(-1,-1), 6),
+        ('LINEBELOW',     (0,0),(-1,-1), 0.5,
+                          colors.HexColor('#1565C0')),
+    ]))
+    return hdr
+
+
+def chart_image(path, width):
+    """Image flowable scaled to width, keeping the file's aspect ratio"""
+    iw, ih = ImageReader(path).getSize()
+    return RLImage(path, width=width, height=width * ih / iw)
+
+
+# ════════════════════════════════════════════════════════════════
+# Report sections
+# ════════════════════════════════════════════════════════════════
+def header_flowables(report_date='', logo_path=LOGO_PATH):
+    """Page header and report strip at the top of each project"""
+    strip = Table([[
+        Paragraph('Project Analysis Report', s_strip_left),
+        Paragraph(report_date, s_strip_right),
+    ]], colWidths=[PW*0.55, PW*0.45])
+    strip.setStyle(TableStyle([
+        ('BACKGROUND',    (0,0),(-1,-1), colors.HexColor('#263238')),
+        ('TOPPADDING',    (0,0),(-1,-1), 4),
+        ('BOTTOMPADDING', (0,0),(-1,-1), 4),
+        ('LEFTPADDING',   (0,0),(-1,-1), 8),
+        ('RIGHTPADDING',  (0,0),(-1,-1), 8),
+    ]))
+    return [build_header(logo_path), micro(), strip]
+
+
+def project_flowables(raw_project, chart_images=None, report_date='', logo_path=LOGO_PATH):
+    """Flowables for one project's page.
+
+    chart_images maps chart filenames (chart_gauge.png, ...) to image paths;
+    the Volume Efficiency Analysis row is left out without it.
+    """
+    return header_flowables(report_date, logo_path) + project_body_flowables(raw_project, chart_images)
+
+
+def project_body_flowables(raw_project, chart_images=None):
+    """The record-dependent part of a project's page, below the header"""
+    elements = []
+
+    # Unit fields from saved project
+    project  = normalize_project(raw_project)
+    metrics  = project_metrics(project)
+    vol_unit = project['box_result_unit']
+    dim_unit = project['dimension_unit']
+    w_unit   = project['weight_unit']
+    qty      = project['product_quantity']
+
+    unit_vol_mm3  = project['primary_volume_mm3']
+    total_vol_mm3 = project['total_product_volume_mm3']
+    box_vol_mm3   = project['box_volume_mm3']
+    rem_mm3       = metrics['remaining_volume_mm3']
+    eff_pct       = metrics['efficiency_pct']
+    rem_pct       = 100.0 - eff_pct
+
+    elements.append(tiny())
+
+    # Section 1: Project Information
+    elements.append(sec_hdr('PROJECT INFORMATION'))
+    elements.append(micro())
+    elements.append(kv_table([
+        ['Project #:',    str(project.get('project_number',''))],
+        ['Project Name:', project.get('project_name','')],
+        ['Designer:',     project.get('designer','')],
+        ['Date:',         project.get('date','')],
+        ['Contact:',      project['contact'] or '—'],
+        ['Description:',  project.get('description','')],
+    ], '#E3F2FD'))
+    elements.append(tiny())
+
+    # Section 2: Primary Product Volume
+    elements.append(sec_hdr('PRIMARY PRODUCT VOLUME','#2E7D32'))
+    elements.append(micro())
+    elements.append(kv_table([
+        ['Weight of Water:', f"{project['weight']} {w_unit}"],
+        ['Unit Volume:',  f"{fmv(unit_vol_mm3, vol_unit)} {vol_unit}"],
+        ['Quantity:',     str(qty)],
+        ['Total Volume:', f"{fmv(total_vol_mm3,vol_unit)} {vol_unit}"],
+    ], '#E8F5E9'))
+    elements.append(tiny())
+
+    # Section 3: Secondary Packaging
+    if box_vol_mm3 > 0:
+        elements.append(sec_hdr('SECONDARY PACKAGING','#E65100'))
+        elements.append(micro())
+        dim_str = (f"{project.get('box_length',0)} x "
+                   f"{project.get('box_width',0)} x "
+                   f"{project.get('box_height',0)} {dim_unit}")
+        elements.append(kv_table([
+            ['Box Dimensions:',   dim_str],
+            ['Box Volume:',       f"{fmv(box_vol_mm3,  vol_unit)} {vol_unit}"],
+            ['Product Volume:',   f"{fmv(total_vol_mm3,vol_unit)} {vol_unit}"],
+            ['Remaining Volume:', f"{fmv(rem_mm3,      vol_unit)} {vol_unit}"],
+            ['Efficiency:',       f"{eff_pct:.1f}%"],
+            ['Remaining Space:',  f"{rem_pct:.1f}%"],
+        ], '#FFF3E0'))
+        elements.append(tiny())
+
+    # Section 4: Volume Efficiency Analysis charts
+    if chart_images:
+        elements.append(sec_hdr('VOLUME EFFICIENCY ANALYSIS', '#6A1B9A'))
+        elements.append(micro())
+        charts_t = Table([[
+            chart_image(chart_images['chart_gauge.png'],     1.8*inch),
+            chart_image(chart_images['chart_donut.png'],     1.8*inch),
+            chart_image(chart_images['chart_breakdown.png'], 3.7*inch),
+        ]], colWidths=[1.9*inch, 1.9*inch, TW - 3.8*inch])
+        charts_t.setStyle(TableStyle([
+            ('VALIGN', (0,0),(-1,-1), 'MIDDLE'),
+            ('ALIGN',  (0,0),(-1,-1), 'CENTER'),
+            ('BOX',    (0,0),(-1,-1), 0.4, colors.HexColor('#CFD8DC')),
+        ]))
+        elements.append(charts_t)
+        elements.append(tiny())
+
+    return elements
+
+
+def comparison_flowables(projects):
+    """Volume comparison summary table over the projects that have a box"""
+    projects_with_boxes = [p for p in map(normalize_project, projects)
+                           if p['box_volume_mm3'] > 0]
+    if not projects_with_boxes:
+        return []
+
+    cmp_unit = projects_with_boxes[0]['box_result_unit']
+    cmp_rows = [[
+        Paragraph('#', s_cmp_hdr),
+        Paragraph('Project Name', s_cmp_hdr),
+        Paragraph(f'Box Vol\n({cmp_unit})', s_cmp_hdr),
+        Paragraph(f'Product Vol\n({cmp_unit})', s_cmp_hdr),
+        Paragraph(f'Remaining\n({cmp_unit})', s_cmp_hdr),
+        Paragraph('Efficiency', s_cmp_hdr),
+    ]]
+    for p in projects_with_boxes:
+        p_unit = p['box_result_unit']
+        p_met  = project_metrics(p)
+        cmp_rows.append([
+            str(p['project_number']),
+            p['project_name'][:26],
+            fmv(p_met['box_volume_mm3'], p_unit),
+            fmv(p_met['product_volume_mm3'], p_unit),
+            fmv(p_met['remaining_volume_mm3'], p_unit),
+            f"{p_met['efficiency_pct']:.1f}%",
+        ])
+    # repeatRows keeps the header on every page of a long comparison
+    cmp_t = Table(cmp_rows,
+                  colWidths=[0.4*inch,1.8*inch,
+                             1.15*inch,1.15*inch,1.15*inch,1.15*inch],
+                  repeatRows=1)
+    cmp_t.setStyle(TableStyle([
+        ('BACKGROUND',    (0,0),(-1,0), colors.HexColor('#1565C0')),
+        ('FONTSIZE',      (0,1),(-1,-1), 8),
+        ('ALIGN',         (0,0),(-1,-1), 'CENTER'),
+        ('ALIGN',         (1,0),(1,-1), 'LEFT'),
+        ('TOPPADDING',    (0,0),(-1,-1), 3),
+        ('BOTTOMPADDING', (0,0),(-1,-1), 3),
+        ('LEFTPADDING',   (0,0),(-1,-1), 4),
+        ('RIGHTPADDING',  (0,0),(-1,-1), 4),
+        ('GRID',          (0,0),(-1,-1), 0.4, colors.HexColor('#CFD8DC')),
+        ('ROWBACKGROUNDS',(0,1),(-1,-1),
+         [colors.white, colors.HexColor('#E3F2FD')]),
+    ]))
+    return [PageBreak(), sec_hdr('VOLUME COMPARISON SUMMARY'), tiny(), cmp_t]
+
+
+# ════════════════════════════════════════════════════════════════
+# Streaming build
+# ════════════════════════════════════════════════════════════════
+class _ProjectDone(Flowable):
+    """Zero-size marker laid out after a project's last flowable"""
+
+    def __init__(self, callback):
+        super().__init__()
+        self.callback = callback
+
+    def wrap(self, avail_width, avail_height):
+        return 0, 0
+
+    def draw(self):
+        self.callback()
+
+
+class _FlowableStream(list):
+    """Flowable list that refills from a batch iterator when the layout drains it.
+
+    ReportLab's build loop only checks len() and edits the front of the
+    list, so each batch is created just before it is needed and freed
+    once laid out.
+    """
+
+    def __init__(self, batches):
+        super().__init__()
+        self._batches = batches
+
+    def __len__(self):
+        while not list.__len__(self):
+            batch = next(self._batches, None)
+            if batch is None:
+                return 0
+            self.extend(batch)
+        return list.__len__(self)
+
+
+def build_report(projects, output, render_charts=None, progress=None,
+                 batch_size=DEFAULT_BATCH_SIZE, logo_path=LOGO_PATH, page_cache=None):
+    """Write the PDF report for a sequence of project records to output.
+
+    render_charts(batch), if given, is called with each batch of records
+    before it is laid out and returns {project_number: {filename: path}}.
+    progress(projects_done, project_count, pages_done) is called each time
+    a project's pages are complete. With a page_cache (needs pypdf), only
+    projects missing from it are charted and laid out; that build holds
+    the whole report in memory, so reports over page_cache.max_projects
+    stream as without a cache. Returns the number of pages written.
+    """
+    project_count = len(projects)
+    report_date = datetime.now().strftime('%B %d, %Y  ·  %I:%M %p')
+    if page_cache is not None and PYPDF_AVAILABLE and project_count <= page_cache.max_projects:
+        return _build_from_page_cache(projects, output, render_charts, progress,
+                                      batch_size, logo_path, page_cache, report_date)
+    done = [0]
+    doc = new_doc(output)
+
+    def project_done():
+        done[0] += 1
+        if progress is not None:
+            progress(done[0], project_count, doc.page)
+
+    def batches():
+        for start in range(0, project_count, batch_size):
+            batch = projects[start:start + batch_size]
+            chart_images = render_charts(batch) if render_charts is not None else {}
+            elements = []
+            for p_idx, raw_project in enumerate(batch, start):
+                if p_idx > 0:
+                    elements.append(PageBreak())
+                elements.extend(project_flowables(
+                    raw_project, chart_images.get(raw_project['project_number']),
+                    report_date, logo_path))
+                elements.append(_ProjectDone(project_done))
+            yield elements
+        if project_count > 1:
+            yield comparison_flowables(projects)
+
+    doc.build(_FlowableStream(batches()))
+    return doc.page
+
+
+# ════════════════════════════════════════════════════════════════
+# Page cache
+# ════════════════════════════════════════════════════════════════
+def layout_pdf(flowables):
+    """Lay out flowables as a standalone PDF; returns its bytes"""
+    buffer = io.BytesIO()
+    new_doc(buffer).build(flowables)
+    return buffer.getvalue()
+
+
+def header_height(logo_path=LOGO_PATH):
+    """Height the header flowables take at the top of a page"""
+    doc = new_doc(io.BytesIO())
+    width = doc.width - 12  # frames pad 6pt on each side
+    return sum(f.wrap(width, doc.height)[1] for f in header_flowables('', logo_path))
+
+
+class ReportPageCache:
+    """Laid-out project pages on disk, one small PDF per record content hash.
+
+    A cached PDF holds the project's body below a blank space of the header's
+    height. Keys cover the normalized record, REPORT_TEMPLATE_VERSION,
+    whether the charts row was requested and that header height, so an
+    edited record or a template change simply misses. Least recently used
+    pages beyond max_entries are deleted. Reports over max_projects bypass
+    the cache and stream, keeping their memory flat.
+    """
+
+    def __init__(self, directory=DEFAULT_PAGE_CACHE_DIR, max_entries=DEFAULT_PAGE_CACHE_ENTRIES,
+                 max_projects=DEFAULT_PAGE_CACHE_MAX_PROJECTS):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_projects = max_projects
+
+    def key(self, raw_project, charts, header_h):
+        payload = json.dumps([REPORT_TEMPLATE_VERSION, bool(charts), round(header_h, 2),
+                              normalize_project(raw_project)],
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key):
+        """Cached page PDF bytes for key, or None"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        # mtime is the recency prune() goes by
+        os.utime(path)
+        return data
+
+    def put(self, key, data):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path(key))
+
+    def prune(self, max_entries=None):
+        """Delete the least recently used pages beyond max_entries"""
+        limit = self.max_entries if max_entries is None else max_entries
+        try:
+            names = [n for n in os.listdir(self.directory) if n.endswith('.pdf')]
+        except FileNotFoundError:
+            return
+        if len(names) <= limit:
+            return
+        entries = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except FileNotFoundError:
+                pass
+        for _, path in sorted(entries)[:max(0, len(entries) - limit)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _header_overlay(page_count, header_pages, report_date, logo_path):
+    """PDF with the page header drawn on header_pages and blank elsewhere"""
+    buffer = io.BytesIO()
+    doc = new_doc(buffer)
+    canvas = Canvas(buffer, pagesize=letter)
+    # The header is the same on every project, so it is drawn once as a form
+    canvas.beginForm('dva_header')
+    page_frame(doc).addFromList(header_flowables(report_date, logo_path), canvas)
+    canvas.endForm()
+    for page_no in range(page_count):
+        if page_no in header_pages:
+            canvas.doForm('dva_header')
+        canvas.showPage()
+    canvas.save()
+    return buffer
+
+
+def _build_from_page_cache(projects, output, render_charts, progress, batch_size,
+                           logo_path, page_cache, report_date):
+    """build_report reusing cached project pages; stitched with pypdf"""
+    project_count = len(projects)
+    charts = render_charts is not None
+    header_h = header_height(logo_path)
+    writer = pypdf.PdfWriter()
+    header_pages = set()
+    added = 0
+
+    for start in range(0, project_count, batch_size):
+        batch = projects[start:start + batch_size]
+        pages = []
+        for raw_project in batch:
+            key = page_cache.key(raw_project, charts, header_h)
+            pages.append((raw_project, key, page_cache.get(key)))
+        missing = [raw_project for raw_project, _, data in pages if data is None]
+        chart_images = render_charts(missing) if charts and missing else {}
+
+        for p_idx, (raw_project, key, data) in enumerate(pages, start):
+            if data is None:
+                images = chart_images.get(raw_project['project_number'])
+                data = layout_pdf([Spacer(1, header_h)]
+                                  + project_body_flowables(raw_project, images))
+                # A page whose charts failed to render is not kept, so the
+                # next report tries them again
+                if images or not charts or normalize_project(raw_project)['box_volume_mm3'] <= 0:
+                    page_cache.put(key, data)
+                    added += 1
+            header_pages.add(len(writer.pages))
+            for page in pypdf.PdfReader(io.BytesIO(data)).pages:
+                writer.add_page(page)
+            if progress is not None:
+                progress(p_idx + 1, project_count, len(writer.pages))
+
+    if project_count > 1:
+        # The summary starts its own document here, so no leading PageBreak
+        comparison = comparison_flowables(projects)[1:]
+        if comparison:
+            for page in pypdf.PdfReader(io.BytesIO(layout_pdf(comparison))).pages:
+                writer.add_page(page)
+
+    overlay = pypdf.PdfReader(_header_overlay(len(writer.pages), header_pages,
+                                              report_date, logo_path))
+    for page_no in sorted(header_pages):
+        writer.pages[page_no].merge_page(overlay.pages[page_no])
+
+    writer.write(output)
+    if added:
+        page_cache.prune()
+    return len(writer.pages)
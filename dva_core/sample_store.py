@@ -0,0 +1,230 @@
+"""Sample storage backends.
+
+ParquetSampleStore keeps samples as typed columns (id, weight, unit) in a
+directory of Parquet files and loads them straight into a DataFrame.
+Appends write a new part file next to the existing ones; deletes write a
+single compacted base file that supersedes every older file. A base file
+is only trusted once fully written, so an interrupted rewrite never loses
+samples. Too many part files are folded into a new base file by
+compact(), which streams the live files batch by batch, so compaction
+never loads the whole store. JsonSampleStore keeps the original
+dva_data.json list format. Both expose exists, load, count, append,
+compact, delete and replace_all. Loading skips rows whose unit is not a
+known weight unit or whose weight is not a number, with a warning, so
+they never reach the volume calculations.
+"""
+import json
+import os
+import time
+import warnings
+
+import pandas as pd
+
+from . import units
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+DEFAULT_SAMPLE_JSON_PATH = 'dva_data.json'
+DEFAULT_SAMPLE_DIR = 'dva_samples'
+SAMPLE_COLUMNS = ['id', 'weight', 'unit']
+UNIT_DTYPE = pd.CategoricalDtype(units.WEIGHT_UNITS)
+
+# Appends past this many part files trigger a compaction into one base file
+MAX_PART_FILES = 64
+# Rows read per batch while compacting
+COMPACT_BATCH_ROWS = 65_536
+
+
+def typed_samples(samples):
+    """DataFrame with exactly the id (str), weight (float) and unit (category) columns.
+
+    Units are stripped and lower-cased first ('Pounds ' -> 'pounds'); unknown
+    units and non-numeric weights become NaN, see drop_invalid_samples.
+    """
+    df = pd.DataFrame(samples, columns=SAMPLE_COLUMNS)
+    if df['unit'].dtype != UNIT_DTYPE:
+        # Stored columns already carry the unit categories; skip the string pass
+        df['unit'] = df['unit'].astype('string').str.strip().str.lower()
+    df['weight'] = pd.to_numeric(df['weight'], errors='coerce')
+    return df.astype({'id': str, 'weight': float, 'unit': UNIT_DTYPE}).reset_index(drop=True)
+
+
+def drop_invalid_samples(samples, source):
+    """Typed samples without rows lacking a known unit or a weight; warns how many were dropped"""
+    valid = samples['unit'].notna() & samples['weight'].notna()
+    skipped = int((~valid).sum())
+    if not skipped:
+        return samples
+    warnings.warn(f"Skipped {skipped} sample(s) in {source} with an unknown unit or a "
+                  f"non-numeric weight (valid units: {', '.join(units.WEIGHT_UNITS)})")
+    return samples[valid].reset_index(drop=True)
+
+
+class JsonSampleStore:
+    """Samples stored as one JSON list, rewritten on every change"""
+
+    def __init__(self, path=DEFAULT_SAMPLE_JSON_PATH):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """Load all samples; a corrupted file is treated as empty"""
+        records = []
+        if self.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    content = f.read().strip()
+                records = json.loads(content) if content else []
+            except (json.JSONDecodeError, ValueError):
+                records = []
+        return drop_invalid_samples(typed_samples(records), self.path)
+
+    def count(self):
+        return len(self.load())
+
+    def append(self, samples, compact=True):
+        self.replace_all(pd.concat([self.load(), typed_samples(samples)], ignore_index=True))
+
+    def compact(self):
+        """Nothing to fold: the JSON list is always one file"""
+
+    def delete(self, sample_ids):
+        samples = self.load()
+        self.replace_all(samples[~samples['id'].isin(sample_ids)])
+
+    def replace_all(self, samples):
+        records = typed_samples(samples).astype({'unit': str}).to_dict('records')
+        with open(self.path, 'w') as f:
+            json.dump(records, f, indent=2)
+
+
+class ParquetSampleStore:
+    """Samples stored as Parquet part files under one directory"""
+
+    def __init__(self, path=DEFAULT_SAMPLE_DIR):
+        self.path = path
+
+    def exists(self):
+        return os.path.isdir(self.path)
+
+    def _files(self):
+        """(sequence, kind, path) for every data file, oldest first"""
+        if not self.exists():
+            return []
+        files = []
+        for name in os.listdir(self.path):
+            kind, _, rest = name.partition('-')
+            if kind in ('base', 'part') and rest.endswith('.parquet'):
+                files.append((int(rest[:-len('.parquet')]), kind, os.path.join(self.path, name)))
+        return sorted(files)
+
+    def _live_files(self):
+        """Newest base file plus the parts appended after it"""
+        files = self._files()
+        bases = [i for i, (_, kind, _) in enumerate(files) if kind == 'base']
+        return files[bases[-1]:] if bases else files
+
+    def _next_file(self, kind):
+        """(sequence, path, tmp_path) of a new data file sorting after every existing one"""
+        os.makedirs(self.path, exist_ok=True)
+        files = self._files()
+        sequence = max(time.time_ns(), files[-1][0] + 1 if files else 0)
+        return (sequence, os.path.join(self.path, f"{kind}-{sequence:020d}.parquet"),
+                os.path.join(self.path, f".{kind}-{sequence:020d}.tmp"))
+
+    def _write(self, kind, samples):
+        sequence, path, tmp_path = self._next_file(kind)
+        typed_samples(samples).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        return sequence
+
+    def _remove_before(self, sequence):
+        for file_sequence, _, path in self._files():
+            if file_sequence < sequence:
+                os.remove(path)
+
+    def load(self):
+        parts = [pd.read_parquet(path) for _, _, path in self._live_files()]
+        return drop_invalid_samples(typed_samples(pd.concat(parts, ignore_index=True) if parts else None),
+                                    self.path)
+
+    def count(self):
+        import pyarrow.parquet as pq
+        return sum(pq.read_metadata(path).num_rows for _, _, path in self._live_files())
+
+    def version(self):
+        """Names of the live data files; changes on every write"""
+        return tuple(os.path.basename(path) for _, _, path in self._live_files())
+
+    def append(self, samples, compact=True):
+        """Write the new samples as one more part file; existing files are untouched.
+
+        Past MAX_PART_FILES the store is compacted, unless compact=False
+        (e.g. during a chunked import, which calls compact() once at the end).
+        """
+        if len(samples):
+            self._write('part', samples)
+        if compact and len(self._live_files()) > MAX_PART_FILES:
+            self.compact()
+
+    def compact(self):
+        """Fold the live files into one base file, streaming COMPACT_BATCH_ROWS at a time"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        live = self._live_files()
+        if len(live) <= 1:
+            return
+        sequence, path, tmp_path = self._next_file('base')
+        schema = pa.Schema.from_pandas(typed_samples(None), preserve_index=False)
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            for _, _, file_path in live:
+                for batch in pq.ParquetFile(file_path).iter_batches(batch_size=COMPACT_BATCH_ROWS):
+                    # Through typed_samples, so every batch has the same unit categories
+                    writer.write_table(pa.Table.from_pandas(typed_samples(batch.to_pandas()),
+                                                            schema=schema, preserve_index=False))
+        os.replace(tmp_path, path)
+        self._remove_before(sequence)
+
+    def delete(self, sample_ids):
+        samples = self.load()
+        self.replace_all(samples[~samples['id'].isin(sample_ids)])
+
+    def replace_all(self, samples):
+        """Write one compacted base file, then remove the files it supersedes"""
+        self._remove_before(self._write('base', samples))
+
+
+def migrate_json_samples(json_path=DEFAULT_SAMPLE_JSON_PATH, sample_dir=DEFAULT_SAMPLE_DIR):
+    """One-shot import of dva_data.json into a new Parquet sample directory.
+
+    Runs only while the directory does not exist yet; the JSON file is left
+    in place as a backup. Units are normalized on the way; rows that still
+    have no valid unit or weight are skipped with a warning (they stay in
+    the JSON backup). Returns the number of samples migrated.
+    """
+    store = ParquetSampleStore(sample_dir)
+    if store.exists() or not os.path.exists(json_path):
+        return 0
+    samples = JsonSampleStore(json_path).load()
+    store.replace_all(samples)
+    return len(samples)
+
+
+def open_sample_store(backend='parquet', json_path=DEFAULT_SAMPLE_JSON_PATH, sample_dir=DEFAULT_SAMPLE_DIR):
+    """Open the configured sample store ('parquet' or 'json').
+
+    'parquet' falls back to JSON when pyarrow is not installed.
+    """
+    if backend == 'parquet' and PARQUET_AVAILABLE:
+        migrate_json_samples(json_path, sample_dir)
+        return ParquetSampleStore(sample_dir)
+    if backend in ('parquet', 'json'):
+        return JsonSampleStore(json_path)
+    raise ValueError(f"Unknown sample store backend: {backend}")
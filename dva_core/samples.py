@@ -0,0 +1,65 @@
+"""Sample table validation for the Primary Data CSV import."""
+import pandas as pd
+
+from . import units
+
+SAMPLE_CSV_COLUMNS = ['sample id', 'weight', 'unit']
+
+
+def normalize_sample_columns(df):
+    """Lower-case and strip CSV headers in place; returns the missing required columns"""
+    df.columns = df.columns.str.lower().str.strip()
+    return [col for col in SAMPLE_CSV_COLUMNS if col not in df.columns]
+
+
+def prepare_sample_import(df, existing_ids):
+    """Validate an uploaded sample table in bulk.
+
+    Rows need a known weight unit and a numeric weight. Valid rows whose ID
+    is already in existing_ids (a set) are skipped, as are repeats of an ID
+    earlier in the same file. Returns (new_samples, skipped_count) where
+    new_samples is a DataFrame with id, weight and unit columns.
+    """
+    candidates = pd.DataFrame({
+        'id': df['sample id'].astype(str).str.strip(),
+        'weight': pd.to_numeric(df['weight'], errors='coerce'),
+        'unit': df['unit'].astype(str).str.lower().str.strip(),
+    })
+    valid = candidates['unit'].isin(units.WEIGHT_UNITS) & candidates['weight'].notna()
+    candidates = candidates[valid]
+    candidates = candidates[~candidates['id'].isin(existing_ids)]
+    new_samples = candidates.drop_duplicates('id', keep='first').reset_index(drop=True)
+    return new_samples, len(df) - len(new_samples)
+
+
+def iter_sample_import(chunks, existing_ids):
+    """Validate a sample CSV chunk by chunk, e.g. pd.read_csv(f, chunksize=n).
+
+    existing_ids is updated in place so later chunks skip IDs imported by
+    earlier ones. Yields (new_samples, skipped_count, rows_read) per chunk.
+    """
+    for chunk in chunks:
+        missing_cols = normalize_sample_columns(chunk)
+        if missing_cols:
+            raise ValueError(f"Missing CSV columns: {', '.join(missing_cols)}")
+        new_samples, skipped = prepare_sample_import(chunk, existing_ids)
+        existing_ids.update(new_samples['id'])
+        yield new_samples, skipped, len(chunk)
+
+
+def filter_samples(samples, id_query='', unit_filter=None):
+    """Rows whose ID contains id_query (case-insensitive) and whose unit is in unit_filter"""
+    mask = pd.Series(True, index=samples.index)
+    if id_query:
+        mask &= samples['id'].str.contains(id_query, case=False, regex=False)
+    if unit_filter:
+        mask &= samples['unit'].isin(unit_filter)
+    return samples[mask]
+
+
+def paginate(df, page, page_size):
+    """Rows of a 1-based page, clamped to the last page; returns (rows, page, page_count)"""
+    page_count = max(1, -(-len(df) // page_size))
+    page = min(max(1, page), page_count)
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size], page, page_count
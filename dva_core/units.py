@@ -0,0 +1,93 @@
+"""Unit conversion registry shared by every DVA code path.
+
+All weight, length and volume units live in one precomputed dense factor
+matrix. Weights convert to volumes through water at 4°C (1 g/mL), so weight
+and volume units share the mm³ base; lengths use mm. Incompatible pairs
+(e.g. grams -> inches) hold NaN and are rejected by the conversion functions.
+"""
+import numpy as np
+
+# Base factor of each unit: mm³ per unit for weights/volumes, mm per unit for lengths
+WEIGHT_UNIT_FACTORS = {
+    'grams': 1000.0,
+    'ounces': 28316.8466,
+    'pounds': 453592.37,
+    'kilograms': 1000000.0,
+}
+LENGTH_UNIT_FACTORS = {
+    'mm': 1.0,
+    'cm': 10.0,
+    'inches': 25.4,
+    'feet': 304.8,
+}
+VOLUME_UNIT_FACTORS = {
+    'cubic mm': 1.0,
+    'cubic cm': 1000.0,
+    'cubic inches': 25.4 ** 3,
+    'cubic feet': 304.8 ** 3,
+}
+
+WEIGHT_UNITS = tuple(WEIGHT_UNIT_FACTORS)
+LENGTH_UNITS = tuple(LENGTH_UNIT_FACTORS)
+VOLUME_UNITS = tuple(VOLUME_UNIT_FACTORS)
+UNITS = WEIGHT_UNITS + LENGTH_UNITS + VOLUME_UNITS
+UNIT_INDEX = {unit: i for i, unit in enumerate(UNITS)}
+
+# Weight and volume share the mm³ base, so they convert into each other
+_BASE = {**{u: 'mm³' for u in WEIGHT_UNITS + VOLUME_UNITS}, **{u: 'mm' for u in LENGTH_UNITS}}
+_BASE_FACTORS = np.array(
+    [{**WEIGHT_UNIT_FACTORS, **LENGTH_UNIT_FACTORS, **VOLUME_UNIT_FACTORS}[u] for u in UNITS]
+)
+_COMPATIBLE = np.array([[_BASE[a] == _BASE[b] for b in UNITS] for a in UNITS])
+
+# FACTOR_MATRIX[i, j] multiplies a value in UNITS[i] to give UNITS[j]
+FACTOR_MATRIX = np.where(_COMPATIBLE, _BASE_FACTORS[:, None] / _BASE_FACTORS[None, :], np.nan)
+FACTOR_MATRIX.setflags(write=False)
+
+
+def factor(from_unit, to_unit):
+    """Return the multiplier converting from_unit into to_unit"""
+    value = FACTOR_MATRIX[UNIT_INDEX[from_unit], UNIT_INDEX[to_unit]]
+    if np.isnan(value):
+        raise ValueError(f"Cannot convert {from_unit} to {to_unit}")
+    return float(value)
+
+
+def convert(value, from_unit, to_unit):
+    """Convert a scalar value between two compatible units"""
+    return value * factor(from_unit, to_unit)
+
+
+def convert_array(values, from_units, to_unit):
+    """Convert an array of values into to_unit in one pass.
+
+    from_units may be a single unit name or an array of names, one per value.
+    """
+    values = np.asarray(values, dtype=float)
+    if isinstance(from_units, str):
+        return values * factor(from_units, to_unit)
+
+    unique_units, inverse = np.unique(np.asarray(from_units, dtype=object), return_inverse=True)
+    column = FACTOR_MATRIX[:, UNIT_INDEX[to_unit]]
+    factors = column[[UNIT_INDEX[u] for u in unique_units]]
+    if np.isnan(factors).any():
+        bad = [u for u, f in zip(unique_units, factors) if np.isnan(f)]
+        raise ValueError(f"Cannot convert {', '.join(bad)} to {to_unit}")
+    return values * factors[inverse]
+
+
+def to_mm3(value, unit):
+    """Convert a weight or volume to cubic millimetres"""
+    return convert(value, unit, 'cubic mm')
+
+
+def from_mm3(value_mm3, unit, default='cubic cm'):
+    """Convert cubic millimetres to a volume unit, falling back to default for unknown units"""
+    if unit not in UNIT_INDEX and default is not None:
+        unit = default
+    return convert(value_mm3, 'cubic mm', unit)
+
+
+def to_mm(value, unit):
+    """Convert a length to millimetres"""
+    return convert(value, unit, 'mm')
@@ -0,0 +1,100 @@
+"""Volume, box and efficiency math (water displacement at 4°C, 1 g/mL)."""
+import numpy as np
+
+from . import units
+
+# Weight unit -> volume factors, one row per weight unit, columns follow VOLUME_COLUMNS
+WEIGHT_UNITS = list(units.WEIGHT_UNITS)
+VOLUME_COLUMNS = ['mm³', 'cm³', 'in³']
+VOLUME_FACTOR_MATRIX = units.FACTOR_MATRIX[np.ix_(
+    [units.UNIT_INDEX[u] for u in WEIGHT_UNITS],
+    [units.UNIT_INDEX[u] for u in ('cubic mm', 'cubic cm', 'cubic inches')]
+)]
+WEIGHT_UNIT_INDEX = {unit: i for i, unit in enumerate(WEIGHT_UNITS)}
+
+# Vertex index pairs for the 12 edges of a box (bottom face, top face, uprights)
+BOX_EDGES = [
+    [0,1], [1,2], [2,3], [3,0],
+    [4,5], [5,6], [6,7], [7,4],
+    [0,4], [1,5], [2,6], [3,7]
+]
+
+
+def calculate_volume(weight, unit):
+    """Calculate volume conversions"""
+    factors = VOLUME_FACTOR_MATRIX[WEIGHT_UNIT_INDEX[unit]]
+    return {col: weight * factor for col, factor in zip(VOLUME_COLUMNS, factors)}
+
+
+def calculate_volumes_batch(weights, weight_units):
+    """Calculate volume conversions for whole weight and weight-unit arrays in one pass.
+
+    Returns a dict of NumPy columns keyed like calculate_volume ('mm³', 'cm³', 'in³').
+    Raises KeyError for an unknown unit, same as the scalar version.
+    """
+    weights = np.asarray(weights, dtype=float)
+    if weights.size == 0:
+        return {col: np.empty(0) for col in VOLUME_COLUMNS}
+
+    # Map each distinct unit string to its matrix row once, then broadcast
+    categorical = getattr(weight_units, 'cat', None)
+    if categorical is not None:
+        # Categorical columns (the sample store) already carry the unit codes
+        unique_units, inverse = list(categorical.categories), categorical.codes.to_numpy()
+        if (inverse < 0).any():
+            raise KeyError(None)
+    else:
+        unique_units, inverse = np.unique(np.asarray(weight_units, dtype=object), return_inverse=True)
+    rows = np.array([WEIGHT_UNIT_INDEX[u] for u in unique_units])
+    volumes = weights[:, None] * VOLUME_FACTOR_MATRIX[rows[inverse]]
+    return {col: volumes[:, i] for i, col in enumerate(VOLUME_COLUMNS)}
+
+
+def box_volume_mm3(length, width, height, dimension_unit):
+    """Volume of a rectangular box in mm³ from dimensions in dimension_unit"""
+    return (units.to_mm(length, dimension_unit)
+            * units.to_mm(width, dimension_unit)
+            * units.to_mm(height, dimension_unit))
+
+
+def volume_efficiency(product_volume_mm3, box_volume_mm3):
+    """Percentage of the box volume taken by the product (0 for an empty box)"""
+    return (product_volume_mm3 / box_volume_mm3 * 100) if box_volume_mm3 > 0 else 0
+
+
+def volume_breakdown(product_volume_mm3, box_volume_mm3):
+    """Box/product/remaining volumes in mm³ plus used and free percentages"""
+    remaining_mm3 = box_volume_mm3 - product_volume_mm3
+    if box_volume_mm3 > 0:
+        efficiency_pct = product_volume_mm3 / box_volume_mm3 * 100
+        remaining_pct = remaining_mm3 / box_volume_mm3 * 100
+    else:
+        efficiency_pct = 0
+        remaining_pct = 0
+    return {
+        'box_volume_mm3': box_volume_mm3,
+        'product_volume_mm3': product_volume_mm3,
+        'remaining_volume_mm3': remaining_mm3,
+        'efficiency_pct': efficiency_pct,
+        'remaining_pct': remaining_pct,
+    }
+
+
+def volume_breakdown_batch(product_volume, box_volume):
+    """volume_breakdown over whole arrays in one pass.
+
+    Works in any single volume unit; keys match volume_breakdown, with the
+    percentages 0 where a box volume is not positive.
+    """
+    product = np.asarray(product_volume, dtype=float)
+    box = np.asarray(box_volume, dtype=float)
+    remaining = box - product
+    has_box = box > 0
+    safe_box = np.where(has_box, box, 1.0)
+    return {
+        'box_volume_mm3': box,
+        'product_volume_mm3': product,
+        'remaining_volume_mm3': remaining,
+        'efficiency_pct': np.where(has_box, product / safe_box * 100, 0.0),
+        'remaining_pct': np.where(has_box, remaining / safe_box * 100, 0.0),
+    }
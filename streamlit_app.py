@@ -1,25 +1,30 @@
 import streamlit as st
+import importlib.util
 import json
 import os
 from pathlib import Path
 import time
 from datetime import datetime
 import plotly.graph_objects as go
-import plotly.express as px
-import numpy as np
-
-# Matplotlib for 3D snapshot generation
-try:
-    import matplotlib
-    matplotlib.use('Agg')  # Non-interactive backend for server-side rendering
-    import matplotlib.pyplot as plt
-    from mpl_toolkits.mplot3d import Axes3D
-    from mpl_toolkits.mplot3d.art3d import Poly3DCollection
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
-    # Don't show warning at module level - Streamlit context not ready yet
-    # Warning will be shown when user tries to generate snapshot
+
+import dva_core
+from dva_core import units as dva_units
+from dva_core.plotly_charts import (
+    create_3d_box_visualization,
+    create_3d_volume_preview,
+    create_designer_void_chart,
+    create_donut_chart,
+    create_efficiency_gauge,
+    create_efficiency_histogram,
+    create_efficiency_trend_chart,
+    create_volume_breakdown_bar,
+    create_volume_comparison_chart,
+    create_volume_comparison_multiples,
+)
+
+# Matplotlib is only imported when a 3D snapshot is rendered (dva_core.mpl_charts);
+# checking for it here keeps it off the cold-start path
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec('matplotlib') is not None
 
 # Page configuration
 st.set_page_config(
@@ -548,33 +553,55 @@ st.markdown("""
 
 # Data management
 DATA_FILE = 'dva_data.json'
+# Last "Save Analysis Data" of any session, reloaded as a fallback
+ANALYSIS_DATA_FILE = 'dva_analysis_data.json'
+
+# CSV uploads above this size are imported in chunks instead of read whole
+STREAMING_IMPORT_BYTES = 10 * 1024 * 1024
+SAMPLE_IMPORT_CHUNK_ROWS = 50_000
+
+# Sample storage: 'parquet' (default, migrates dva_data.json once; falls back
+# to JSON without pyarrow) or 'json'
+SAMPLE_STORE_BACKEND = os.environ.get('DVA_SAMPLE_STORE', 'parquet')
+
+@st.cache_resource
+def get_sample_store(backend):
+    """Open the sample store once per server process"""
+    return dva_core.open_sample_store(backend, json_path=DATA_FILE)
 
 def load_data():
-    """Load sample data from JSON file"""
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, 'r') as f:
-                content = f.read().strip()
-                if content:
-                    return json.loads(content)
-                else:
-                    return []
-        except (json.JSONDecodeError, ValueError):
-            # If JSON is corrupted, return empty list
-            return []
-    return []
-
-def save_data(samples):
-    """Save sample data to JSON file"""
+    """Load all samples as a typed DataFrame (id, weight, unit)"""
+    try:
+        return get_sample_store(SAMPLE_STORE_BACKEND).load()
+    except Exception as e:
+        st.error(f"Error loading data: {str(e)}")
+        return dva_core.typed_samples(None)
+
+def append_samples(samples, compact=True):
+    """Append new samples to the store without rewriting existing ones"""
+    try:
+        get_sample_store(SAMPLE_STORE_BACKEND).append(samples, compact=compact)
+    except Exception as e:
+        st.error(f"Error saving data: {str(e)}")
+
+def compact_samples():
+    """Fold the sample store's appended parts into one file"""
+    try:
+        get_sample_store(SAMPLE_STORE_BACKEND).compact()
+    except Exception as e:
+        st.error(f"Error saving data: {str(e)}")
+
+def delete_samples(sample_ids):
+    """Remove samples by ID from the store"""
     try:
-        with open(DATA_FILE, 'w') as f:
-            json.dump(samples, f, indent=2)
+        get_sample_store(SAMPLE_STORE_BACKEND).delete(sample_ids)
     except Exception as e:
         st.error(f"Error saving data: {str(e)}")
 
 def initialize_data():
-    """Initialize with sample data if file doesn't exist"""
-    if not os.path.exists(DATA_FILE):
+    """Initialize with sample data if the store doesn't exist yet"""
+    store = get_sample_store(SAMPLE_STORE_BACKEND)
+    if not store.exists():
         sample_data = [
             {'id': 'Sample-001', 'weight': 150, 'unit': 'grams'},
             {'id': 'Sample-002', 'weight': 5.5, 'unit': 'ounces'},
@@ -582,930 +609,163 @@ def initialize_data():
             {'id': 'Sample-004', 'weight': 0.75, 'unit': 'kilograms'},
             {'id': 'Sample-005', 'weight': 250, 'unit': 'grams'}
         ]
-        save_data(sample_data)
-
-def calculate_volume(weight, unit):
-    """Calculate volume conversions"""
-    conversions = {
-        'grams': {'mm³': 1000, 'cm³': 1, 'in³': 0.061023744},
-        'ounces': {'mm³': 28316.8466, 'cm³': 28.3168466, 'in³': 1.7295904},
-        'pounds': {'mm³': 453592.37, 'cm³': 453.59237, 'in³': 27.6806742},
-        'kilograms': {'mm³': 1000000, 'cm³': 1000, 'in³': 61.023744}
-    }
-    
-    results = conversions[unit]
-    return {
-        'mm³': weight * results['mm³'],
-        'cm³': weight * results['cm³'],
-        'in³': weight * results['in³']
-    }
-
-def create_efficiency_gauge(efficiency_percentage):
-    """Create animated gauge chart for volume efficiency"""
-    # Determine color and status
-    if efficiency_percentage >= 95:
-        color = "#10b981"  # Emerald green
-        status = "OPTIMAL"
-    elif efficiency_percentage >= 85:
-        color = "#3b82f6"  # Blue
-        status = "EXCELLENT"
-    elif efficiency_percentage >= 75:
-        color = "#8b5cf6"  # Purple
-        status = "GOOD"
-    elif efficiency_percentage >= 60:
-        color = "#f59e0b"  # Amber
-        status = "MODERATE"
-    elif efficiency_percentage >= 40:
-        color = "#f97316"  # Orange
-        status = "POOR"
-    else:
-        color = "#ef4444"  # Red
-        status = "CRITICAL"
-    
-    fig = go.Figure(go.Indicator(
-        mode = "gauge+number+delta",
-        value = efficiency_percentage,
-        domain = {'x': [0, 1], 'y': [0, 1]},
-        title = {'text': f"<b>{status}</b>", 'font': {'size': 24, 'color': color}},
-        number = {
-            'suffix': "%",
-            'font': {'size': 48, 'color': color},
-            'valueformat': '.1f'
-        },
-        delta = {
-            'reference': 85,
-            'increasing': {'color': "#10b981"},
-            'decreasing': {'color': "#ef4444"}
-        },
-        gauge = {
-            'axis': {
-                'range': [None, 100],
-                'tickwidth': 2,
-                'tickcolor': "rgba(148, 163, 184, 0.3)",
-                'tickfont': {'color': '#94a3b8', 'size': 12}
-            },
-            'bar': {'color': color, 'thickness': 0.7},
-            'bgcolor': "rgba(255,255,255,0.05)",
-            'borderwidth': 2,
-            'bordercolor': "rgba(148, 163, 184, 0.2)",
-            'steps': [
-                {'range': [0, 40], 'color': 'rgba(239, 68, 68, 0.1)'},
-                {'range': [40, 60], 'color': 'rgba(249, 115, 22, 0.1)'},
-                {'range': [60, 75], 'color': 'rgba(245, 158, 11, 0.1)'},
-                {'range': [75, 85], 'color': 'rgba(139, 92, 246, 0.1)'},
-                {'range': [85, 95], 'color': 'rgba(59, 130, 246, 0.1)'},
-                {'range': [95, 100], 'color': 'rgba(16, 185, 129, 0.1)'}
-            ],
-            'threshold': {
-                'line': {'color': "#60a5fa", 'width': 3},
-                'thickness': 0.75,
-                'value': 85
-            }
-        }
-    ))
-    
-    fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font={'color': "#e2e8f0"},
-        height=300,
-        margin=dict(l=20, r=20, t=60, b=20)
-    )
-    
-    return fig
+        store.replace_all(dva_core.typed_samples(sample_data))
 
+def ensure_samples_loaded():
+    """Load samples into the session the first time a sample tab is opened"""
+    if 'samples' not in st.session_state:
+        initialize_data()
+        st.session_state.samples = load_data()
 
-def create_3d_snapshot(length, width, height, product_volume_pct,
-                        dimension_unit='inches', project_number=None, 
-                        elev=22, azim=-55):
-    """
-    Render a static PNG of the 3D volume preview using matplotlib.
-    Saves to dva_projects/project_{N}/3d_preview.png and returns the path.
-    
-    Parameters:
-    - elev: Camera elevation angle in degrees (default: 22)
-    - azim: Camera azimuth angle in degrees (default: -55)
-    """
-    if not MATPLOTLIB_AVAILABLE:
-        raise ImportError("Matplotlib is not installed. Cannot generate 3D snapshot.")
-
-    fig_m = plt.figure(figsize=(7, 5), facecolor='#0f172a')
-    ax    = fig_m.add_subplot(111, projection='3d')
-    ax.set_facecolor('#0f172a')
-    ax.grid(False)
-    for pane in (ax.xaxis.pane, ax.yaxis.pane, ax.zaxis.pane):
-        pane.fill = False
-        pane.set_edgecolor('none')
-    ax.set_axis_off()
-
-    l, w, h = length/2, width/2, height/2
-
-    # Box wireframe (blue)
-    bv = [[-l,-w,-h],[l,-w,-h],[l,w,-h],[-l,w,-h],
-          [-l,-w, h],[l,-w, h],[l,w, h],[-l,w, h]]
-    for e in [[0,1],[1,2],[2,3],[3,0],[4,5],[5,6],[6,7],[7,4],
-              [0,4],[1,5],[2,6],[3,7]]:
-        v1,v2 = bv[e[0]],bv[e[1]]
-        ax.plot([v1[0],v2[0]],[v1[1],v2[1]],[v1[2],v2[2]],
-                color='#3b82f6', lw=1.8, zorder=3)
-
-    # Liquid fill (green)
-    if product_volume_pct > 0:
-        fh = -h + height * (product_volume_pct / 100)
-        def quad(a,b,c,d): return [list(a),list(b),list(c),list(d)]
-        faces = [
-            quad([-l,-w,-h],[l,-w,-h],[l,w,-h],[-l,w,-h]),
-            quad([-l,-w,fh],[l,-w,fh],[l,w,fh],[-l,w,fh]),
-            quad([-l,-w,-h],[l,-w,-h],[l,-w,fh],[-l,-w,fh]),
-            quad([-l, w,-h],[l, w,-h],[l, w,fh],[-l, w,fh]),
-            quad([-l,-w,-h],[-l,w,-h],[-l,w,fh],[-l,-w,fh]),
-            quad([l,-w,-h],[l,w,-h],[l,w,fh],[l,-w,fh]),
-        ]
-        ax.add_collection3d(Poly3DCollection(faces, alpha=0.35,
-            facecolor='#10b981', edgecolor='#059669', lw=0.5))
-
-    # Grid (light grey, same 3-face pattern as interactive view)
-    gc = '#4b5563'
-    n  = 5
-    for i in range(n+1):
-        gx=-l+2*l*i/n; gy=-w+2*w*i/n; gz=-h+2*h*i/n
-        ax.plot([-l,l],[gy,gy],[-h,-h],color=gc,lw=0.5,alpha=0.6)
-        ax.plot([gx,gx],[-w,w],[-h,-h],color=gc,lw=0.5,alpha=0.6)
-        ax.plot([gx,gx],[-w,-w],[-h,h],color=gc,lw=0.5,alpha=0.6)
-        ax.plot([-l,l],[-w,-w],[gz,gz],color=gc,lw=0.5,alpha=0.6)
-        ax.plot([-l,-l],[-w,w],[gz,gz],color=gc,lw=0.5,alpha=0.6)
-        ax.plot([-l,-l],[gy,gy],[-h,h],color=gc,lw=0.5,alpha=0.6)
-
-    # Use provided camera angles
-    ax.view_init(elev=elev, azim=azim)
-    ax.set_box_aspect([length, width, height])
-
-    # Dimension callouts with lines
-    tc = '#b0b8c4'
-    
-    # Length callout
-    ax.plot([0, 0], [-w, -w*1.2], [-h, -h*1.15], color=tc, lw=1.5, zorder=2)
-    ax.text(0, -w*1.2, -h*1.15, f'L {length:.0f} {dimension_unit}',
-            color=tc, fontsize=8, ha='center', va='top', weight='bold')
-    
-    # Width callout
-    ax.plot([l, l*1.2], [0, 0], [-h, -h*1.1], color=tc, lw=1.5, zorder=2)
-    ax.text(l*1.2, 0, -h*1.1, f'W {width:.0f} {dimension_unit}',
-            color=tc, fontsize=8, ha='left', va='center', weight='bold')
-    
-    # Height callout
-    ax.plot([-l, -l*1.2], [w, w*1.15], [0, 0], color=tc, lw=1.5, zorder=2)
-    ax.text(-l*1.2, w*1.15, 0, f'H {height:.0f} {dimension_unit}',
-            color=tc, fontsize=8, ha='right', va='center', weight='bold')
-
-    plt.tight_layout(pad=0)
-
-    if project_number is not None:
-        folder = os.path.join('dva_projects', f'project_{project_number}')
-    else:
-        folder = os.path.join('dva_projects', 'unsaved')
-    os.makedirs(folder, exist_ok=True)
-    img_path = os.path.join(folder, '3d_preview.png')
-    fig_m.savefig(img_path, dpi=150, bbox_inches='tight',
-                  facecolor='#0f172a', edgecolor='none')
-    plt.close(fig_m)
-    return img_path
-
-def create_pdf_efficiency_gauge_matplotlib(efficiency_pct, output_path):
-    """Create efficiency gauge using matplotlib for PDF"""
-    import numpy as np
-    
-    fig, ax = plt.subplots(figsize=(3.5, 2.5), facecolor='white')
-    ax.set_xlim(-1.2, 1.2)
-    ax.set_ylim(-0.2, 1.2)
-    ax.set_aspect('equal')
-    ax.axis('off')
-    
-    # Background arc (grey)
-    theta = np.linspace(0, 180, 100)
-    x_bg = np.cos(np.radians(theta))
-    y_bg = np.sin(np.radians(theta))
-    ax.fill_between(x_bg, 0, y_bg, color='#e5e7eb', alpha=0.3)
-    
-    # Efficiency arc (colored based on percentage)
-    if efficiency_pct < 50:
-        color = '#ef4444'  # Red
-    elif efficiency_pct < 75:
-        color = '#f59e0b'  # Orange
-    else:
-        color = '#10b981'  # Green
-    
-    theta_fill = np.linspace(0, 180 * (efficiency_pct / 100), 100)
-    x_fill = np.cos(np.radians(theta_fill))
-    y_fill = np.sin(np.radians(theta_fill))
-    ax.fill_between(x_fill, 0, y_fill, color=color, alpha=0.8)
-    
-    # Border arc
-    ax.plot(x_bg, y_bg, color='#374151', linewidth=2)
-    
-    # Center text
-    ax.text(0, 0.3, f'{efficiency_pct:.1f}%', 
-            ha='center', va='center', fontsize=24, fontweight='bold', color='#1f2937')
-    ax.text(0, 0.05, 'Volume Efficiency', 
-            ha='center', va='center', fontsize=9, color='#6b7280')
-    
-    # Tick marks
-    for i in range(0, 101, 25):
-        angle = np.radians(180 * (i / 100))
-        x1, y1 = np.cos(angle) * 0.95, np.sin(angle) * 0.95
-        x2, y2 = np.cos(angle) * 1.05, np.sin(angle) * 1.05
-        ax.plot([x1, x2], [y1, y2], color='#374151', linewidth=1.5)
-        ax.text(x2 * 1.15, y2 * 1.15, f'{i}%', 
-                ha='center', va='center', fontsize=7, color='#6b7280')
-    
-    plt.tight_layout(pad=0.1)
-    plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    return output_path
-
-def create_pdf_donut_chart_matplotlib(efficiency_pct, output_path):
-    """Create donut chart using matplotlib for PDF"""
-    fig, ax = plt.subplots(figsize=(3.5, 2.5), facecolor='white')
-    
-    # Data
-    sizes = [efficiency_pct, 100 - efficiency_pct]
-    colors = ['#10b981', '#3b82f6']
-    labels = ['Product', 'Remaining']
-    
-    # Create donut
-    wedges, texts = ax.pie(sizes, colors=colors, startangle=90, 
-                            counterclock=False, wedgeprops=dict(width=0.5))
-    
-    # Center text
-    ax.text(0, 0.1, f'{efficiency_pct:.1f}%', 
-            ha='center', va='center', fontsize=20, fontweight='bold', color='#1f2937')
-    ax.text(0, -0.15, 'Efficiency', 
-            ha='center', va='center', fontsize=8, color='#6b7280')
-    
-    # Legend
-    ax.legend(labels, loc='upper right', fontsize=8, frameon=False)
-    
-    ax.set_aspect('equal')
-    plt.tight_layout(pad=0.1)
-    plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    return output_path
-
-def create_pdf_breakdown_bar_matplotlib(box_vol, product_vol, unit, output_path):
-    """Create volume breakdown bar using matplotlib for PDF"""
-    fig, ax = plt.subplots(figsize=(7, 2), facecolor='white')
-    
-    remaining_vol = box_vol - product_vol
-    
-    # Bar dimensions
-    bar_height = 0.6
-    y_pos = 0.5
-    
-    # Box volume bar (background)
-    ax.barh(y_pos, box_vol, height=bar_height, color='#3b82f6', alpha=0.3, 
-            edgecolor='#2563eb', linewidth=2)
-    
-    # Product volume bar
-    ax.barh(y_pos, product_vol, height=bar_height, color='#10b981', alpha=0.8,
-            edgecolor='#059669', linewidth=1.5)
-    
-    # Labels
-    ax.text(box_vol / 2, y_pos, f'Box: {box_vol:.2f} {unit}', 
-            ha='center', va='center', fontsize=10, fontweight='bold', color='#1e40af')
-    
-    if product_vol > box_vol * 0.1:  # Only show if big enough
-        ax.text(product_vol / 2, y_pos, f'Product: {product_vol:.2f}', 
-                ha='center', va='center', fontsize=9, color='white', fontweight='bold')
-    
-    if remaining_vol > box_vol * 0.05:
-        ax.text(product_vol + remaining_vol / 2, y_pos, f'Remaining: {remaining_vol:.2f}',
-                ha='center', va='center', fontsize=9, color='#1e40af')
-    
-    ax.set_xlim(0, box_vol * 1.05)
-    ax.set_ylim(0, 1)
-    ax.set_xlabel(f'Volume ({unit})', fontsize=10, color='#374151')
-    ax.set_title('Volume Breakdown', fontsize=11, fontweight='bold', color='#1f2937', pad=10)
-    ax.set_yticks([])
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_visible(False)
-    ax.grid(axis='x', alpha=0.3, linestyle='--')
-    
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    return output_path
-
-def create_3d_box_visualization(length, width, height, product_volume_pct, dimension_unit='inches'):
-    """Create interactive 3D box with dimension labels"""
-    
-    # Determine color based on efficiency
-    if product_volume_pct >= 85:
-        box_color = '#10b981'  # Green
-        fill_color = 'rgba(16, 185, 129, 0.3)'
-    elif product_volume_pct >= 75:
-        box_color = '#3b82f6'  # Blue
-        fill_color = 'rgba(59, 130, 246, 0.3)'
-    elif product_volume_pct >= 60:
-        box_color = '#f59e0b'  # Orange
-        fill_color = 'rgba(245, 158, 11, 0.3)'
-    else:
-        box_color = '#ef4444'  # Red
-        fill_color = 'rgba(239, 68, 68, 0.3)'
-    
-    # Define vertices of box (centered at origin)
-    l, w, h = length/2, width/2, height/2
-    vertices = [
-        [-l, -w, -h], [l, -w, -h], [l, w, -h], [-l, w, -h],  # Bottom
-        [-l, -w, h], [l, -w, h], [l, w, h], [-l, w, h]   # Top
-    ]
-    
-    # Define edges
-    edges = [
-        [0,1], [1,2], [2,3], [3,0],  # Bottom
-        [4,5], [5,6], [6,7], [7,4],  # Top
-        [0,4], [1,5], [2,6], [3,7]   # Vertical
-    ]
-    
-    fig = go.Figure()
-    
-    # Draw edges
-    for edge in edges:
-        v1, v2 = vertices[edge[0]], vertices[edge[1]]
-        fig.add_trace(go.Scatter3d(
-            x=[v1[0], v2[0]],
-            y=[v1[1], v2[1]],
-            z=[v1[2], v2[2]],
-            mode='lines',
-            line=dict(color=box_color, width=6),
-            showlegend=False,
-            hoverinfo='skip'
-        ))
-    
-    # Add semi-transparent faces
-    faces_i = [0, 0, 0, 0, 4, 4]
-    faces_j = [1, 3, 4, 1, 5, 7]
-    faces_k = [2, 7, 5, 5, 6, 6]
-    
-    fig.add_trace(go.Mesh3d(
-        x=[v[0] for v in vertices],
-        y=[v[1] for v in vertices],
-        z=[v[2] for v in vertices],
-        i=faces_i,
-        j=faces_j,
-        k=faces_k,
-        color=box_color,
-        opacity=0.15,
-        showlegend=False,
-        hoverinfo='skip'
-    ))
-    
-    # Dimension annotations — no efficiency label
-    # Length: label at LEFT end of the line
-    fig.add_trace(go.Scatter3d(
-        x=[-l, l],
-        y=[-w-0.3*w, -w-0.3*w],
-        z=[-h, -h],
-        mode='lines+text',
-        line=dict(color='#b0b8c4', width=2),
-        text=[f'{length:.1f} {dimension_unit}', ''],
-        textposition='top left',
-        textfont=dict(size=12, color='#b0b8c4'),
-        showlegend=False,
-        hoverinfo='skip'
-    ))
-
-    # Width: label BELOW the line (bottom center at far end)
-    fig.add_trace(go.Scatter3d(
-        x=[l+0.3*l, l+0.3*l],
-        y=[-w, w],
-        z=[-h, -h],
-        mode='lines+text',
-        line=dict(color='#b0b8c4', width=2),
-        text=['', f'{width:.1f} {dimension_unit}'],
-        textposition='bottom center',
-        textfont=dict(size=12, color='#b0b8c4'),
-        showlegend=False,
-        hoverinfo='skip'
-    ))
-
-    # Height: label at top (middle right)
-    fig.add_trace(go.Scatter3d(
-        x=[-l-0.3*l, -l-0.3*l],
-        y=[w, w],
-        z=[-h, h],
-        mode='lines+text',
-        line=dict(color='#b0b8c4', width=2),
-        text=['', f'{height:.1f} {dimension_unit}'],
-        textposition='middle right',
-        textfont=dict(size=12, color='#b0b8c4'),
-        showlegend=False,
-        hoverinfo='skip'
-    ))
-    
-    fig.update_layout(
-        scene=dict(
-            xaxis=dict(visible=False, showgrid=False, zeroline=False, showticklabels=False),
-            yaxis=dict(visible=False, showgrid=False, zeroline=False, showticklabels=False),
-            zaxis=dict(visible=False, showgrid=False, zeroline=False, showticklabels=False),
-            bgcolor='rgba(15, 23, 42, 0.4)',
-            camera=dict(
-                eye=dict(x=1.5, y=1.5, z=1.2),
-                up=dict(x=0, y=0, z=1)
-            ),
-            aspectmode='data'
-        ),
-        height=486,  # Reduced by 19% total for better fit
-        margin=dict(l=0, r=0, t=0, b=0),
-        paper_bgcolor='rgba(0,0,0,0)',
-        showlegend=False
-    )
-    
-    return fig
-
-def create_3d_volume_preview(length, width, height, product_volume_pct, dimension_unit='inches', 
-                            product_volume=None, product_weight=None, product_quantity=1):
-    """Create clean 3D Volume Preview with liquid fill - ONLY measurement numbers on graphic"""
-    
-    # Colors
-    box_color = '#3b82f6'  # Blue for box
-    liquid_color = '#10b981'  # Green for liquid/product
-    
-    # Calculate liquid fill height based on volume percentage
-    fill_height = height * (product_volume_pct / 100)
-    
-    # Define vertices for SECONDARY PACKAGING BOX (full size, centered at origin)
-    l, w, h = length/2, width/2, height/2
-    box_vertices = [
-        [-l, -w, -h], [l, -w, -h], [l, w, -h], [-l, w, -h],  # Bottom
-        [-l, -w, h], [l, -w, h], [l, w, h], [-l, w, h]   # Top
-    ]
-    
-    # Define edges for box
-    edges = [
-        [0,1], [1,2], [2,3], [3,0],  # Bottom
-        [4,5], [5,6], [6,7], [7,4],  # Top
-        [0,4], [1,5], [2,6], [3,7]   # Vertical
-    ]
-    
-    fig = go.Figure()
-    
-    # === DRAW SECONDARY PACKAGING BOX (BLUE WIREFRAME) ===
-    for edge in edges:
-        v1, v2 = box_vertices[edge[0]], box_vertices[edge[1]]
-        fig.add_trace(go.Scatter3d(
-            x=[v1[0], v2[0]],
-            y=[v1[1], v2[1]],
-            z=[v1[2], v2[2]],
-            mode='lines',
-            line=dict(color=box_color, width=6),
-            showlegend=False,
-            hoverinfo='skip'
-        ))
-    
-    # Add semi-transparent box faces
-    faces_i = [0, 0, 0, 0, 4, 4]
-    faces_j = [1, 3, 4, 1, 5, 7]
-    faces_k = [2, 7, 5, 5, 6, 6]
-    
-    fig.add_trace(go.Mesh3d(
-        x=[v[0] for v in box_vertices],
-        y=[v[1] for v in box_vertices],
-        z=[v[2] for v in box_vertices],
-        i=faces_i,
-        j=faces_j,
-        k=faces_k,
-        color=box_color,
-        opacity=0.08,
-        showlegend=False,
-        hoverinfo='skip'
-    ))
-    
-    # === DRAW LIQUID FILL (GREEN) - Product volume as liquid ===
-    if product_volume_pct > 0:
-        liquid_vertices = [
-            [-l, -w, -h], [l, -w, -h], [l, w, -h], [-l, w, -h],  # Bottom (same as box)
-            [-l, -w, -h + fill_height], [l, -w, -h + fill_height],  # Top of liquid
-            [l, w, -h + fill_height], [-l, w, -h + fill_height]
-        ]
-        
-        # Draw liquid as solid mesh (semi-transparent green)
-        fig.add_trace(go.Mesh3d(
-            x=[v[0] for v in liquid_vertices],
-            y=[v[1] for v in liquid_vertices],
-            z=[v[2] for v in liquid_vertices],
-            i=faces_i,
-            j=faces_j,
-            k=faces_k,
-            color=liquid_color,
-            opacity=0.4,
-            showlegend=False,
-            hoverinfo='skip'
-        ))
-        
-        # Add liquid surface line (top edge of liquid)
-        liquid_surface_edges = [[4,5], [5,6], [6,7], [7,4]]  # Top edges
-        for edge in liquid_surface_edges:
-            v1, v2 = liquid_vertices[edge[0]], liquid_vertices[edge[1]]
-            fig.add_trace(go.Scatter3d(
-                x=[v1[0], v2[0]],
-                y=[v1[1], v2[1]],
-                z=[v1[2], v2[2]],
-                mode='lines',
-                line=dict(color=liquid_color, width=5),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-    
-    # === GRID PLANES (behind cube, dark grey) ===
-    num_ticks = 5
-    grid_col  = '#9ca3af'   # light grey for grid lines
-    scale_col = '#b0b8c4'   # light grey for rulers and labels
-
-    # Helper: draw a grid line
-    def grid_line(x0,y0,z0, x1,y1,z1):
-        fig.add_trace(go.Scatter3d(
-            x=[x0,x1], y=[y0,y1], z=[z0,z1],
-            mode='lines', line=dict(color=grid_col, width=1.5),
-            showlegend=False, hoverinfo='skip'))
-
-    # Bottom face grid (z = -h plane) — x-rows and y-columns
-    for i in range(num_ticks + 1):
-        gx = -l + 2*l * i / num_ticks
-        gy = -w + 2*w * i / num_ticks
-        grid_line(-l, gy, -h,  l, gy, -h)   # row (along x)
-        grid_line(gx, -w, -h, gx,  w, -h)   # column (along y)
-
-    # Front face grid (y = -w plane) — x-columns and z-rows
-    for i in range(num_ticks + 1):
-        gx = -l + 2*l * i / num_ticks
-        gz = -h + 2*h * i / num_ticks
-        grid_line(gx, -w, -h, gx, -w,  h)   # column (along z)
-        grid_line(-l, -w, gz,  l, -w, gz)   # row (along x)
-
-    # Left face grid (x = -l plane) — y-columns and z-rows
-    for i in range(num_ticks + 1):
-        gy = -w + 2*w * i / num_ticks
-        gz = -h + 2*h * i / num_ticks
-        grid_line(-l, gy, -h, -l, gy,  h)   # column (along z)
-        grid_line(-l, -w, gz, -l,  w, gz)   # row (along y)
-
-    # === DIMENSION CALLOUTS (lines pointing away from box ~20%) ══════════════
-    dim_col = '#b0b8c4'  # light grey for dimension labels and lines
-    
-    # Length callout: bottom front edge, extend down/forward 20%
-    len_start_x, len_start_y, len_start_z = 0, -w, -h
-    len_end_x, len_end_y, len_end_z = 0, -w * 1.2, -h * 1.15
-    fig.add_trace(go.Scatter3d(
-        x=[len_start_x, len_end_x],
-        y=[len_start_y, len_end_y],
-        z=[len_start_z, len_end_z],
-        mode='lines',
-        line=dict(color=dim_col, width=2),
-        showlegend=False, hoverinfo='skip'))
-    fig.add_trace(go.Scatter3d(
-        x=[len_end_x], y=[len_end_y], z=[len_end_z],
-        mode='text',
-        text=[f'L: {length:.1f} {dimension_unit}'],
-        textfont=dict(size=11, color=dim_col, family='Arial Black'),
-        textposition='bottom center',
-        showlegend=False, hoverinfo='skip'))
-    
-    # Width callout: right center edge, extend right 20%
-    wid_start_x, wid_start_y, wid_start_z = l, 0, -h
-    wid_end_x, wid_end_y, wid_end_z = l * 1.2, 0, -h * 1.1
-    fig.add_trace(go.Scatter3d(
-        x=[wid_start_x, wid_end_x],
-        y=[wid_start_y, wid_end_y],
-        z=[wid_start_z, wid_end_z],
-        mode='lines',
-        line=dict(color=dim_col, width=2),
-        showlegend=False, hoverinfo='skip'))
-    fig.add_trace(go.Scatter3d(
-        x=[wid_end_x], y=[wid_end_y], z=[wid_end_z],
-        mode='text',
-        text=[f'W: {width:.1f} {dimension_unit}'],
-        textfont=dict(size=11, color=dim_col, family='Arial Black'),
-        textposition='middle right',
-        showlegend=False, hoverinfo='skip'))
-    
-    # Height callout: left back edge, extend left/back 20%
-    hgt_start_x, hgt_start_y, hgt_start_z = -l, w, 0
-    hgt_end_x, hgt_end_y, hgt_end_z = -l * 1.2, w * 1.15, 0
-    fig.add_trace(go.Scatter3d(
-        x=[hgt_start_x, hgt_end_x],
-        y=[hgt_start_y, hgt_end_y],
-        z=[hgt_start_z, hgt_end_z],
-        mode='lines',
-        line=dict(color=dim_col, width=2),
-        showlegend=False, hoverinfo='skip'))
-    fig.add_trace(go.Scatter3d(
-        x=[hgt_end_x], y=[hgt_end_y], z=[hgt_end_z],
-        mode='text',
-        text=[f'H: {height:.1f} {dimension_unit}'],
-        textfont=dict(size=11, color=dim_col, family='Arial Black'),
-        textposition='middle left',
-        showlegend=False, hoverinfo='skip'))
-
-    # === NUMERIC SCALE LABELS (on grid edges) ═══════════════════════════════
-    label_col  = '#9ca3af'  # light grey matching grid
-    label_size = 9
-
-    # Length scale (bottom face, front edge y=-w)
-    for i in range(num_ticks + 1):
-        gx  = -l + 2*l * i / num_ticks
-        val = int(round(i * length / num_ticks))
-        fig.add_trace(go.Scatter3d(
-            x=[gx], y=[-w * 1.25], z=[-h],
-            mode='text', text=[str(val)],
-            textfont=dict(size=label_size, color=label_col),
-            textposition='bottom center',
-            showlegend=False, hoverinfo='skip'))
-
-    # Width scale (bottom face, right edge x=l)
-    for i in range(num_ticks + 1):
-        gy  = -w + 2*w * i / num_ticks
-        val = int(round(i * width / num_ticks))
-        fig.add_trace(go.Scatter3d(
-            x=[l * 1.25], y=[gy], z=[-h],
-            mode='text', text=[str(val)],
-            textfont=dict(size=label_size, color=label_col),
-            textposition='middle right',
-            showlegend=False, hoverinfo='skip'))
-
-    # Height scale (left face, back edge x=-l, y=w)
-    for i in range(num_ticks + 1):
-        gz  = -h + 2*h * i / num_ticks
-        val = int(round(i * height / num_ticks))
-        fig.add_trace(go.Scatter3d(
-            x=[-l * 1.25], y=[w], z=[gz],
-            mode='text', text=[str(val)],
-            textfont=dict(size=label_size, color=label_col),
-            textposition='middle left',
-            showlegend=False, hoverinfo='skip'))
-
-    fig.update_layout(
-        scene=dict(
-            xaxis=dict(visible=False, showgrid=False, zeroline=False, showticklabels=False),
-            yaxis=dict(visible=False, showgrid=False, zeroline=False, showticklabels=False),
-            zaxis=dict(visible=False, showgrid=False, zeroline=False, showticklabels=False),
-            bgcolor='rgba(15, 23, 42, 0.4)',
-            camera=dict(
-                eye=dict(x=1.7, y=1.7, z=1.4),
-                up=dict(x=0, y=0, z=1)
-            ),
-            aspectmode='data'
-        ),
-        height=420,
-        margin=dict(l=0, r=0, t=0, b=0),
-        paper_bgcolor='rgba(0,0,0,0)',
-        showlegend=False
-    )
-    
-    return fig
-
-
-def create_volume_comparison_chart(box_volume, product_volume, unit='cubic inches'):
-    """Create horizontal stacked bar chart for volume comparison"""
-    efficiency = (product_volume / box_volume * 100) if box_volume > 0 else 0
-    remaining = box_volume - product_volume
-    
-    fig = go.Figure()
-    
-    # Product volume bar
-    fig.add_trace(go.Bar(
-        y=['Utilization'],
-        x=[product_volume],
-        name='Product Volume',
-        orientation='h',
-        marker=dict(
-            color='#3b82f6',
-            line=dict(color='#2563eb', width=2)
-        ),
-        text=f'{product_volume:.2f} {unit}<br>({efficiency:.1f}%)',
-        textposition='inside',
-        textfont=dict(color='white', size=14),
-        hovertemplate=f'Product: {product_volume:.2f} {unit}<br>Efficiency: {efficiency:.1f}%<extra></extra>'
-    ))
-    
-    # Remaining space bar
-    fig.add_trace(go.Bar(
-        y=['Utilization'],
-        x=[remaining],
-        name='Remaining Space',
-        orientation='h',
-        marker=dict(
-            color='#10b981' if remaining > 0 else '#ef4444',
-            line=dict(color='#059669' if remaining > 0 else '#dc2626', width=2)
-        ),
-        text=f'{remaining:.2f} {unit}<br>({100-efficiency:.1f}%)',
-        textposition='inside',
-        textfont=dict(color='white', size=14),
-        hovertemplate=f'Remaining: {remaining:.2f} {unit}<br>Free: {100-efficiency:.1f}%<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        barmode='stack',
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#e2e8f0'),
-        xaxis=dict(
-            title=dict(text=f'Volume ({unit})', font=dict(color='#94a3b8')),
-            gridcolor='rgba(148, 163, 184, 0.2)',
-            zerolinecolor='rgba(148, 163, 184, 0.3)'
-        ),
-        yaxis=dict(
-            showticklabels=False,
-            showgrid=False
-        ),
-        height=150,
-        margin=dict(l=0, r=0, t=30, b=40),
-        showlegend=True,
-        legend=dict(
-            orientation='h',
-            yanchor='bottom',
-            y=1.02,
-            xanchor='center',
-            x=0.5,
-            font=dict(size=12)
-        ),
-        hovermode='closest'
-    )
-    
-    return fig
-
-def create_donut_chart(efficiency_percentage):
-    """Create donut chart for space distribution"""
-    remaining_pct = 100 - efficiency_percentage
-    
-    # Determine colors based on efficiency
-    if efficiency_percentage >= 85:
-        product_color = '#10b981'
-    elif efficiency_percentage >= 75:
-        product_color = '#3b82f6'
-    elif efficiency_percentage >= 60:
-        product_color = '#f59e0b'
-    else:
-        product_color = '#ef4444'
-    
-    remaining_color = '#94a3b8' if remaining_pct > 0 else '#ef4444'
-    
-    fig = go.Figure(data=[go.Pie(
-        labels=['Product Volume', 'Free Space'],
-        values=[efficiency_percentage, remaining_pct],
-        hole=.6,
-        marker=dict(
-            colors=[product_color, remaining_color],
-            line=dict(color='rgba(10, 25, 41, 0.8)', width=3)
-        ),
-        textinfo='label+percent',
-        textfont=dict(size=13, color='white'),
-        hovertemplate='<b>%{label}</b><br>%{value:.1f}%<extra></extra>',
-        pull=[0.05, 0]
-    )])
-    
-    fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#e2e8f0'),
-        showlegend=True,
-        legend=dict(
-            orientation='h',
-            yanchor='bottom',
-            y=-0.15,
-            xanchor='center',
-            x=0.5,
-            font=dict(size=12)
-        ),
-        height=300,
-        margin=dict(l=20, r=20, t=40, b=60),
-        annotations=[dict(
-            text=f'<b>{efficiency_percentage:.1f}%</b><br><span style="font-size:12px">Filled</span>',
-            x=0.5, y=0.5,
-            font=dict(size=24, color=product_color),
-            showarrow=False
-        )]
-    )
-    
-    return fig
-
-def create_mini_efficiency_bar(efficiency_pct):
-    """Create mini horizontal bar chart for project efficiency"""
-    # Determine color based on efficiency
-    if efficiency_pct >= 85:
-        color = '#10b981'
-        label = 'Excellent'
-    elif efficiency_pct >= 75:
-        color = '#3b82f6'
-        label = 'Good'
-    elif efficiency_pct >= 60:
-        color = '#f59e0b'
-        label = 'Fair'
+@st.cache_resource
+def get_figure_cache():
+    """Serialized chart figures shared by all sessions and reruns"""
+    return dva_core.FigureCache()
+
+def cached_figure(builder, *args, **kwargs):
+    """Chart from the shared figure cache; built only for new inputs"""
+    figure_json = get_figure_cache().get_json(builder, *args, **kwargs)
+    # The JSON comes from a validated figure, so skip plotly's re-validation
+    return go.Figure(json.loads(figure_json), skip_invalid=True, _validate=False)
+
+# Background rendering of snapshots and chart images (worker processes).
+# Chart images export with matplotlib ('agg', default) or Plotly/kaleido
+# ('kaleido', needs Chrome)
+CHART_EXPORT_ENGINE = os.environ.get('DVA_CHART_EXPORT', 'agg')
+# PDF reports are kept in memory up to this size, then spooled to disk
+REPORT_SPOOL_BYTES = 16 * 1024 * 1024
+# Directory of laid-out project pages reused by later reports (needs pypdf).
+# Off by default: cached builds are faster but stitch the report in memory,
+# and reports over DVA_REPORT_CACHE_MAX_PROJECTS stream regardless
+REPORT_PAGE_CACHE_DIR = os.environ.get('DVA_REPORT_CACHE', '')
+REPORT_PAGE_CACHE_MAX_PROJECTS = int(os.environ.get('DVA_REPORT_CACHE_MAX_PROJECTS', 200))
+RENDER_WORKERS = int(os.environ.get('DVA_RENDER_WORKERS', dva_core.jobs.DEFAULT_WORKERS))
+RENDER_RETRIES = int(os.environ.get('DVA_RENDER_RETRIES', dva_core.jobs.DEFAULT_RETRIES))
+
+@st.cache_resource
+def get_render_queue(max_workers, max_retries):
+    """Render job queue shared by all sessions; workers start on the first job"""
+    return dva_core.RenderQueue(max_workers, max_retries)
+
+@st.cache_resource
+def get_report_page_cache(directory, max_projects):
+    """Report page cache shared by all sessions"""
+    from dva_core import report as dva_report
+    return dva_report.ReportPageCache(directory, max_projects=max_projects)
+
+def project_artifact_attacher(project_number, field):
+    """on_success callback storing a finished render's result on a project record"""
+    if project_number is None:
+        return None
+    cache = project_cache
+
+    def attach(result):
+        # Read-merge-write in one step: jobs of one save finish on separate threads
+        cache.patch(project_number, **{field: result})
+    return attach
+
+def analysis_snapshot_recorder(analysis_data, attach=None):
+    """on_success callback writing a finished snapshot's path into the analysis data file"""
+    expected = dict(analysis_data)
+
+    def record(result):
+        if attach is not None:
+            attach(result)
+        try:
+            with open(ANALYSIS_DATA_FILE, 'r') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        # A newer save owns the file by now; leave it alone
+        if saved != expected:
+            return
+        tmp_path = f"{ANALYSIS_DATA_FILE}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({**expected, 'snapshot_path': result}, f, indent=2)
+        os.replace(tmp_path, ANALYSIS_DATA_FILE)
+    return record
+
+RENDER_JOB_LABELS = {'snapshot': '3D snapshot', 'charts': 'Volume Efficiency Analysis charts'}
+
+def show_chart_export_help(error):
+    """Explain why chart image export failed; the export is optional"""
+    if "Chrome" in error or "chrome" in error:
+        # Chrome/Chromium needed for Kaleido
+        with st.expander("ℹ️ Chart Export Requires Chrome (Optional Feature)", expanded=False):
+            st.info("""
+            **Volume Efficiency Analysis charts** require Google Chrome or Chromium to export.
+            
+            Your 3D snapshot is saved separately! Charts are optional.
+            
+            **To enable chart export:**
+            
+            **Option 1: Install Chrome**
+            - Download from: https://www.google.com/chrome/
+            
+            **Option 2: Install Chromium (Linux)**
+            ```bash
+            # Ubuntu/Debian
+            sudo apt-get install chromium-browser
+            
+            # Or use plotly helper
+            plotly_get_chrome
+            ```
+            
+            **Why Chrome is needed:**
+            Kaleido uses Chrome's rendering engine to convert interactive charts to PNG images.
+            
+            **Note:** Charts appear in the app (Project Overview) without Chrome. 
+            Chrome is only needed to save them for PDF reports.
+            """)
+    elif error.startswith(("ImportError", "ModuleNotFoundError")) or "kaleido" in error.lower():
+        # Kaleido not installed - this is OK
+        with st.expander("ℹ️ Chart Export Not Available (Optional Feature)", expanded=False):
+            st.info("""
+            **Volume Efficiency Analysis charts** can be saved for PDF reports.
+            
+            Your 3D snapshot is saved separately! Charts are optional.
+            
+            **To enable chart export:**
+            ```bash
+            pip install kaleido>=0.2.1
+            ```
+            
+            Then install Chrome/Chromium (see above for instructions).
+            
+            **Note:** Charts still appear in the app (Project Overview) without export capability.
+            """)
     else:
-        color = '#ef4444'
-        label = 'Poor'
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
-        x=[efficiency_pct],
-        y=[''],
-        orientation='h',
-        marker=dict(
-            color=color,
-            line=dict(color='rgba(255,255,255,0.2)', width=1)
-        ),
-        hovertemplate=f'<b>{efficiency_pct:.1f}% Filled</b><br>{label} Efficiency<extra></extra>',
-        showlegend=False,
-        hoverlabel=dict(
-            bgcolor=color,
-            font=dict(color='white', size=14, family='DM Sans')
-        )
-    ))
-    
-    fig.update_layout(
-        xaxis=dict(
-            range=[0, 100],
-            showticklabels=False,
-            showgrid=False,
-            zeroline=False
-        ),
-        yaxis=dict(
-            showticklabels=False,
-            showgrid=False
-        ),
-        height=35,
-        margin=dict(l=0, r=0, t=0, b=0),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        hovermode='closest'
-    )
-    
-    return fig
-
-def create_volume_breakdown_bar(product_volume, remaining_volume, unit):
-    """Create volume breakdown stacked bar chart showing product vs remaining"""
-    total = product_volume + remaining_volume
-    product_pct = (product_volume / total * 100) if total > 0 else 0
-    remaining_pct = (remaining_volume / total * 100) if total > 0 else 0
-    
-    fig = go.Figure()
-    
-    # Product volume (filled portion) - GREEN (always green for product)
-    fig.add_trace(go.Bar(
-        x=[product_volume],
-        y=['Volume'],
-        orientation='h',
-        name='Product Volume',
-        marker=dict(color='#10b981'),  # Green for product
-        text=f'{product_volume:.2f} {unit}',
-        textposition='inside',
-        textfont=dict(size=18),  # 50% larger (was 12, now 18)
-        hovertemplate=f'<b>Product Volume</b><br>{product_volume:.2f} {unit}<br>{product_pct:.1f}%<extra></extra>',
-        showlegend=True
-    ))
-    
-    # Remaining volume (empty space) - BLUE
-    fig.add_trace(go.Bar(
-        x=[remaining_volume],
-        y=['Volume'],
-        orientation='h',
-        name='Remaining Space',
-        marker=dict(color='#3b82f6'),  # Blue for remaining
-        text=f'{remaining_volume:.2f} {unit}' if remaining_volume > 0 else '',
-        textposition='inside',
-        textfont=dict(size=18),  # 50% larger (was 12, now 18)
-        hovertemplate=f'<b>Remaining Space</b><br>{remaining_volume:.2f} {unit}<br>{remaining_pct:.1f}%<extra></extra>',
-        showlegend=True
-    ))
-    
-    fig.update_layout(
-        barmode='stack',
-        height=78,  # Increased by 30% from 60px for better legibility
-        margin=dict(l=0, r=0, t=0, b=0),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(
-            showticklabels=False,
-            showgrid=False,
-            zeroline=False
-        ),
-        yaxis=dict(
-            showticklabels=False,
-            showgrid=False
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="center",
-            x=0.5,
-            font=dict(size=15)  # 50% larger legend (was 10, now 15)
-        ),
-        hovermode='closest'
-    )
-    
-    return fig
+        st.info(f"ℹ️ Chart export unavailable: {error[:100]}")
+
+def render_job_status():
+    """Status of this session's last render jobs, polled while any is unfinished"""
+    render_queue = get_render_queue(RENDER_WORKERS, RENDER_RETRIES)
+    jobs = [job for job in map(render_queue.job, st.session_state.render_job_ids) if job is not None]
+    pending = any(not job.finished for job in jobs)
+
+    @st.fragment(run_every=1.0 if pending else None)
+    def job_status():
+        for job in jobs:
+            label = RENDER_JOB_LABELS.get(job.kind, job.kind)
+            retry = f" (attempt {job.attempts})" if job.attempts > 1 else ""
+            if job.status == 'done':
+                if job.kind == 'snapshot':
+                    st.session_state.snapshot_path = job.result
+                    if st.session_state.get('saved_analysis_data'):
+                        st.session_state.saved_analysis_data['snapshot_path'] = job.result
+                st.caption(f"✅ {label} saved")
+            elif job.status == 'failed':
+                if job.kind == 'charts':
+                    show_chart_export_help(job.error)
+                else:
+                    st.warning(f"⚠️ {label} failed: {job.error}")
+            else:
+                st.caption(f"⏳ Rendering {label}…{retry}")
+        if pending and all(job.finished for job in jobs):
+            # Stop polling; a full rerun also shows the attached artifacts
+            st.rerun()
+
+    job_status()
 
 def create_2d_box_illustration(length, width, height, unit='inches'):
     """Create dynamic 2D box illustration with dimension callouts"""
@@ -1622,45 +882,7 @@ def create_2d_box_illustration(length, width, height, unit='inches'):
     
     return svg
 
-def ensure_valid_json_file(filename, default_data=None):
-    """Ensure JSON file exists and is valid"""
-    if default_data is None:
-        default_data = []
-    
-    if not os.path.exists(filename):
-        # Create file with default data
-        try:
-            with open(filename, 'w') as f:
-                json.dump(default_data, f, indent=2)
-        except:
-            pass
-    else:
-        # Validate existing file
-        try:
-            with open(filename, 'r') as f:
-                content = f.read().strip()
-                if not content:
-                    # Empty file, write default
-                    with open(filename, 'w') as f:
-                        json.dump(default_data, f, indent=2)
-                else:
-                    # Try to parse
-                    json.loads(content)
-        except (json.JSONDecodeError, ValueError):
-            # Corrupted file, backup and recreate
-            try:
-                if os.path.exists(filename):
-                    os.rename(filename, f"{filename}.backup")
-            except:
-                pass
-            with open(filename, 'w') as f:
-                json.dump(default_data, f, indent=2)
-
 # Initialize session state
-if 'samples' not in st.session_state:
-    initialize_data()
-    st.session_state.samples = load_data()
-
 if 'show_success' not in st.session_state:
     st.session_state.show_success = False
 
@@ -1688,54 +910,40 @@ with header_col2:
 
 st.markdown("---")
 
-# Initialize session state for projects
-if 'projects' not in st.session_state:
-    st.session_state.projects = []
-    st.session_state.projects_loaded = False
+# Project storage: 'sqlite' (default, migrates dva_projects.json once), 'journal'
+# (dva_projects.json plus an append-only change journal) or 'json'
+PROJECT_STORE_BACKEND = os.environ.get('DVA_PROJECT_STORE', 'sqlite')
 
-# Auto-reload projects from file if not yet loaded or explicitly requested
-if not st.session_state.get('projects_loaded', False):
-    # Ensure JSON file is valid before trying to load
-    ensure_valid_json_file('dva_projects.json', [])
-    
-    # Load projects from file if exists
-    if os.path.exists('dva_projects.json'):
-        try:
-            with open('dva_projects.json', 'r') as f:
-                content_data = f.read().strip()
-                if content_data:  # Check if file is not empty
-                    st.session_state.projects = json.loads(content_data)
-                    st.session_state.projects_loaded = True
-                else:
-                    st.session_state.projects = []
-                    st.session_state.projects_loaded = True
-        except (json.JSONDecodeError, ValueError) as e:
-            # If JSON is corrupted, start with empty list and backup bad file
-            st.session_state.projects = []
-            st.session_state.projects_loaded = True
-            # Optionally backup the corrupted file
-            if os.path.exists('dva_projects.json'):
-                try:
-                    os.rename('dva_projects.json', 'dva_projects.json.backup')
-                except:
-                    pass
-    else:
-        # File doesn't exist, mark as loaded
-        st.session_state.projects_loaded = True
+@st.cache_resource
+def get_project_store(backend):
+    """Open the project store once per server process"""
+    return dva_core.open_project_store(backend)
+
+project_store = get_project_store(PROJECT_STORE_BACKEND)
+
+@st.cache_resource
+def get_project_cache(backend):
+    """Parsed project list shared by all sessions, reparsed only when the store changes"""
+    return dva_core.SharedProjectCache(get_project_store(backend))
+
+project_cache = get_project_cache(PROJECT_STORE_BACKEND)
+
+def refresh_projects():
+    """Point this session at the shared read-only project snapshot"""
+    try:
+        st.session_state.projects = project_cache.projects()
+    except Exception as e:
+        st.error(f"Error loading projects: {e}")
+        st.session_state.projects = st.session_state.get('projects', ())
+
+refresh_projects()
 
 if 'current_project_id' not in st.session_state:
     st.session_state.current_project_id = None
 
 def get_next_project_number():
     """Get the next available unique project number"""
-    if not st.session_state.projects:
-        return 1000
-    
-    # Get all existing project numbers
-    existing_numbers = [p['project_number'] for p in st.session_state.projects]
-    
-    # Find the maximum and add 1
-    return max(existing_numbers) + 1
+    return st.session_state.projects.next_number()
 
 if 'project_counter' not in st.session_state:
     # Initialize counter from existing projects or start at 1000
@@ -1761,13 +969,21 @@ if 'app_initialized' not in st.session_state:
     st.session_state.dimension_unit = 'cm'
     st.session_state.box_result_unit = 'cubic cm'
 
-def save_projects():
-    """Save projects to JSON file"""
+def save_project_record(project):
+    """Insert or update a single project in the project store"""
     try:
-        with open('dva_projects.json', 'w') as f:
-            json.dump(st.session_state.projects, f, indent=2)
+        project_cache.upsert(project)
     except Exception as e:
         st.error(f"Error saving projects: {str(e)}")
+    refresh_projects()
+
+def delete_project_record(project_number):
+    """Remove a single project from the project store"""
+    try:
+        project_cache.delete(project_number)
+    except Exception as e:
+        st.error(f"Error deleting project: {str(e)}")
+    refresh_projects()
 
 def create_new_project():
     """Create a new project and reset form with default values"""
@@ -1819,9 +1035,9 @@ def create_new_project():
     st.session_state.pending_secondary = {}  # Clear temp secondary data for new project
     
     # Delete persistent data files
-    if os.path.exists('dva_analysis_data.json'):
+    if os.path.exists(ANALYSIS_DATA_FILE):
         try:
-            os.remove('dva_analysis_data.json')
+            os.remove(ANALYSIS_DATA_FILE)
         except Exception:
             pass  # Silent fail
     
@@ -1851,8 +1067,7 @@ def save_current_project():
     # Check for duplicate project numbers (only for new projects)
     if st.session_state.current_project_id is None:
         # This is a new project, check if number already exists
-        existing_numbers = [p['project_number'] for p in st.session_state.projects]
-        if current_number in existing_numbers:
+        if st.session_state.projects.has(current_number):
             # Number exists! Get next unique number
             st.error(f"⚠️ Project #{current_number} already exists! Assigning new number...")
             current_number = get_next_project_number()
@@ -1903,57 +1118,48 @@ def save_current_project():
     if st.session_state.get('pending_secondary'):
         project_data.update(st.session_state.pending_secondary)
 
-    # Update existing or add new
-    if st.session_state.current_project_id is not None:
-        # Update existing project
-        for i, p in enumerate(st.session_state.projects):
-            if p['project_number'] == st.session_state.current_project_id:
-                st.session_state.projects[i] = project_data
-                break
-    else:
-        # Add new project
-        st.session_state.projects.append(project_data)
+    # Upsert replaces an existing project or adds a new one
+    if st.session_state.current_project_id is None:
         st.session_state.current_project_id = project_data['project_number']
         # Counter already incremented in create_new_project()
     
-    save_projects()
+    save_project_record(project_data)
     return True
 
 def load_project(project_number):
     """Load a project's data into the form"""
-    for project in st.session_state.projects:
-        if project['project_number'] == project_number:
-            st.session_state.current_project_id = project_number
-            st.session_state.current_project_number = project['project_number']
-            st.session_state.project_name = project['project_name']
-            # Convert date string to date object
-            try:
-                st.session_state.project_date = datetime.strptime(project['date'], '%Y-%m-%d').date()
-            except:
-                st.session_state.project_date = datetime.now().date()
-            st.session_state.designer = project['designer']
-            st.session_state.project_description = project['description']
-            st.session_state.contact_info = project['contact']
-            st.session_state.primary_weight = project['weight']
-
-            # Restore unit fields — both the legacy keys AND the live pref_ keys
-            w_unit  = project.get('weight_unit',    'grams')
-            d_unit  = project.get('dimension_unit', 'inches')
-            v_unit  = project.get('box_result_unit','cubic inches')
-            st.session_state.primary_unit       = w_unit
-            st.session_state.pref_weight_unit   = w_unit
-            st.session_state.dimension_unit     = d_unit
-            st.session_state.pref_dimension_unit = d_unit
-            st.session_state.box_result_unit    = v_unit
-            st.session_state.pref_volume_unit   = v_unit
-
-            st.session_state.primary_volume_mm3 = project['primary_volume_mm3']
-            st.session_state.box_length = project['box_length']
-            st.session_state.box_width  = project['box_width']
-            st.session_state.box_height = project['box_height']
-            st.session_state.box_volume_mm3 = project['box_volume_mm3']
-            st.rerun()
-            break
+    project = st.session_state.projects.get(project_number)
+    if project is not None:
+        st.session_state.current_project_id = project_number
+        st.session_state.current_project_number = project['project_number']
+        st.session_state.project_name = project['project_name']
+        # Convert date string to date object
+        try:
+            st.session_state.project_date = datetime.strptime(project['date'], '%Y-%m-%d').date()
+        except:
+            st.session_state.project_date = datetime.now().date()
+        st.session_state.designer = project['designer']
+        st.session_state.project_description = project['description']
+        st.session_state.contact_info = project['contact']
+        st.session_state.primary_weight = project['weight']
+
+        # Restore unit fields — both the legacy keys AND the live pref_ keys
+        w_unit  = project.get('weight_unit',    'grams')
+        d_unit  = project.get('dimension_unit', 'inches')
+        v_unit  = project.get('box_result_unit','cubic inches')
+        st.session_state.primary_unit       = w_unit
+        st.session_state.pref_weight_unit   = w_unit
+        st.session_state.dimension_unit     = d_unit
+        st.session_state.pref_dimension_unit = d_unit
+        st.session_state.box_result_unit    = v_unit
+        st.session_state.pref_volume_unit   = v_unit
+
+        st.session_state.primary_volume_mm3 = project['primary_volume_mm3']
+        st.session_state.box_length = project['box_length']
+        st.session_state.box_width  = project['box_width']
+        st.session_state.box_height = project['box_height']
+        st.session_state.box_volume_mm3 = project['box_volume_mm3']
+        st.rerun()
 
 # ========== GLOBAL INITIALIZATION (BEFORE TABS) ==========
 # Initialize unit preferences (always, even if not showing)
@@ -1963,15 +1169,22 @@ if 'pref_weight_unit' not in st.session_state:
     st.session_state.pref_weight_unit = 'ounces'
 if 'pref_volume_unit' not in st.session_state:
     st.session_state.pref_volume_unit = 'cubic inches'
+# Projects loaded into the Project Results overview; saves in the Analyzer tab
+# update them even if Project Results was never opened
+if 'loaded_projects_overview' not in st.session_state:
+    st.session_state.loaded_projects_overview = []
 
 # DO NOT initialize input fields here - let them start empty
 # Streamlit will handle them via widget keys
 
-# Create tabs
-tab1, tab2, tab3, tab4 = st.tabs(["🔬 Analyzer", "📁 Project Results", "📋 Primary Results", "⚙️ Primary Data"])
+# Create tabs; only the open tab's body runs (switching tabs reruns the app)
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["🔬 Analyzer", "📁 Project Results", "📋 Primary Results",
+                                        "⚙️ Primary Data", "📈 Portfolio"],
+                                       key="main_tabs", on_change="rerun")
 
 # TAB 1: Analyzer
-with tab1:
+def analyzer_tab():
+    """Analyzer tab: project info, unit preferences and the active section"""
     # ========== INITIALIZE NAVIGATION STATE ==========
     if 'analyzer_section' not in st.session_state:
         st.session_state.analyzer_section = 'primary'  # primary, secondary, analysis
@@ -2026,8 +1239,7 @@ with tab1:
                 st.session_state.project_counter = next_num
                 
                 if st.session_state.projects:
-                    existing_nums = [p['project_number'] for p in st.session_state.projects]
-                    st.info(f"ℹ️ Existing projects: {sorted(existing_nums)} | Next: **{next_num}**")
+                    st.info(f"ℹ️ Existing projects: {sorted(st.session_state.projects.numbers())} | Next: **{next_num}**")
                 else:
                     st.info(f"ℹ️ No existing projects | Starting at: **{next_num}**")
             else:
@@ -2137,7 +1349,9 @@ with tab1:
     
     
     # SECTION 1: PRIMARY PRODUCT CALCULATOR
-    if st.session_state.analyzer_section == 'primary':
+    @st.fragment
+    def primary_section():
+        """Primary product calculator; its widgets rerun only this section"""
         # Scroll to top of page
         st.markdown("""
         <script>
@@ -2197,24 +1411,10 @@ with tab1:
                 if 'product_weight_unit' not in st.session_state or st.session_state.product_weight_unit != weight_unit:
                     st.session_state.product_weight_unit = weight_unit
                 
-                weight_to_mm3 = {
-                    'grams': 1000,
-                    'ounces': 28316.8466,
-                    'pounds': 453592.37,
-                    'kilograms': 1000000
-                }
-                
-                volume_mm3 = weight * weight_to_mm3[weight_unit]
+                volume_mm3 = dva_units.to_mm3(weight, weight_unit)
                 st.session_state.primary_volume_mm3 = volume_mm3
                 
-                mm3_to_display = {
-                    'cubic mm': 1,
-                    'cubic cm': 0.001,
-                    'cubic inches': 0.000061023744,
-                    'cubic feet': 0.000000035315
-                }
-                
-                result_value = volume_mm3 * mm3_to_display[result_unit]
+                result_value = dva_units.from_mm3(volume_mm3, result_unit)
                 
                 st.markdown(f"""
                 <div class="metric-card">
@@ -2245,13 +1445,7 @@ with tab1:
             
             with total_col1:
                 result_unit = st.session_state.pref_volume_unit
-                mm3_to_display = {
-                    'cubic mm': 1,
-                    'cubic cm': 0.001,
-                    'cubic inches': 0.000061023744,
-                    'cubic feet': 0.000000035315
-                }
-                single_volume = st.session_state.primary_volume_mm3 * mm3_to_display[result_unit]
+                single_volume = dva_units.from_mm3(st.session_state.primary_volume_mm3, result_unit)
                 
                 # Compact inline display
                 st.markdown(f"""
@@ -2309,8 +1503,7 @@ with tab1:
                     st.write(st.session_state.saved_primary_data)
                 
                 if st.session_state.current_project_id:
-                    current_proj = next((p for p in st.session_state.projects 
-                                       if p['project_number'] == st.session_state.current_project_id), None)
+                    current_proj = st.session_state.projects.get(st.session_state.current_project_id)
                     if current_proj:
                         st.write("**Current Project Data:**")
                         st.write(f"- weight: {current_proj.get('weight', 'NOT SET')}")
@@ -2363,7 +1556,9 @@ with tab1:
                     st.warning("⚠️ Calculate box volume first")
     
     # SECTION 2: SECONDARY PACKAGING
-    elif st.session_state.analyzer_section == 'secondary':
+    @st.fragment
+    def secondary_section():
+        """Secondary packaging calculator; its widgets rerun only this section"""
         # Scroll to top of page
         st.markdown("""
         <script>
@@ -2407,9 +1602,9 @@ with tab1:
                     pass
             
             # Priority 3: Check dva_analysis_data.json as fallback
-            if not loaded_from_storage and os.path.exists('dva_analysis_data.json'):
+            if not loaded_from_storage and os.path.exists(ANALYSIS_DATA_FILE):
                 try:
-                    with open('dva_analysis_data.json', 'r') as f:
+                    with open(ANALYSIS_DATA_FILE, 'r') as f:
                         file_data = json.load(f)
                         if file_data.get('box_length', 0) > 0:
                             st.session_state.box_length = file_data.get('box_length', 0.0)
@@ -2471,26 +1666,15 @@ with tab1:
             
             if st.button("🧮 Calculate", use_container_width=True, type="primary"):
                 if box_length > 0 and box_width > 0 and box_height > 0:
-                    dim_to_mm = {
-                        'mm': 1,
-                        'cm': 10,
-                        'inches': 25.4,
-                        'feet': 304.8
-                    }
-                    
-                    length_mm = box_length * dim_to_mm[dimension_unit]
-                    width_mm = box_width * dim_to_mm[dimension_unit]
-                    height_mm = box_height * dim_to_mm[dimension_unit]
-                    
-                    box_volume_mm3 = length_mm * width_mm * height_mm
-                    st.session_state.box_volume_mm3 = box_volume_mm3
+                    calculated_box_mm3 = dva_core.box_volume_mm3(box_length, box_width, box_height, dimension_unit)
+                    st.session_state.box_volume_mm3 = calculated_box_mm3
                     
                     # Prepare data to save (widget keys auto-save: box_length, box_width, box_height)
                     secondary_data = {
                         'box_length': box_length,
                         'box_width': box_width,
                         'box_height': box_height,
-                        'box_volume_mm3': box_volume_mm3,
+                        'box_volume_mm3': calculated_box_mm3,
                         'pref_dimension_unit': st.session_state.pref_dimension_unit,
                         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                     }
@@ -2521,7 +1705,8 @@ with tab1:
             
             if curr_length > 0 and curr_width > 0 and curr_height > 0:
                 # 3D Box Preview — dimensions only, no efficiency/liquid fill
-                preview_fig = create_3d_box_visualization(
+                preview_fig = cached_figure(
+                    create_3d_box_visualization,
                     curr_length,
                     curr_width,
                     curr_height,
@@ -2551,14 +1736,7 @@ with tab1:
             st.markdown("### Box Volume Results")
             
             result_unit = st.session_state.pref_volume_unit
-            mm3_to_result = {
-                'cubic mm': 1,
-                'cubic cm': 0.001,
-                'cubic inches': 0.000061023744,
-                'cubic feet': 0.000000035315
-            }
-            
-            box_result = st.session_state.box_volume_mm3 * mm3_to_result[result_unit]
+            box_result = dva_units.from_mm3(st.session_state.box_volume_mm3, result_unit)
             
             st.markdown(f"""
             <div class="metric-card">
@@ -2582,9 +1760,9 @@ with tab1:
                 
                 remaining_unit = st.session_state.pref_volume_unit
                 
-                box_volume_result = box_volume_mm3 * mm3_to_result[remaining_unit]
-                product_volume_result = product_volume_to_use * mm3_to_result[remaining_unit]
-                remaining_volume_result = remaining_volume_mm3 * mm3_to_result[remaining_unit]
+                box_volume_result = dva_units.from_mm3(box_volume_mm3, remaining_unit)
+                product_volume_result = dva_units.from_mm3(product_volume_to_use, remaining_unit)
+                remaining_volume_result = dva_units.from_mm3(remaining_volume_mm3, remaining_unit)
                 
                 quantity = st.session_state.get('product_quantity', 1)
                 product_label = f"Product Volume (×{quantity})" if quantity > 1 else "Product Volume"
@@ -2645,17 +1823,12 @@ with tab1:
                     st.session_state.pending_secondary = sec_patch
                     if st.session_state.get('current_project_id') is not None:
                         pid = st.session_state.current_project_id
-                        updated = False
-                        for i, p in enumerate(st.session_state.projects):
-                            if p['project_number'] == pid:
-                                st.session_state.projects[i].update(sec_patch)
-                                updated = True
-                                break
-                        if updated:
-                            save_projects()
+                        current = st.session_state.projects.get(pid)
+                        if current is not None:
+                            save_project_record({**current, **sec_patch})
                             for i, p in enumerate(st.session_state.loaded_projects_overview):
                                 if p['project_number'] == pid:
-                                    st.session_state.loaded_projects_overview[i].update(sec_patch)
+                                    st.session_state.loaded_projects_overview[i] = {**p, **sec_patch}
                             st.success("✅ Secondary Packaging saved to project!")
                         else:
                             st.warning("⚠️ Could not find project record.")
@@ -2690,7 +1863,9 @@ with tab1:
                     st.warning("⚠️ Calculate box volume first")
     
     # SECTION 3: VOLUME ANALYSIS (FULL SCREEN VISUALIZATIONS!)
-    elif st.session_state.analyzer_section == 'analysis':
+    @st.fragment
+    def analysis_section():
+        """Volume analysis charts and saves; its widgets rerun only this section"""
         # Scroll to top of page
         st.markdown("""
         <script>
@@ -2745,33 +1920,28 @@ with tab1:
             product_volume_to_use = st.session_state.get('total_product_volume_mm3', 
                                                           st.session_state['primary_volume_mm3'])
             box_volume_mm3 = st.session_state['box_volume_mm3']
-            volume_efficiency_percentage = (product_volume_to_use / box_volume_mm3 * 100) if box_volume_mm3 > 0 else 0
+            volume_efficiency_percentage = dva_core.volume_efficiency(product_volume_to_use, box_volume_mm3)
             
             # ROW 1: Gauge and Donut (LARGE, Side by Side)
             viz_col1, viz_col2 = st.columns(2)
             
             with viz_col1:
-                gauge_fig = create_efficiency_gauge(volume_efficiency_percentage)
+                gauge_fig = cached_figure(create_efficiency_gauge, volume_efficiency_percentage)
                 st.plotly_chart(gauge_fig, use_container_width=True, key="efficiency_gauge_fullscreen")
             
             with viz_col2:
-                donut_fig = create_donut_chart(volume_efficiency_percentage)
+                donut_fig = cached_figure(create_donut_chart, volume_efficiency_percentage)
                 st.plotly_chart(donut_fig, use_container_width=True, key="space_donut_fullscreen")
             
             # ROW 2: Volume Comparison Bar (FULL WIDTH)
             st.markdown("### 📦 Volume Breakdown")
             
             remaining_unit = st.session_state.pref_volume_unit
-            mm3_to_remaining = {
-                'cubic mm': 1,
-                'cubic cm': 0.001,
-                'cubic inches': 0.000061023744,
-                'cubic feet': 0.000000035315
-            }
             
-            comparison_fig = create_volume_comparison_chart(
-                box_volume_mm3 * mm3_to_remaining[remaining_unit],
-                product_volume_to_use * mm3_to_remaining[remaining_unit],
+            comparison_fig = cached_figure(
+                create_volume_comparison_chart,
+                dva_units.from_mm3(box_volume_mm3, remaining_unit),
+                dva_units.from_mm3(product_volume_to_use, remaining_unit),
                 remaining_unit
             )
             st.plotly_chart(comparison_fig, use_container_width=True, key="volume_comparison_fullscreen")
@@ -2781,7 +1951,7 @@ with tab1:
                 st.markdown("### 📊 3D Volume Preview")
                 
                 # Calculate product volume in display units
-                product_vol_display = product_volume_to_use * mm3_to_remaining[remaining_unit]
+                product_vol_display = dva_units.from_mm3(product_volume_to_use, remaining_unit)
                 box_volume = st.session_state['box_length'] * st.session_state['box_width'] * st.session_state['box_height']
                 
                 # Create two columns: info panel (left) and 3D graphic (right)
@@ -2828,7 +1998,8 @@ with tab1:
                     # Add container for 3D graphic to prevent overlap
                     st.markdown('<div style="position: relative; z-index: 2;">', unsafe_allow_html=True)
                     # 3D graphic with ONLY measurement numbers
-                    box_3d_fig = create_3d_volume_preview(
+                    box_3d_fig = cached_figure(
+                        create_3d_volume_preview,
                         st.session_state['box_length'],
                         st.session_state['box_width'],
                         st.session_state['box_height'],
@@ -2841,7 +2012,7 @@ with tab1:
                     st.plotly_chart(box_3d_fig, use_container_width=True, key="box_3d_fullscreen")
                     st.markdown('</div>', unsafe_allow_html=True)
             
-            remaining_volume_result = (box_volume_mm3 - product_volume_to_use) * mm3_to_remaining[remaining_unit]
+            remaining_volume_result = dva_units.from_mm3(box_volume_mm3 - product_volume_to_use, remaining_unit)
             
             if remaining_volume_result < 0:
                 st.error("⚠️ Warning: Product volume exceeds box capacity!")
@@ -2852,130 +2023,11 @@ with tab1:
             st.markdown("---")
             if st.button("💾 Save Analysis Data", use_container_width=True, type="secondary", key="save_analysis_data"):
                 pid = st.session_state.get('current_project_id')
+                render_queue = get_render_queue(RENDER_WORKERS, RENDER_RETRIES)
+                render_queue.prune()
 
-                # Render and save 3D snapshot PNG
-                snapshot_path = None
-                
-                # Check if matplotlib is available before trying to generate snapshot
-                if not MATPLOTLIB_AVAILABLE:
-                    st.warning("⚠️ 3D snapshot generation is disabled: Matplotlib not installed.")
-                    st.info("💡 To enable 3D snapshots, install matplotlib: `pip install matplotlib`")
-                else:
-                    try:
-                        # Use default isometric view (22°, -55°)
-                        snapshot_path = create_3d_snapshot(
-                            st.session_state['box_length'],
-                            st.session_state['box_width'],
-                            st.session_state['box_height'],
-                            volume_efficiency_percentage,
-                            st.session_state.pref_dimension_unit,
-                            project_number=pid,
-                            elev=22,
-                            azim=-55
-                        )
-                        st.session_state.snapshot_path = snapshot_path
-                        
-                        # Also save Volume Efficiency Analysis charts (optional feature)
-                        if pid is not None:
-                            try:
-                                import plotly.io as pio
-                                
-                                # Create project directory if it doesn't exist
-                                project_dir = f"dva_projects/project_{pid}"
-                                os.makedirs(project_dir, exist_ok=True)
-                                
-                                # Get volume data
-                                mm3_to_vol = {
-                                    'cubic mm': 1, 'cubic cm': 0.001,
-                                    'cubic inches': 0.000061023744, 'cubic feet': 0.000000035315
-                                }
-                                vol_unit = st.session_state.pref_volume_unit
-                                factor = mm3_to_vol.get(vol_unit, 0.001)
-                                
-                                box_vol = st.session_state.get('box_volume_mm3', 0) * factor
-                                prod_vol = st.session_state.get('total_product_volume_mm3', 0) * factor
-                                
-                                # Try to save charts - this is optional and may fail
-                                charts_saved = False
-                                try:
-                                    # Save gauge chart
-                                    gauge_fig = create_efficiency_gauge(volume_efficiency_percentage)
-                                    gauge_path = os.path.join(project_dir, 'chart_gauge.png')
-                                    pio.write_image(gauge_fig, gauge_path, format='png', 
-                                                  width=350, height=250, scale=2)
-                                    
-                                    # Save donut chart
-                                    donut_fig = create_donut_chart(volume_efficiency_percentage)
-                                    donut_path = os.path.join(project_dir, 'chart_donut.png')
-                                    pio.write_image(donut_fig, donut_path, format='png',
-                                                  width=350, height=250, scale=2)
-                                    
-                                    # Save breakdown chart
-                                    comparison_fig = create_volume_comparison_chart(box_vol, prod_vol, vol_unit)
-                                    breakdown_path = os.path.join(project_dir, 'chart_breakdown.png')
-                                    pio.write_image(comparison_fig, breakdown_path, format='png',
-                                                  width=700, height=200, scale=2)
-                                    
-                                    charts_saved = True
-                                    st.success("✅ Volume Efficiency Analysis charts saved!")
-                                    
-                                except Exception as img_err:
-                                    # Chart saving failed - this is OK, not critical
-                                    error_msg = str(img_err)
-                                    if "Chrome" in error_msg or "chrome" in error_msg:
-                                        # Chrome/Chromium needed for Kaleido
-                                        with st.expander("ℹ️ Chart Export Requires Chrome (Optional Feature)", expanded=False):
-                                            st.info("""
-                                            **Volume Efficiency Analysis charts** require Google Chrome or Chromium to export.
-                                            
-                                            Your 3D snapshot was saved successfully! Charts are optional.
-                                            
-                                            **To enable chart export:**
-                                            
-                                            **Option 1: Install Chrome**
-                                            - Download from: https://www.google.com/chrome/
-                                            
-                                            **Option 2: Install Chromium (Linux)**
-                                            ```bash
-                                            # Ubuntu/Debian
-                                            sudo apt-get install chromium-browser
-                                            
-                                            # Or use plotly helper
-                                            plotly_get_chrome
-                                            ```
-                                            
-                                            **Why Chrome is needed:**
-                                            Kaleido uses Chrome's rendering engine to convert interactive charts to PNG images.
-                                            
-                                            **Note:** Charts appear in the app (Project Overview) without Chrome. 
-                                            Chrome is only needed to save them for PDF reports.
-                                            """)
-                                    else:
-                                        # Other error
-                                        st.info(f"ℹ️ Chart export unavailable: {error_msg[:100]}")
-                                
-                            except ImportError:
-                                # Kaleido not installed - this is OK
-                                with st.expander("ℹ️ Chart Export Not Available (Optional Feature)", expanded=False):
-                                    st.info("""
-                                    **Volume Efficiency Analysis charts** can be saved for PDF reports.
-                                    
-                                    Your 3D snapshot was saved successfully! Charts are optional.
-                                    
-                                    **To enable chart export:**
-                                    ```bash
-                                    pip install kaleido>=0.2.1
-                                    ```
-                                    
-                                    Then install Chrome/Chromium (see above for instructions).
-                                    
-                                    **Note:** Charts still appear in the app (Project Overview) without export capability.
-                                    """)
-                        
-                    except Exception as snap_err:
-                        st.warning(f"⚠️ 3D snapshot failed: {snap_err}")
-
-                # Build analysis data dict (includes snapshot path)
+                # Build analysis data dict; the snapshot job fills in its path once
+                # rendered, so the file is written before any job is queued
                 analysis_data = {
                     'primary_volume_mm3': st.session_state.get('primary_volume_mm3', 0),
                     'box_volume_mm3': st.session_state.get('box_volume_mm3', 0),
@@ -2989,32 +2041,71 @@ with tab1:
                     'pref_dimension_unit': st.session_state.pref_dimension_unit,
                     'pref_volume_unit': st.session_state.pref_volume_unit,
                     'pref_weight_unit': st.session_state.pref_weight_unit,
-                    'snapshot_path': snapshot_path,
+                    'snapshot_path': None,
                     'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 }
 
-                # Patch snapshot_path into the saved project record
-                if pid is not None and snapshot_path:
-                    for i, p in enumerate(st.session_state.projects):
-                        if p['project_number'] == pid:
-                            st.session_state.projects[i]['snapshot_path'] = snapshot_path
-                            break
-                    save_projects()
-
                 # Save to session state and JSON
                 st.session_state.saved_analysis_data = analysis_data
                 try:
-                    with open('dva_analysis_data.json', 'w') as f:
+                    with open(ANALYSIS_DATA_FILE, 'w') as f:
                         json.dump(analysis_data, f, indent=2)
-                    if snapshot_path:
-                        st.success("✅ Analysis data and 3D snapshot saved!")
-                    else:
-                        st.success("✅ Analysis data saved!")
+                    st.success("✅ Analysis data saved!")
                 except Exception as e:
                     st.warning(f"⚠️ Saved to session but file save failed: {e}")
 
-                time.sleep(0.5)
-                st.rerun()
+                render_jobs = []
+
+                # Snapshot and chart images render in worker processes; the save
+                # returns now and the artifacts attach to the project when ready
+                if not MATPLOTLIB_AVAILABLE:
+                    st.warning("⚠️ 3D snapshot generation is disabled: Matplotlib not installed.")
+                    st.info("💡 To enable 3D snapshots, install matplotlib: `pip install matplotlib`")
+                else:
+                    # Default isometric view (22°, -55°)
+                    render_jobs.append(render_queue.submit(
+                        'snapshot', dva_core.jobs.render_snapshot,
+                        st.session_state['box_length'],
+                        st.session_state['box_width'],
+                        st.session_state['box_height'],
+                        volume_efficiency_percentage,
+                        st.session_state.pref_dimension_unit,
+                        pid,
+                        project_number=pid,
+                        on_success=analysis_snapshot_recorder(
+                            analysis_data, project_artifact_attacher(pid, 'snapshot_path')),
+                    ))
+
+                # Volume Efficiency Analysis chart images, for PDF reports
+                if pid is not None:
+                    project_dir = f"dva_projects/project_{pid}"
+                    vol_unit = st.session_state.pref_volume_unit
+                    box_vol = dva_units.from_mm3(st.session_state.get('box_volume_mm3', 0), vol_unit)
+                    prod_vol = dva_units.from_mm3(st.session_state.get('total_product_volume_mm3', 0), vol_unit)
+                    if CHART_EXPORT_ENGINE == 'kaleido':
+                        figure_cache = get_figure_cache()
+                        charts = [
+                            ('chart_gauge.png', figure_cache.get_json(create_efficiency_gauge, volume_efficiency_percentage), 350, 250),
+                            ('chart_donut.png', figure_cache.get_json(create_donut_chart, volume_efficiency_percentage), 350, 250),
+                            ('chart_breakdown.png', figure_cache.get_json(create_volume_comparison_chart, box_vol, prod_vol, vol_unit), 700, 200),
+                        ]
+                        export_task, export_args = dva_core.jobs.export_chart_images_kaleido, (project_dir, charts)
+                    elif MATPLOTLIB_AVAILABLE:
+                        export_task = dva_core.jobs.export_chart_images
+                        export_args = (project_dir, volume_efficiency_percentage, box_vol, prod_vol, vol_unit)
+                    else:
+                        export_task = None
+                    if export_task is not None:
+                        render_jobs.append(render_queue.submit(
+                            'charts', export_task, *export_args,
+                            project_number=pid,
+                            on_success=project_artifact_attacher(pid, 'chart_images'),
+                        ))
+
+                st.session_state.render_job_ids = [job.id for job in render_jobs]
+
+            if st.session_state.get('render_job_ids'):
+                render_job_status()
             
             # Persistent Bottom Navigation - All 3 Sections
             st.markdown("---")
@@ -3038,49 +2129,235 @@ with tab1:
                     type="primary"
                 )
 
+    # Only the active section runs; its widgets rerun just that fragment
+    if st.session_state.analyzer_section == 'primary':
+        primary_section()
+    elif st.session_state.analyzer_section == 'secondary':
+        secondary_section()
+    elif st.session_state.analyzer_section == 'analysis':
+        analysis_section()
+
+with tab1:
+    if tab1.open:
+        analyzer_tab()
+
 # END OF SECTION NAVIGATION
 # TAB 2: Project Results
-with tab2:
+def overview_panel_label(project):
+    """Expander label with the project's headline numbers, shown while collapsed"""
+    record = dva_core.normalize_project(project)
+    title = f"📋 Project {record['project_number']} - {record['project_name']}"
+    if record['box_volume_mm3'] <= 0:
+        return f"{title}  ·  no box"
+    metrics = dva_core.project_metrics(record)
+    unit = record['box_result_unit']
+    remaining = dva_units.from_mm3(metrics['remaining_volume_mm3'], unit)
+    return (f"{title}  ·  **{metrics['efficiency_pct']:.1f}%** efficiency  ·  "
+            f"{remaining:,.2f} {unit} remaining")
+
+def overview_project_panel(idx, project):
+    """Details and charts of one overview project; only run while its panel is open"""
+    # DEBUG: Show project data
+    if st.checkbox(f"🔍 Debug Project Data", value=False, key=f"debug_overview_{idx}_{project['project_number']}"):
+        st.write("**Project Data Loaded in Overview:**")
+        st.write(f"- weight: {project.get('weight', 'NOT FOUND')}")
+        st.write(f"- product_weight: {project.get('product_weight', 'NOT FOUND')}")
+        st.write(f"- weight_unit: {project.get('weight_unit', 'NOT FOUND')}")
+        st.write(f"- primary_volume_mm3: {project.get('primary_volume_mm3', 'NOT FOUND')}")
+    
+        st.write("**All Keys in Project:**")
+        st.code(", ".join(sorted(project.keys())))
+    
+        st.write("**Full Project Data:**")
+        st.json(project)
+
+    # ═══════════════════════════════════════════════════════════
+    # SECTION 1: Project Information & Calculation Results
+    # ═══════════════════════════════════════════════════════════
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("#### Project Information")
+        st.info(f"""
+        **Project Number:** {project.get('project_number', '—')}  
+        **Project Name:** {project.get('project_name', '—')}  
+        **Designer:** {project.get('designer', '—')}  
+        **Date:** {project.get('date', '—')}  
+        **Contact:** {project.get('contact', '—')}  
+        **Description:** {project.get('description', '—')}  
+        **Last Modified:** {project.get('last_modified', '—')}
+        """)
+
+    with col2:
+        st.markdown("#### Calculation Results")
+
+        # All values read directly from the saved project file
+        record        = dva_core.normalize_project(project)
+        metrics       = dva_core.project_metrics(record)
+        disp_vol_unit = record['box_result_unit']
+        disp_dim_unit = record['dimension_unit']
+        disp_w_unit   = project.get('weight_unit', '')
+        factor = dva_units.from_mm3(1.0, disp_vol_unit)
+
+        unit_vol_mm3   = record['primary_volume_mm3']
+        total_vol_mm3  = record['total_product_volume_mm3']
+        qty            = record['product_quantity']
+        unit_vol_disp  = unit_vol_mm3  * factor
+        total_vol_disp = total_vol_mm3 * factor
+
+        # Primary Product
+        weight_val = record['weight']
+        weight_display = f"{weight_val:,.2f} {disp_w_unit}" if weight_val > 0 else "Not entered"
+        st.success(f"""
+        **Primary Product**  
+        Weight of Water: {weight_display}  
+        Unit Volume: {unit_vol_disp:,.4f} {disp_vol_unit}  
+        Quantity: {qty}  
+        Total Volume: {total_vol_disp:,.4f} {disp_vol_unit}
+        """)
+
+        # Secondary Packaging
+        if record['box_volume_mm3'] > 0:
+            box_vol_disp = record['box_volume_mm3'] * factor
+            rem_disp     = metrics['remaining_volume_mm3'] * factor
+            eff          = metrics['efficiency_pct']
+            st.info(f"""
+            **Secondary Packaging**  
+            Dimensions: {project.get('box_length', 0)} × {project.get('box_width', 0)} × {project.get('box_height', 0)} {disp_dim_unit}  
+            Box Volume: {box_vol_disp:,.4f} {disp_vol_unit}  
+            Product Volume: {total_vol_disp:,.4f} {disp_vol_unit}  
+            Remaining: {rem_disp:,.4f} {disp_vol_unit}  
+            Efficiency: {eff:.1f}%
+            """)
+        else:
+            st.caption("No box dimensions saved for this project.")
+
+    # ═══════════════════════════════════════════════════════════
+    # SECTION 2: Volume Efficiency Analysis (if box data exists)
+    # ═══════════════════════════════════════════════════════════
+    if record['box_volume_mm3'] > 0:
+        st.markdown("---")
+        st.markdown("### 📊 Volume Efficiency Analysis")
+    
+        # Calculate efficiency
+        volume_eff_pct = metrics['efficiency_pct']
+    
+        # Row 1: Gauge and Donut charts
+        viz_col1, viz_col2 = st.columns(2)
+    
+        with viz_col1:
+            gauge_fig = cached_figure(create_efficiency_gauge, volume_eff_pct)
+            st.plotly_chart(gauge_fig, use_container_width=True, key=f"gauge_{project['project_number']}_{idx}")
+    
+        with viz_col2:
+            donut_fig = cached_figure(create_donut_chart, volume_eff_pct)
+            st.plotly_chart(donut_fig, use_container_width=True, key=f"donut_{project['project_number']}_{idx}")
+    
+        # ═══════════════════════════════════════════════════════════
+        # SECTION 3: Volume Breakdown
+        # ═══════════════════════════════════════════════════════════
+        st.markdown("### 📦 Volume Breakdown")
+    
+        comparison_fig = cached_figure(
+            create_volume_comparison_chart,
+            box_vol_disp,
+            total_vol_disp,
+            disp_vol_unit
+        )
+        st.plotly_chart(comparison_fig, use_container_width=True, key=f"breakdown_{project['project_number']}_{idx}")
+    
+        # ═══════════════════════════════════════════════════════════
+        # SECTION 4: 3D Volume Preview
+        # ═══════════════════════════════════════════════════════════
+        if all(k in project for k in ['box_length', 'box_width', 'box_height']):
+            st.markdown("### 📊 3D Volume Preview")
+        
+            # Create two columns: info panel and 3D graphic
+            info_col, graphic_col = st.columns([1.3, 2.7], gap="large")
+        
+            with info_col:
+                # Calculate box volume in display units
+                box_dims_vol = project['box_length'] * project['box_width'] * project['box_height']
+            
+                # Info panel
+                st.markdown(f"""
+                <div style='background: linear-gradient(135deg, rgba(59, 130, 246, 0.1) 0%, rgba(16, 185, 129, 0.1) 100%); 
+                            border-left: 4px solid #3b82f6; 
+                            padding: 14px; 
+                            border-radius: 10px;
+                            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+                            margin-bottom: 20px;'>
+                    <div style='font-size: 17px; font-weight: bold; color: #3b82f6; margin-bottom: 6px;'>📦 SECONDARY PACKAGING</div>
+                    <p style='font-size: 20px; font-weight: bold; color: #3b82f6; margin: 6px 0;'>
+                        {box_dims_vol:.2f} {disp_dim_unit}³
+                    </p>
+                    <p style='font-size: 15px; color: #94a3b8; margin: 6px 0;'>
+                        {project['box_length']:.1f} × {project['box_width']:.1f} × {project['box_height']:.1f} {disp_dim_unit}
+                    </p>
+                    <hr style='border: none; border-top: 1px solid rgba(148, 163, 184, 0.3); margin: 10px 0;'>
+                    <div style='font-size: 17px; font-weight: bold; color: #10b981; margin-bottom: 6px;'>🎁 PRIMARY PRODUCT</div>
+                    <p style='font-size: 20px; font-weight: bold; color: #10b981; margin: 6px 0;'>
+                        {total_vol_disp:.2f} {disp_vol_unit}
+                    </p>
+                    <p style='font-size: 15px; color: #94a3b8; margin: 6px 0;'>
+                        Quantity: {qty} units
+                    </p>
+                    <hr style='border: none; border-top: 1px solid rgba(148, 163, 184, 0.3); margin: 10px 0;'>
+                    <div style='font-size: 17px; font-weight: bold; color: white; margin-bottom: 6px;'>📊 EFFICIENCY</div>
+                    <p style='font-size: 30px; font-weight: bold; color: white; margin: 6px 0;'>
+                        {volume_eff_pct:.1f}%
+                    </p>
+                    <p style='font-size: 15px; color: #94a3b8; margin: 6px 0;'>
+                        Volume Utilization
+                    </p>
+                </div>
+                """, unsafe_allow_html=True)
+        
+            with graphic_col:
+                # 3D visualization
+                box_3d_fig = cached_figure(
+                    create_3d_volume_preview,
+                    project['box_length'],
+                    project['box_width'],
+                    project['box_height'],
+                    volume_eff_pct,
+                    disp_dim_unit
+                )
+                st.plotly_chart(box_3d_fig, use_container_width=True, key=f"3d_{project['project_number']}_{idx}")
+
+    # Remove button for this project
+    if st.button(f"Remove from Overview", key=f"remove_overview_{idx}"):
+        st.session_state.loaded_projects_overview.pop(idx)
+        st.rerun()
+
+# Project table sort choices -> ProjectFrame sort keys
+PROJECT_SORTS = {'Project #': 'project_number', 'Project Name': 'name_key', 'Designer': 'designer',
+                 'Date': 'date', 'Efficiency': 'efficiency_pct'}
+PROJECT_BANDS = ([band.label for _, band in dva_core.efficiency.EFFICIENCY_BANDS]
+                 + [dva_core.project_frame.NO_BOX_BAND])
+
+def project_results_tab():
+    """Project Results tab: saved projects, overview and PDF report"""
     st.markdown("## Project Results")
     
-    # Force reload projects from file when this tab is accessed
-    # This ensures we always have the latest data
-    if os.path.exists('dva_projects.json'):
-        try:
-            with open('dva_projects.json', 'r') as f:
-                file_content = f.read().strip()
-                if file_content:
-                    loaded_projects = json.loads(file_content)
-                    # Only update if different from current state
-                    if loaded_projects != st.session_state.get('projects', []):
-                        st.session_state.projects = loaded_projects
-                else:
-                    if st.session_state.get('projects'):
-                        st.session_state.projects = []
-        except Exception as e:
-            st.error(f"Error loading projects: {e}")
+    # st.session_state.projects is refreshed from the shared project cache
+    # at the top of every rerun, so it already reflects the latest saves
     
     # Refresh and Delete buttons at top
     col_button1, col_button2, col_button3 = st.columns([2, 1, 1])
     
     with col_button2:
-        if st.button("🔄 Refresh", use_container_width=True, help="Reload projects from file"):
-            # Force reload from file
-            if os.path.exists('dva_projects.json'):
-                try:
-                    with open('dva_projects.json', 'r') as f:
-                        file_content = f.read().strip()
-                        if file_content:
-                            st.session_state.projects = json.loads(file_content)
-                            st.success(f"✅ Reloaded {len(st.session_state.projects)} project(s)")
-                        else:
-                            st.session_state.projects = []
-                            st.info("📭 File is empty")
-                except Exception as e:
-                    st.error(f"❌ Error: {e}")
-            else:
-                st.session_state.projects = []
-                st.info("📭 No projects file found")
+        if st.button("🔄 Refresh", use_container_width=True, help="Reload projects from the project store"):
+            # Force reload from the store
+            try:
+                project_cache.invalidate()
+                st.session_state.projects = project_cache.projects()
+                if st.session_state.projects:
+                    st.success(f"✅ Reloaded {len(st.session_state.projects)} project(s)")
+                else:
+                    st.info("📭 No saved projects")
+            except Exception as e:
+                st.error(f"❌ Error: {e}")
             st.rerun()
     
     with col_button3:
@@ -3089,6 +2366,14 @@ with tab2:
     if st.session_state.projects:
         st.markdown("---")
         st.markdown(f"### Project Summary Table ({len(st.session_state.projects)} project{'s' if len(st.session_state.projects) != 1 else ''})")
+        # Running totals are kept current on every save; no pass over the projects
+        totals = project_cache.stats().summary()
+        if totals['boxed']:
+            summary_unit = st.session_state.pref_volume_unit
+            st.caption(f"Efficiency over {totals['boxed']:,} projects with a box: "
+                       f"mean {totals['mean_efficiency_pct']:.1f}% · "
+                       f"min {totals['min_efficiency_pct']:.1f}% · max {totals['max_efficiency_pct']:.1f}% · "
+                       f"void {dva_units.from_mm3(totals['void_volume_mm3'], summary_unit):,.2f} {summary_unit}")
         
         # Add CSS for larger font (20% increase)
         st.markdown("""
@@ -3111,28 +2396,71 @@ with tab2:
         </style>
         """, unsafe_allow_html=True)
         
-        # Initialize selected projects list in session state
-        if 'selected_project_indices' not in st.session_state:
-            st.session_state.selected_project_indices = []
-        
-        # Build dataframe with Select checkbox column INSIDE the table
-        display_df = []
-        for idx, project in enumerate(st.session_state.projects):
-            # Check if this index is selected
-            is_selected = idx in st.session_state.selected_project_indices
-            
-            display_df.append({
-                'Select': is_selected,  # Checkbox inside table
-                'Project #': project['project_number'],
-                'Project Name': project['project_name'],
-                'Designer': project['designer'],
-                'Description': project['description'][:50] + '...' if len(project['description']) > 50 else project['description'],
-                'Date': project['date']
-            })
+        # Selection is kept by project number, so it survives paging and filtering
+        if 'selected_project_numbers' not in st.session_state:
+            st.session_state.selected_project_numbers = set()
+        selected = st.session_state.selected_project_numbers
+        
+        # Search, filters, sort and paging run on the columnar project frame;
+        # only the visible page is turned into table rows
+        frame = project_cache.frame()
+        project_frame = dva_core.project_frame
+        present = sorted({frame.designers[c] for c in set(frame.column('designer').tolist())})
+        
+        filter_col1, filter_col2 = st.columns([3, 2])
+        with filter_col1:
+            search = st.text_input("Search", key="project_search",
+                                   placeholder="Project name, designer or description")
+        with filter_col2:
+            designers = st.multiselect("Designers", present, key="project_filter_designers",
+                                       placeholder="All designers")
+        filter_col3, filter_col4 = st.columns([3, 2])
+        with filter_col3:
+            date_range = ()
+            first, last = project_frame.date_span(frame)
+            if first is not None:
+                date_range = st.date_input("Project date", value=(first, last),
+                                           min_value=first, max_value=last,
+                                           key=f"project_filter_dates_{first}_{last}")
+        with filter_col4:
+            bands = st.multiselect("Efficiency", PROJECT_BANDS, key="project_filter_bands",
+                                   placeholder="All efficiency bands")
+        
+        sort_col1, sort_col2, sort_col3, sort_col4 = st.columns([2, 1, 1, 1])
+        with sort_col1:
+            sort_label = st.selectbox("Sort by", list(PROJECT_SORTS), key="project_sort")
+        with sort_col2:
+            descending = st.toggle("Descending", key="project_sort_descending")
+        with sort_col3:
+            page_size = st.selectbox("Rows per page", [25, 50, 100, 250], key="project_page_size")
+        with sort_col4:
+            page = st.number_input("Page", min_value=1, value=1, step=1, key="project_page")
+        
+        # Full span selected means no date filter, so undated projects stay listed
+        start, end = date_range if len(date_range) == 2 and date_range != (first, last) else (None, None)
+        rows = project_frame.query_rows(frame, search, designers, start, end, bands,
+                                        PROJECT_SORTS[sort_label], descending)
+        numbers, page, page_count = project_frame.page_numbers(frame, rows, int(page), page_size)
+        page_projects = [p for p in map(st.session_state.projects.get, numbers) if p is not None]
+        
+        st.markdown(f"**{len(rows):,} matching** · page {page} of {page_count}")
+        
+        page_table = {'Select': [], 'Project #': [], 'Project Name': [], 'Designer': [],
+                      'Description': [], 'Date': [], 'Efficiency': []}
+        for project in page_projects:
+            record = dva_core.normalize_project(project)
+            page_table['Select'].append(record['project_number'] in selected)
+            page_table['Project #'].append(record['project_number'])
+            page_table['Project Name'].append(record['project_name'])
+            page_table['Designer'].append(record['designer'])
+            page_table['Description'].append(record['description'][:50] + '...' if len(record['description']) > 50 else record['description'])
+            page_table['Date'].append(record['date'])
+            page_table['Efficiency'].append(dva_core.project_metrics(record)['efficiency_pct']
+                                            if record['box_volume_mm3'] > 0 else None)
         
         # Display with column configuration for optimized widths
         edited_df = st.data_editor(
-            display_df, 
+            page_table, 
             use_container_width=True, 
             hide_index=True,
             column_config={
@@ -3162,17 +2490,30 @@ with tab2:
                     "Date",
                     width="small",
                 ),
+                "Efficiency": st.column_config.NumberColumn(
+                    "Efficiency",
+                    format="%.1f%%",
+                    width="small",
+                ),
             },
-            disabled=["Project #", "Project Name", "Designer", "Description", "Date"],  # Only Select is editable
-            key="project_table_editor"
+            disabled=["Project #", "Project Name", "Designer", "Description", "Date", "Efficiency"],  # Only Select is editable
+            # One editor state per visible set of rows
+            key=f"project_table_{hash(tuple(page_table['Project #']))}"
         )
         
-        # Update selected indices based on edited dataframe
-        st.session_state.selected_project_indices = [idx for idx, row in enumerate(edited_df) if row['Select']]
+        # Update the selection from this page's checkboxes
+        for number, is_selected in zip(edited_df['Project #'], edited_df['Select']):
+            if is_selected:
+                selected.add(number)
+            else:
+                selected.discard(number)
+        selected.intersection_update(st.session_state.projects.numbers())
         
         # Show how many projects are selected
-        if st.session_state.selected_project_indices:
-            st.info(f"📌 {len(st.session_state.selected_project_indices)} project(s) selected")
+        if selected:
+            hidden = len(selected - set(page_table['Project #']))
+            st.info(f"📌 {len(selected)} project(s) selected"
+                    + (f" ({hidden} not shown on this page)" if hidden else ""))
         
         st.markdown("---")
         
@@ -3181,16 +2522,15 @@ with tab2:
         
         with col_add2:
             if st.button("➕ Add Selected to Overview", use_container_width=True):
-                if st.session_state.selected_project_indices:
+                if selected:
                     # Add all selected projects to overview
-                    if 'loaded_projects_overview' not in st.session_state:
-                        st.session_state.loaded_projects_overview = []
-                    
                     added_count = 0
-                    for idx in st.session_state.selected_project_indices:
-                        project = st.session_state.projects[idx]
-                        if not any(p['project_number'] == project['project_number'] for p in st.session_state.loaded_projects_overview):
+                    in_overview = {p['project_number'] for p in st.session_state.loaded_projects_overview}
+                    for number in sorted(selected):
+                        project = st.session_state.projects.get(number)
+                        if project['project_number'] not in in_overview:
                             st.session_state.loaded_projects_overview.append(project)
+                            in_overview.add(project['project_number'])
                             added_count += 1
                     
                     if added_count > 0:
@@ -3203,15 +2543,12 @@ with tab2:
         
         # Handle Delete button
         if delete_btn:
-            if st.session_state.selected_project_indices:
-                # Sort in reverse to delete from end first (avoid index shifting)
-                for idx in sorted(st.session_state.selected_project_indices, reverse=True):
-                    deleted_project = st.session_state.projects[idx]
-                    st.session_state.projects.pop(idx)
-                    st.success(f"✅ Deleted project {deleted_project['project_number']}")
+            if selected:
+                for number in sorted(selected):
+                    delete_project_record(number)
+                    st.success(f"✅ Deleted project {number}")
                 
-                save_projects()
-                st.session_state.selected_project_indices = []  # Clear selection
+                selected.clear()  # Clear selection
                 time.sleep(1)
                 st.rerun()
             else:
@@ -3233,299 +2570,62 @@ with tab2:
             if st.button("📄 Output Report", use_container_width=True, type="primary"):
                 if st.session_state.loaded_projects_overview:
                     try:
-                        from reportlab.lib.pagesizes import letter
-                        from reportlab.lib import colors
-                        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-                        from reportlab.lib.units import inch
-                        from reportlab.platypus import (SimpleDocTemplate, Table, TableStyle,
-                                                        Paragraph, Spacer, PageBreak, Image as RLImage)
-                        from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-                        from io import BytesIO
-
-                        # ── mm³ conversion ───────────────────────────────────────────────
-                        MM3_TO = {
-                            'cubic mm':     1.0,
-                            'cubic cm':     0.001,
-                            'cubic inches': 0.000061023744,
-                            'cubic feet':   0.000000035315,
-                        }
-                        def to_unit(v, u): return v * MM3_TO.get(u, 0.001)
-                        def fmv(v, u, d=4): return f"{to_unit(v,u):,.{d}f}"
-
-                        # ── Page / column geometry ───────────────────────────────────────
-                        buf = BytesIO()
-                        PW  = 7.5  * inch   # usable page width
-                        TW  = PW              # tables span full page width
-                        KW  = 1.5  * inch   # key column inside tables
-                        VW  = TW   - KW     # value column
-
-                        doc = SimpleDocTemplate(buf, pagesize=letter,
-                            topMargin=0.4*inch, bottomMargin=0.4*inch,
-                            leftMargin=0.5*inch, rightMargin=0.5*inch)
-                        styles = getSampleStyleSheet()
-
-                        # ── Styles ───────────────────────────────────────────────────────
-                        s_title = ParagraphStyle('DVATitle', parent=styles['Normal'],
-                                    fontSize=18, fontName='Helvetica-Bold',
-                                    textColor=colors.HexColor('#1565C0'),
-                                    alignment=TA_LEFT, spaceAfter=1)
-                        s_sub   = ParagraphStyle('DVASub', parent=styles['Normal'],
-                                    fontSize=3.75, textColor=colors.HexColor('#546E7A'),
-                                    alignment=TA_LEFT, spaceAfter=0)
-                        s_sec   = ParagraphStyle('DVASec', parent=styles['Normal'],
-                                    fontSize=8.5, fontName='Helvetica-Bold',
-                                    textColor=colors.white, spaceAfter=0, spaceBefore=0)
-                        s_info_hdr = ParagraphStyle('IH', parent=styles['Normal'],
-                                    fontSize=6.5, fontName='Helvetica-Bold',
-                                    textColor=colors.HexColor('#60a5fa'), spaceAfter=1)
-                        s_info_val = ParagraphStyle('IV', parent=styles['Normal'],
-                                    fontSize=6.0, textColor=colors.HexColor('#e2e8f0'),
-                                    spaceAfter=1)
-
-                        def tiny():  return Spacer(1, 0.07*inch)
-                        def micro(): return Spacer(1, 0.03*inch)
-
-                        # ── Table style ──────────────────────────────────────────────────
-                        def kv_style(key_bg):
-                            return TableStyle([
-                                ('BACKGROUND',    (0,0),(0,-1), colors.HexColor(key_bg)),
-                                ('BACKGROUND',    (1,0),(1,-1), colors.HexColor('#FAFAFA')),
-                                ('TEXTCOLOR',     (0,0),(-1,-1), colors.HexColor('#1A1A1A')),
-                                ('FONTNAME',      (0,0),(0,-1), 'Helvetica-Bold'),
-                                ('FONTNAME',      (1,0),(1,-1), 'Helvetica'),
-                                ('FONTSIZE',      (0,0),(-1,-1), 8),
-                                ('ALIGN',         (0,0),(0,-1), 'RIGHT'),
-                                ('ALIGN',         (1,0),(1,-1), 'LEFT'),
-                                ('TOPPADDING',    (0,0),(-1,-1), 3),
-                                ('BOTTOMPADDING', (0,0),(-1,-1), 3),
-                                ('LEFTPADDING',   (0,0),(-1,-1), 5),
-                                ('RIGHTPADDING',  (0,0),(-1,-1), 5),
-                                ('GRID',          (0,0),(-1,-1), 0.4, colors.HexColor('#CFD8DC')),
-                                ('VALIGN',        (0,0),(-1,-1), 'TOP'),
-                            ])
-
-                        def sec_hdr(label, bg='#1565C0'):
-                            t = Table([[Paragraph(label, s_sec)]], colWidths=[TW])
-                            t.setStyle(TableStyle([
-                                ('BACKGROUND',    (0,0),(0,0), colors.HexColor(bg)),
-                                ('TOPPADDING',    (0,0),(0,0), 4),
-                                ('BOTTOMPADDING', (0,0),(0,0), 4),
-                                ('LEFTPADDING',   (0,0),(0,0), 6),
-                                ('RIGHTPADDING',  (0,0),(0,0), 6),
-                            ]))
-                            return t
-
-                        def kv_table(rows, key_bg):
-                            t = Table(rows, colWidths=[KW, VW])
-                            t.setStyle(kv_style(key_bg))
-                            return t
-
-                        # Header: +20% height (0.72"), logo 1:1 square
-                        HDR_H  = 0.72 * inch
-                        LOGO_H = HDR_H * 0.80
-                        LOGO_W = LOGO_H * 1.0   # dva_logo.png is 400×400 (1:1)
-
-                        def build_header():
-                            title_p = Paragraph('Displacement Volume Analyzer', s_title)
-                            sub_p   = Paragraph(
-                                "Archimedes' Principle  |  Water at 4\xb0C (1 g/mL)", s_sub)
-                            if os.path.exists('dva_logo.png'):
-                                try:
-                                    logo = RLImage('dva_logo.png',
-                                                   width=LOGO_W, height=LOGO_H)
-                                    right_w = 0.6 * inch
-                                    mid_w   = PW - LOGO_W - right_w - 0.12*inch
-                                    hdr = Table(
-                                        [[logo, [title_p, micro(), sub_p], '']],
-                                        colWidths=[LOGO_W + 0.12*inch, mid_w, right_w])
-                                except Exception:
-                                    hdr = Table([['', [title_p, micro(), sub_p], '']],
-                                                colWidths=[0, PW, 0])
-                            else:
-                                hdr = Table([['', [title_p, micro(), sub_p], '']],
-                                            colWidths=[0, PW, 0])
-                            hdr.setStyle(TableStyle([
-                                ('VALIGN',        (0,0),(-1,-1), 'MIDDLE'),
-                                ('LEFTPADDING',   (0,0),(-1,-1), 4),
-                                ('RIGHTPADDING',  (0,0),(-1,-1), 4),
-                                ('TOPPADDING',    (0,0),(-1,-1), 6),
-                                ('BOTTOMPADDING', (0,0),(-1,-1), 6),
-                                ('LINEBELOW',     (0,0),(-1,-1), 0.5,
-                                                  colors.HexColor('#1565C0')),
-                            ]))
-                            return hdr
-
-
-                        # ════════════════════════════════════════════════════════════════
-                        # Per-project pages
-                        # ════════════════════════════════════════════════════════════════
-                        elements = []
-
-                        for p_idx, project in enumerate(st.session_state.loaded_projects_overview):
-                            if p_idx > 0:
-                                elements.append(PageBreak())
-
-                            # Unit fields from saved project
-                            vol_unit = project.get('box_result_unit', 'cubic inches')
-                            dim_unit = project.get('dimension_unit', 'inches')
-                            w_unit   = project.get('weight_unit', 'grams')
-                            qty      = int(project.get('product_quantity', 1))
-
-                            unit_vol_mm3  = project.get('primary_volume_mm3', 0.0)
-                            total_vol_mm3 = project.get('total_product_volume_mm3', unit_vol_mm3)
-                            box_vol_mm3   = project.get('box_volume_mm3', 0.0)
-                            rem_mm3       = box_vol_mm3 - total_vol_mm3
-                            eff_pct       = (total_vol_mm3/box_vol_mm3*100) if box_vol_mm3>0 else 0
-                            rem_pct       = 100.0 - eff_pct
-
-                            # Header
-                            elements.append(build_header())
-                            elements.append(micro())
-
-                            rpt_date = datetime.now().strftime('%B %d, %Y  ·  %I:%M %p')
-                            strip = Table([[
-                                Paragraph('Project Analysis Report',
-                                    ParagraphStyle('LS', parent=styles['Normal'],
-                                        fontSize=8, textColor=colors.white,
-                                        fontName='Helvetica-Bold')),
-                                Paragraph(rpt_date,
-                                    ParagraphStyle('RS', parent=styles['Normal'],
-                                        fontSize=8, textColor=colors.HexColor('#B0BEC5'),
-                                        alignment=TA_RIGHT)),
-                            ]], colWidths=[PW*0.55, PW*0.45])
-                            strip.setStyle(TableStyle([
-                                ('BACKGROUND',    (0,0),(-1,-1), colors.HexColor('#263238')),
-                                ('TOPPADDING',    (0,0),(-1,-1), 4),
-                                ('BOTTOMPADDING', (0,0),(-1,-1), 4),
-                                ('LEFTPADDING',   (0,0),(-1,-1), 8),
-                                ('RIGHTPADDING',  (0,0),(-1,-1), 8),
-                            ]))
-                            elements.append(strip)
-                            elements.append(tiny())
-
-                            # ── Left column: data tables ─────────────────────────────────
-                            left_items = []
-
-                            # Section 1: Project Information
-                            left_items.append(sec_hdr('PROJECT INFORMATION'))
-                            left_items.append(micro())
-                            left_items.append(kv_table([
-                                ['Project #:',    str(project.get('project_number',''))],
-                                ['Project Name:', project.get('project_name','')],
-                                ['Designer:',     project.get('designer','')],
-                                ['Date:',         project.get('date','')],
-                                ['Contact:',      project.get('contact','—')],
-                                ['Description:',  project.get('description','')],
-                            ], '#E3F2FD'))
-                            left_items.append(tiny())
-
-                            # Section 2: Primary Product Volume
-                            left_items.append(sec_hdr('PRIMARY PRODUCT VOLUME','#2E7D32'))
-                            left_items.append(micro())
-                            
-                            # Get weight with multiple fallbacks
-                            weight_val = project.get('weight', project.get('product_weight', 0.0))
-                            
-                            left_items.append(kv_table([
-                                ['Weight of Water:', f"{weight_val} {w_unit}"],
-                                ['Unit Volume:',  f"{fmv(unit_vol_mm3, vol_unit)} {vol_unit}"],
-                                ['Quantity:',     str(qty)],
-                                ['Total Volume:', f"{fmv(total_vol_mm3,vol_unit)} {vol_unit}"],
-                            ], '#E8F5E9'))
-                            left_items.append(tiny())
-
-                            # Section 3: Secondary Packaging
-                            if box_vol_mm3 > 0:
-                                left_items.append(sec_hdr('SECONDARY PACKAGING','#E65100'))
-                                left_items.append(micro())
-                                dim_str = (f"{project.get('box_length',0)} x "
-                                           f"{project.get('box_width',0)} x "
-                                           f"{project.get('box_height',0)} {dim_unit}")
-                                left_items.append(kv_table([
-                                    ['Box Dimensions:',   dim_str],
-                                    ['Box Volume:',       f"{fmv(box_vol_mm3,  vol_unit)} {vol_unit}"],
-                                    ['Product Volume:',   f"{fmv(total_vol_mm3,vol_unit)} {vol_unit}"],
-                                    ['Remaining Volume:', f"{fmv(rem_mm3,      vol_unit)} {vol_unit}"],
-                                    ['Efficiency:',       f"{eff_pct:.1f}%"],
-                                    ['Remaining Space:',  f"{rem_pct:.1f}%"],
-                                ], '#FFF3E0'))
-                                left_items.append(tiny())
-
-                            # 3D Volume Preview & Efficiency Analysis section removed
-
-                            # Append all sections directly
-                            for item in left_items:
-                                elements.append(item)
-
-                        # ════════════════════════════════════════════════════════════════
-                        # Comparison table (multi-project)
-                        # ════════════════════════════════════════════════════════════════
-                        projects_with_boxes = [p for p in st.session_state.loaded_projects_overview
-                                               if p.get('box_volume_mm3', 0) > 0]
-                        if len(st.session_state.loaded_projects_overview) > 1 and projects_with_boxes:
-                            elements.append(PageBreak())
-                            elements.append(sec_hdr('VOLUME COMPARISON SUMMARY'))
-                            elements.append(tiny())
-
-                            cmp_unit = projects_with_boxes[0].get('box_result_unit','cubic inches')
-                            ch = ParagraphStyle('CH', parent=styles['Normal'],
-                                                fontSize=7.5, textColor=colors.white,
-                                                fontName='Helvetica-Bold', alignment=TA_CENTER)
-                            cmp_rows = [[
-                                Paragraph('#', ch),
-                                Paragraph('Project Name', ch),
-                                Paragraph(f'Box Vol\n({cmp_unit})', ch),
-                                Paragraph(f'Product Vol\n({cmp_unit})', ch),
-                                Paragraph(f'Remaining\n({cmp_unit})', ch),
-                                Paragraph('Efficiency', ch),
-                            ]]
-                            for p in projects_with_boxes:
-                                p_unit = p.get('box_result_unit','cubic inches')
-                                t_mm3  = p.get('total_product_volume_mm3',
-                                               p.get('primary_volume_mm3',0))
-                                b_mm3  = p.get('box_volume_mm3',0)
-                                r_mm3  = b_mm3 - t_mm3
-                                e_pct  = (t_mm3/b_mm3*100) if b_mm3>0 else 0
-                                cmp_rows.append([
-                                    str(p.get('project_number','')),
-                                    p.get('project_name','')[:26],
-                                    fmv(b_mm3, p_unit),
-                                    fmv(t_mm3, p_unit),
-                                    fmv(r_mm3, p_unit),
-                                    f"{e_pct:.1f}%",
-                                ])
-                            cmp_t = Table(cmp_rows,
-                                          colWidths=[0.4*inch,1.8*inch,
-                                                     1.15*inch,1.15*inch,1.15*inch,1.15*inch])
-                            cmp_t.setStyle(TableStyle([
-                                ('BACKGROUND',    (0,0),(-1,0), colors.HexColor('#1565C0')),
-                                ('FONTSIZE',      (0,1),(-1,-1), 8),
-                                ('ALIGN',         (0,0),(-1,-1), 'CENTER'),
-                                ('ALIGN',         (1,0),(1,-1), 'LEFT'),
-                                ('TOPPADDING',    (0,0),(-1,-1), 3),
-                                ('BOTTOMPADDING', (0,0),(-1,-1), 3),
-                                ('LEFTPADDING',   (0,0),(-1,-1), 4),
-                                ('RIGHTPADDING',  (0,0),(-1,-1), 4),
-                                ('GRID',          (0,0),(-1,-1), 0.4, colors.HexColor('#CFD8DC')),
-                                ('ROWBACKGROUNDS',(0,1),(-1,-1),
-                                 [colors.white, colors.HexColor('#E3F2FD')]),
-                            ]))
-                            elements.append(cmp_t)
-
-                        # ── Build & download ──────────────────────────────────────────────
-                        doc.build(elements)
-                        
-                        buf.seek(0)
-                        pdf_bytes = buf.getvalue()
+                        from dva_core import report as dva_report
+                        import shutil
+                        import tempfile
+
+                        projects = [dict(p) for p in st.session_state.loaded_projects_overview]
+                        render_queue = get_render_queue(RENDER_WORKERS, RENDER_RETRIES)
+                        chart_root = tempfile.mkdtemp(prefix='dva_report_charts_')
+
+                        def render_report_charts(batch):
+                            """Chart images for one batch of projects, rendered in parallel"""
+                            if not MATPLOTLIB_AVAILABLE:
+                                return {}
+                            with_box = [p for p in batch
+                                        if dva_core.normalize_project(p)['box_volume_mm3'] > 0]
+                            jobs = render_queue.run_batch(
+                                'report charts', dva_core.jobs.render_project_charts,
+                                [(p, chart_root) for p in with_box], timeout=120)
+                            return {p['project_number']: job.result
+                                    for p, job in zip(with_box, jobs) if job.status == 'done'}
+
+                        report_progress = st.progress(0.0, text="Building report…")
+
+                        def show_report_progress(done, total, pages):
+                            report_progress.progress(done / total,
+                                text=f"Page {pages} · {done} of {total} projects")
+
+                        # Pages stream into a spooled file: memory up to the limit, disk beyond
+                        pdf_file = tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_BYTES)
+                        try:
+                            page_count = dva_report.build_report(
+                                projects, pdf_file,
+                                render_charts=render_report_charts,
+                                progress=show_report_progress,
+                                page_cache=(get_report_page_cache(REPORT_PAGE_CACHE_DIR,
+                                                                  REPORT_PAGE_CACHE_MAX_PROJECTS)
+                                            if REPORT_PAGE_CACHE_DIR else None))
+                        finally:
+                            shutil.rmtree(chart_root, ignore_errors=True)
+                        report_progress.empty()
+
+                        def read_pdf():
+                            # Read on click, off the script thread; the spooled
+                            # file lives as long as the button holds this callable
+                            pdf_file.seek(0)
+                            return pdf_file.read()
+
                         filename = f"DVA_Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
                         st.download_button(
                             label="\u2b07\ufe0f Download PDF Report",
-                            data=pdf_bytes,
+                            data=read_pdf,
                             file_name=filename,
                             mime="application/pdf",
+                            on_click="ignore",
                             use_container_width=True,
                         )
-                        st.success("\u2705 PDF report generated successfully!")
+                        st.success(f"\u2705 PDF report generated successfully! ({page_count} pages)")
 
                     except ImportError as e:
                         st.error(f"\u274c Missing library: {e}. Install with: pip install reportlab")
@@ -3534,10 +2634,6 @@ with tab2:
                 else:
                     st.warning("\u26a0\ufe0f No projects in overview. Add projects to generate a report.")
         
-        # Initialize overview list
-        if 'loaded_projects_overview' not in st.session_state:
-            st.session_state.loaded_projects_overview = []
-        
         # Display all loaded projects in overview
         if st.session_state.loaded_projects_overview:
             st.info(f"📊 Showing {len(st.session_state.loaded_projects_overview)} project(s) in overview")
@@ -3549,181 +2645,14 @@ with tab2:
             st.markdown("---")
             
             for idx, project in enumerate(st.session_state.loaded_projects_overview):
-                with st.expander(f"📋 Project {project['project_number']} - {project['project_name']}", expanded=False):
-                    
-                    # DEBUG: Show project data
-                    if st.checkbox(f"🔍 Debug Project Data", value=False, key=f"debug_overview_{idx}_{project['project_number']}"):
-                        st.write("**Project Data Loaded in Overview:**")
-                        st.write(f"- weight: {project.get('weight', 'NOT FOUND')}")
-                        st.write(f"- product_weight: {project.get('product_weight', 'NOT FOUND')}")
-                        st.write(f"- weight_unit: {project.get('weight_unit', 'NOT FOUND')}")
-                        st.write(f"- primary_volume_mm3: {project.get('primary_volume_mm3', 'NOT FOUND')}")
-                        
-                        st.write("**All Keys in Project:**")
-                        st.code(", ".join(sorted(project.keys())))
-                        
-                        st.write("**Full Project Data:**")
-                        st.json(project)
-                    
-                    # ═══════════════════════════════════════════════════════════
-                    # SECTION 1: Project Information & Calculation Results
-                    # ═══════════════════════════════════════════════════════════
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.markdown("#### Project Information")
-                        st.info(f"""
-                        **Project Number:** {project.get('project_number', '—')}  
-                        **Project Name:** {project.get('project_name', '—')}  
-                        **Designer:** {project.get('designer', '—')}  
-                        **Date:** {project.get('date', '—')}  
-                        **Contact:** {project.get('contact', '—')}  
-                        **Description:** {project.get('description', '—')}  
-                        **Last Modified:** {project.get('last_modified', '—')}
-                        """)
-                    
-                    with col2:
-                        st.markdown("#### Calculation Results")
-
-                        # All values read directly from the saved project file
-                        disp_vol_unit = project.get('box_result_unit', 'cubic inches')
-                        disp_dim_unit = project.get('dimension_unit', 'inches')
-                        disp_w_unit   = project.get('weight_unit', '')
-                        mm3_to_disp   = {
-                            'cubic mm': 1, 'cubic cm': 0.001,
-                            'cubic inches': 0.000061023744, 'cubic feet': 0.000000035315
-                        }
-                        factor = mm3_to_disp.get(disp_vol_unit, 0.001)
-
-                        unit_vol_mm3   = project.get('primary_volume_mm3', 0)
-                        total_vol_mm3  = project.get('total_product_volume_mm3', unit_vol_mm3)
-                        qty            = project.get('product_quantity', 1)
-                        unit_vol_disp  = unit_vol_mm3  * factor
-                        total_vol_disp = total_vol_mm3 * factor
-
-                        # Primary Product
-                        weight_val = project.get('weight', project.get('product_weight', 0.0))
-                        weight_display = f"{weight_val:,.2f} {disp_w_unit}" if weight_val > 0 else "Not entered"
-                        st.success(f"""
-                        **Primary Product**  
-                        Weight of Water: {weight_display}  
-                        Unit Volume: {unit_vol_disp:,.4f} {disp_vol_unit}  
-                        Quantity: {qty}  
-                        Total Volume: {total_vol_disp:,.4f} {disp_vol_unit}
-                        """)
-
-                        # Secondary Packaging
-                        if project.get('box_volume_mm3', 0) > 0:
-                            box_vol_disp = project.get('box_volume_mm3', 0) * factor
-                            rem_mm3      = project.get('box_volume_mm3', 0) - total_vol_mm3
-                            rem_disp     = rem_mm3 * factor
-                            eff          = (total_vol_mm3 / project.get('box_volume_mm3', 1) * 100)
-                            st.info(f"""
-                            **Secondary Packaging**  
-                            Dimensions: {project.get('box_length', 0)} × {project.get('box_width', 0)} × {project.get('box_height', 0)} {disp_dim_unit}  
-                            Box Volume: {box_vol_disp:,.4f} {disp_vol_unit}  
-                            Product Volume: {total_vol_disp:,.4f} {disp_vol_unit}  
-                            Remaining: {rem_disp:,.4f} {disp_vol_unit}  
-                            Efficiency: {eff:.1f}%
-                            """)
-                        else:
-                            st.caption("No box dimensions saved for this project.")
-                    
-                    # ═══════════════════════════════════════════════════════════
-                    # SECTION 2: Volume Efficiency Analysis (if box data exists)
-                    # ═══════════════════════════════════════════════════════════
-                    if project.get('box_volume_mm3', 0) > 0:
-                        st.markdown("---")
-                        st.markdown("### 📊 Volume Efficiency Analysis")
-                        
-                        # Calculate efficiency
-                        volume_eff_pct = (total_vol_mm3 / project.get('box_volume_mm3', 1) * 100)
-                        
-                        # Row 1: Gauge and Donut charts
-                        viz_col1, viz_col2 = st.columns(2)
-                        
-                        with viz_col1:
-                            gauge_fig = create_efficiency_gauge(volume_eff_pct)
-                            st.plotly_chart(gauge_fig, use_container_width=True, key=f"gauge_{project['project_number']}_{idx}")
-                        
-                        with viz_col2:
-                            donut_fig = create_donut_chart(volume_eff_pct)
-                            st.plotly_chart(donut_fig, use_container_width=True, key=f"donut_{project['project_number']}_{idx}")
-                        
-                        # ═══════════════════════════════════════════════════════════
-                        # SECTION 3: Volume Breakdown
-                        # ═══════════════════════════════════════════════════════════
-                        st.markdown("### 📦 Volume Breakdown")
-                        
-                        comparison_fig = create_volume_comparison_chart(
-                            box_vol_disp,
-                            total_vol_disp,
-                            disp_vol_unit
-                        )
-                        st.plotly_chart(comparison_fig, use_container_width=True, key=f"breakdown_{project['project_number']}_{idx}")
-                        
-                        # ═══════════════════════════════════════════════════════════
-                        # SECTION 4: 3D Volume Preview
-                        # ═══════════════════════════════════════════════════════════
-                        if all(k in project for k in ['box_length', 'box_width', 'box_height']):
-                            st.markdown("### 📊 3D Volume Preview")
-                            
-                            # Create two columns: info panel and 3D graphic
-                            info_col, graphic_col = st.columns([1.3, 2.7], gap="large")
-                            
-                            with info_col:
-                                # Calculate box volume in display units
-                                box_dims_vol = project['box_length'] * project['box_width'] * project['box_height']
-                                
-                                # Info panel
-                                st.markdown(f"""
-                                <div style='background: linear-gradient(135deg, rgba(59, 130, 246, 0.1) 0%, rgba(16, 185, 129, 0.1) 100%); 
-                                            border-left: 4px solid #3b82f6; 
-                                            padding: 14px; 
-                                            border-radius: 10px;
-                                            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                                            margin-bottom: 20px;'>
-                                    <div style='font-size: 17px; font-weight: bold; color: #3b82f6; margin-bottom: 6px;'>📦 SECONDARY PACKAGING</div>
-                                    <p style='font-size: 20px; font-weight: bold; color: #3b82f6; margin: 6px 0;'>
-                                        {box_dims_vol:.2f} {disp_dim_unit}³
-                                    </p>
-                                    <p style='font-size: 15px; color: #94a3b8; margin: 6px 0;'>
-                                        {project['box_length']:.1f} × {project['box_width']:.1f} × {project['box_height']:.1f} {disp_dim_unit}
-                                    </p>
-                                    <hr style='border: none; border-top: 1px solid rgba(148, 163, 184, 0.3); margin: 10px 0;'>
-                                    <div style='font-size: 17px; font-weight: bold; color: #10b981; margin-bottom: 6px;'>🎁 PRIMARY PRODUCT</div>
-                                    <p style='font-size: 20px; font-weight: bold; color: #10b981; margin: 6px 0;'>
-                                        {total_vol_disp:.2f} {disp_vol_unit}
-                                    </p>
-                                    <p style='font-size: 15px; color: #94a3b8; margin: 6px 0;'>
-                                        Quantity: {qty} units
-                                    </p>
-                                    <hr style='border: none; border-top: 1px solid rgba(148, 163, 184, 0.3); margin: 10px 0;'>
-                                    <div style='font-size: 17px; font-weight: bold; color: white; margin-bottom: 6px;'>📊 EFFICIENCY</div>
-                                    <p style='font-size: 30px; font-weight: bold; color: white; margin: 6px 0;'>
-                                        {volume_eff_pct:.1f}%
-                                    </p>
-                                    <p style='font-size: 15px; color: #94a3b8; margin: 6px 0;'>
-                                        Volume Utilization
-                                    </p>
-                                </div>
-                                """, unsafe_allow_html=True)
-                            
-                            with graphic_col:
-                                # 3D visualization
-                                box_3d_fig = create_3d_volume_preview(
-                                    project['box_length'],
-                                    project['box_width'],
-                                    project['box_height'],
-                                    volume_eff_pct,
-                                    disp_dim_unit
-                                )
-                                st.plotly_chart(box_3d_fig, use_container_width=True, key=f"3d_{project['project_number']}_{idx}")
-                    
-                    # Remove button for this project
-                    if st.button(f"Remove from Overview", key=f"remove_overview_{idx}"):
-                        st.session_state.loaded_projects_overview.pop(idx)
-                        st.rerun()
+                # Panels rerun the app when toggled and build their figures only
+                # while open; a closed panel costs just its summary label
+                panel = st.expander(overview_panel_label(project), expanded=False,
+                                    key=f"overview_panel_{project['project_number']}",
+                                    on_change="rerun")
+                with panel:
+                    if panel.open:
+                        overview_project_panel(idx, project)
             
             # Clear all button
             if st.button("🗑️ Clear All from Overview"):
@@ -3735,83 +2664,75 @@ with tab2:
             st.markdown("## 📊 Remaining Volume Comparison")
             
             # Filter projects that have box volume data
-            projects_with_boxes = [p for p in st.session_state.loaded_projects_overview if p.get('box_volume_mm3', 0) > 0]
+            projects_with_boxes = [p for p in map(dva_core.normalize_project, st.session_state.loaded_projects_overview)
+                                   if p['box_volume_mm3'] > 0]
             
             if projects_with_boxes:
                 # Use the unit saved in the first project's record
-                comparison_unit = projects_with_boxes[0].get('box_result_unit', 'cubic inches')
+                comparison_unit = projects_with_boxes[0]['box_result_unit']
                 st.info(f"ℹ️ Using **{comparison_unit}** (saved with project)")
                 
-                # Conversion factors from mm³
-                mm3_to_unit = {
-                    "cubic mm": 1,
-                    "cubic cm": 0.001,
-                    "cubic inches": 0.000061023744,
-                    "cubic feet": 0.000000035315
-                }
+                # Conversion factor from mm³
+                conversion_factor = dva_units.factor('cubic mm', comparison_unit)
                 
-                conversion_factor = mm3_to_unit[comparison_unit]
+                # Every project in one figure; the builder works on whole arrays
+                comparison_fig = cached_figure(
+                    create_volume_comparison_multiples,
+                    tuple(f"#{p['project_number']} {p['project_name'][:30]}" for p in projects_with_boxes),
+                    tuple(p['total_product_volume_mm3'] * conversion_factor for p in projects_with_boxes),
+                    tuple(p['box_volume_mm3'] * conversion_factor for p in projects_with_boxes),
+                    comparison_unit
+                )
+                st.plotly_chart(comparison_fig, use_container_width=True, key="comparison_multiples")
                 
-                # Display each project with all data in compact format
-                for project in projects_with_boxes:
-                    box_volume_mm3 = project.get('box_volume_mm3', 0)
-                    # Use total product volume (with quantity) if available, otherwise primary
-                    product_volume_mm3 = project.get('total_product_volume_mm3', project.get('primary_volume_mm3', 0))
-                    remaining_volume_mm3 = box_volume_mm3 - product_volume_mm3
+                # Per-project cards (one chart each), on request
+                if st.checkbox("Show per-project cards", value=False, key="comparison_cards"):
+                    st.markdown("---")
+                    for project in projects_with_boxes:
+                        # Total product volume (with quantity) falls back to primary in normalize_project
+                        metrics = dva_core.project_metrics(project)
                     
-                    # Convert to selected unit
-                    box_volume = box_volume_mm3 * conversion_factor
-                    product_volume = product_volume_mm3 * conversion_factor
-                    remaining_volume = remaining_volume_mm3 * conversion_factor
+                        # Convert to selected unit
+                        box_volume = metrics['box_volume_mm3'] * conversion_factor
+                        product_volume = metrics['product_volume_mm3'] * conversion_factor
+                        remaining_volume = metrics['remaining_volume_mm3'] * conversion_factor
                     
-                    # Calculate percentage
-                    if box_volume_mm3 > 0:
-                        percentage_remaining = (remaining_volume_mm3 / box_volume_mm3) * 100
-                        percentage_used = (product_volume_mm3 / box_volume_mm3) * 100
-                    else:
-                        percentage_remaining = 0
-                        percentage_used = 0
+                        percentage_remaining = metrics['remaining_pct']
+                        percentage_used = metrics['efficiency_pct']
                     
-                    # Display project card with all info
-                    with st.container():
-                        # Determine efficiency level
-                        if percentage_used >= 85:
-                            eff_label = "Excellent"
-                        elif percentage_used >= 75:
-                            eff_label = "Good"
-                        elif percentage_used >= 60:
-                            eff_label = "Fair"
-                        else:
-                            eff_label = "Poor"
+                        # Display project card with all info
+                        with st.container():
+                            # Determine efficiency level
+                            eff_label = dva_core.efficiency_band(percentage_used).label
                         
-                        # Show quantity and efficiency in header
-                        quantity_info = f" (Qty: {project.get('product_quantity', 1)})" if project.get('product_quantity', 1) > 1 else ""
-                        efficiency_info = f" - {percentage_used:.1f}% {eff_label}"
-                        st.markdown(f"### 📦 {project['project_name']} (Project #{project['project_number']}){quantity_info}{efficiency_info}")
+                            # Show quantity and efficiency in header
+                            quantity_info = f" (Qty: {project['product_quantity']})" if project['product_quantity'] > 1 else ""
+                            efficiency_info = f" - {percentage_used:.1f}% {eff_label}"
+                            st.markdown(f"### 📦 {project['project_name']} (Project #{project['project_number']}){quantity_info}{efficiency_info}")
                         
-                        # Row 1: Volume metrics
-                        vol_col1, vol_col2, vol_col3 = st.columns(3)
+                            # Row 1: Volume metrics
+                            vol_col1, vol_col2, vol_col3 = st.columns(3)
                         
-                        with vol_col1:
-                            st.metric("Box Volume", f"{box_volume:,.2f}", delta=None)
-                            st.caption(comparison_unit)
+                            with vol_col1:
+                                st.metric("Box Volume", f"{box_volume:,.2f}", delta=None)
+                                st.caption(comparison_unit)
                         
-                        with vol_col2:
-                            st.metric("Product Volume", f"{product_volume:,.2f}", delta=f"{percentage_used:.1f}% used")
-                            st.caption(comparison_unit)
+                            with vol_col2:
+                                st.metric("Product Volume", f"{product_volume:,.2f}", delta=f"{percentage_used:.1f}% used")
+                                st.caption(comparison_unit)
                         
-                        with vol_col3:
-                            st.metric("Remaining Volume", f"{remaining_volume:,.2f}", 
-                                     delta=f"{percentage_remaining:.1f}% free" if remaining_volume >= 0 else "Overflow!")
-                            st.caption(comparison_unit)
+                            with vol_col3:
+                                st.metric("Remaining Volume", f"{remaining_volume:,.2f}", 
+                                         delta=f"{percentage_remaining:.1f}% free" if remaining_volume >= 0 else "Overflow!")
+                                st.caption(comparison_unit)
                         
-                        # Volume Breakdown Bar Chart (removed efficiency bar above)
-                        st.markdown("#### Volume Breakdown")
-                        st.caption("Goal: Maximize product volume, minimize empty space")
-                        breakdown_fig = create_volume_breakdown_bar(product_volume, remaining_volume, comparison_unit)
-                        st.plotly_chart(breakdown_fig, use_container_width=True, key=f"breakdown_bar_{project['project_number']}")
+                            # Volume Breakdown Bar Chart (removed efficiency bar above)
+                            st.markdown("#### Volume Breakdown")
+                            st.caption("Goal: Maximize product volume, minimize empty space")
+                            breakdown_fig = cached_figure(create_volume_breakdown_bar, product_volume, remaining_volume, comparison_unit)
+                            st.plotly_chart(breakdown_fig, use_container_width=True, key=f"breakdown_bar_{project['project_number']}")
                         
-                        st.markdown("---")
+                            st.markdown("---")
             else:
                 st.info("💡 No projects with box volume data in overview. Add projects with complete calculations to see comparison.")
         else:
@@ -3820,15 +2741,9 @@ with tab2:
     else:
         st.info("📭 No projects loaded.")
         
-        # Check if file exists and has content
-        import os
-        if os.path.exists('dva_projects.json'):
-            with open('dva_projects.json', 'r') as f:
-                file_content = f.read().strip()
-                if file_content:
-                    st.warning("⚠️ Projects exist in file but aren't loaded. Click the **🔄 Refresh** button above to load them.")
-                else:
-                    st.caption("The dva_projects.json file exists but is empty.")
+        # Check if the store has projects this session hasn't loaded
+        if project_store.count():
+            st.warning("⚠️ Projects exist in the project store but aren't loaded. Click the **🔄 Refresh** button above to load them.")
         
         st.markdown("""
         ### 🚀 How to Create and Save Projects:
@@ -3844,43 +2759,61 @@ with tab2:
         Your saved projects will appear here after refreshing!
         """)
 
+with tab2:
+    if tab2.open:
+        project_results_tab()
+
 # TAB 3: Primary Results
-with tab3:
+def primary_results_tab():
+    """Primary Results tab: batch volume conversions"""
+    ensure_samples_loaded()
     st.markdown("## Primary Results - Batch Conversion Results")
     
     if st.button("🔄 Refresh Results"):
         st.session_state.samples = load_data()
         st.rerun()
     
-    if st.session_state.samples:
-        # Create results table
-        results_data = []
-        
-        for sample in st.session_state.samples:
-            volumes = calculate_volume(sample['weight'], sample['unit'])
-            results_data.append({
-                'Sample ID': sample['id'],
-                'Weight': f"{sample['weight']:.2f}",
-                'Unit': sample['unit'],
-                'Volume (mm³)': f"{volumes['mm³']:,.2f}",
-                'Volume (cm³)': f"{volumes['cm³']:,.2f}",
-                'Volume (in³)': f"{volumes['in³']:,.3f}"
-            })
-        
-        # Display as dataframe
+    if not st.session_state.samples.empty:
+        # Create results table as whole columns (one batch conversion, no per-row formatting)
+        samples = st.session_state.samples
+        sample_units = samples['unit']
+        sample_weights = samples['weight'].to_numpy()
+        volumes = dva_core.calculate_volumes_batch(sample_weights, sample_units)
+        results_data = {
+            'Sample ID': samples['id'],
+            'Weight': sample_weights,
+            'Unit': sample_units,
+            'Volume (mm³)': volumes['mm³'],
+            'Volume (cm³)': volumes['cm³'],
+            'Volume (in³)': volumes['in³']
+        }
+
+        # Display as dataframe; number formatting happens client-side
         st.dataframe(
             results_data,
             use_container_width=True,
-            hide_index=True
+            hide_index=True,
+            column_config={
+                'Weight': st.column_config.NumberColumn(format="%.2f"),
+                'Volume (mm³)': st.column_config.NumberColumn(format="%.2f"),
+                'Volume (cm³)': st.column_config.NumberColumn(format="%.2f"),
+                'Volume (in³)': st.column_config.NumberColumn(format="%.3f"),
+            }
         )
-        
-        st.markdown(f"**Total Samples:** {len(results_data)}")
+
+        st.markdown(f"**Total Samples:** {len(samples)}")
         
     else:
         st.warning("No samples available. Add samples in the Primary Data tab.")
 
+with tab3:
+    if tab3.open:
+        primary_results_tab()
+
 # TAB 4: Primary Data
-with tab4:
+def primary_data_tab():
+    """Primary Data tab: sample import and management"""
+    ensure_samples_loaded()
     st.markdown("## Primary Data Manager")
     
     # CSV Upload Section
@@ -3892,51 +2825,57 @@ with tab4:
     if uploaded_file is not None:
         try:
             import pandas as pd
-            df = pd.read_csv(uploaded_file)
+            streaming = uploaded_file.size > STREAMING_IMPORT_BYTES
+            if streaming:
+                # Only the preview rows are parsed until the import runs
+                df = pd.read_csv(uploaded_file, nrows=5)
+                uploaded_file.seek(0)
+            else:
+                df = pd.read_csv(uploaded_file)
             
             # Expected column names (case-insensitive)
-            expected_cols = ['sample id', 'weight', 'unit']
-            df.columns = df.columns.str.lower().str.strip()
+            missing_cols = dva_core.normalize_sample_columns(df)
             
             # Validate columns
-            if all(col in df.columns for col in expected_cols):
-                st.success(f"✅ CSV file loaded successfully! Found {len(df)} samples.")
+            if not missing_cols:
+                if streaming:
+                    st.success(f"✅ CSV file loaded successfully! {uploaded_file.size / 1024 / 1024:.1f} MB "
+                               f"will be imported in chunks of {SAMPLE_IMPORT_CHUNK_ROWS:,} rows.")
+                else:
+                    st.success(f"✅ CSV file loaded successfully! Found {len(df)} samples.")
                 
                 # Preview data
                 st.markdown("**Preview:**")
                 st.dataframe(df.head(), use_container_width=True)
                 
                 if st.button("📥 Import These Samples", use_container_width=True):
-                    imported_count = 0
-                    skipped_count = 0
-                    
-                    for _, row in df.iterrows():
-                        sample_id = str(row['sample id']).strip()
-                        
-                        # Skip if ID already exists
-                        if any(s['id'] == sample_id for s in st.session_state.samples):
-                            skipped_count += 1
-                            continue
-                        
-                        # Validate unit
-                        unit = str(row['unit']).lower().strip()
-                        if unit not in ['grams', 'ounces', 'pounds', 'kilograms']:
-                            skipped_count += 1
-                            continue
-                        
-                        try:
-                            weight = float(row['weight'])
-                            st.session_state.samples.append({
-                                'id': sample_id,
-                                'weight': weight,
-                                'unit': unit
-                            })
-                            imported_count += 1
-                        except (ValueError, TypeError):
-                            skipped_count += 1
-                            continue
+                    existing_ids = set(st.session_state.samples['id'])
+                    if streaming:
+                        # Only the IDs are needed from here on; the session copy is
+                        # reloaded on the next run, once the import is complete
+                        del st.session_state.samples
+                        # Validate and append one bounded chunk at a time; the parts
+                        # are compacted once, at the end
+                        imported_count = skipped_count = rows_read = 0
+                        progress = st.progress(0.0, text="Importing samples...")
+                        chunks = pd.read_csv(uploaded_file, chunksize=SAMPLE_IMPORT_CHUNK_ROWS)
+                        for new_samples, chunk_skipped, chunk_rows in dva_core.iter_sample_import(chunks, existing_ids):
+                            append_samples(new_samples, compact=False)
+                            imported_count += len(new_samples)
+                            skipped_count += chunk_skipped
+                            rows_read += chunk_rows
+                            progress.progress(min(uploaded_file.tell() / uploaded_file.size, 1.0),
+                                              text=f"Read {rows_read:,} rows, imported {imported_count:,} samples...")
+                        progress.progress(1.0, text=f"Read {rows_read:,} rows, compacting...")
+                        compact_samples()
+                        progress.progress(1.0, text=f"Read {rows_read:,} rows")
+                    else:
+                        # Validate, coerce and de-duplicate every row in one pass
+                        new_samples, skipped_count = dva_core.prepare_sample_import(df, existing_ids)
+                        imported_count = len(new_samples)
+                        append_samples(new_samples)
+                        st.session_state.samples = load_data()
                     
-                    save_data(st.session_state.samples)
                     st.success(f"✅ Imported {imported_count} samples! Skipped {skipped_count} (duplicates or invalid data).")
                     time.sleep(1.5)
                     st.rerun()
@@ -3945,6 +2884,8 @@ with tab4:
                 st.info("Please ensure your CSV has these exact column headers (case-insensitive).")
         except Exception as e:
             st.error(f"❌ Error reading CSV file: {str(e)}")
+            # A failed chunked import may have released the session's samples
+            ensure_samples_loaded()
     
     st.markdown("---")
     
@@ -3956,22 +2897,22 @@ with tab4:
         with st.form("add_sample_form"):
             new_id = st.text_input("Sample ID", placeholder="e.g., Sample-006")
             new_weight = st.number_input("Weight", min_value=0.0, value=100.0, step=0.1)
-            new_unit = st.selectbox("Unit", ["grams", "ounces", "pounds", "kilograms"])
+            new_unit = st.selectbox("Unit", dva_units.WEIGHT_UNITS)
             
             submitted = st.form_submit_button("➕ Add Sample", use_container_width=True)
             
             if submitted:
                 if new_id.strip():
                     # Check for duplicate ID
-                    if any(s['id'] == new_id for s in st.session_state.samples):
+                    if (st.session_state.samples['id'] == new_id).any():
                         st.error(f"Sample ID '{new_id}' already exists!")
                     else:
-                        st.session_state.samples.append({
+                        append_samples(dva_core.typed_samples([{
                             'id': new_id,
                             'weight': new_weight,
                             'unit': new_unit
-                        })
-                        save_data(st.session_state.samples)
+                        }]))
+                        st.session_state.samples = load_data()
                         st.success(f"✅ Sample '{new_id}' added successfully!")
                         time.sleep(1)
                         st.rerun()
@@ -3981,26 +2922,167 @@ with tab4:
     with col2:
         st.markdown("### Existing Samples")
         
-        if st.session_state.samples:
-            st.markdown(f"**Total: {len(st.session_state.samples)} samples**")
+        if not st.session_state.samples.empty:
+            samples = st.session_state.samples
             
-            # Display samples with delete option
-            for idx, sample in enumerate(st.session_state.samples):
-                col_a, col_b = st.columns([4, 1])
-                
-                with col_a:
-                    st.text(f"{sample['id']} - {sample['weight']:.2f} {sample['unit']}")
-                
-                with col_b:
-                    if st.button("🗑️", key=f"delete_{idx}"):
-                        st.session_state.samples.pop(idx)
-                        save_data(st.session_state.samples)
-                        st.success(f"Deleted {sample['id']}")
-                        time.sleep(0.5)
-                        st.rerun()
+            # Filtering and paging run on the DataFrame; only one page is rendered
+            col_f1, col_f2 = st.columns([3, 2])
+            with col_f1:
+                id_query = st.text_input("Filter by ID", key="sample_filter_id", placeholder="e.g., Sample-00")
+            with col_f2:
+                unit_filter = st.multiselect("Units", dva_units.WEIGHT_UNITS, key="sample_filter_units")
+            filtered = dva_core.filter_samples(samples, id_query.strip(), unit_filter)
+            
+            col_p1, col_p2 = st.columns([1, 1])
+            with col_p1:
+                page_size = st.selectbox("Rows per page", [25, 50, 100, 250], key="sample_page_size")
+            with col_p2:
+                page = st.number_input("Page", min_value=1, value=1, step=1, key="sample_page")
+            page_rows, page, page_count = dva_core.paginate(filtered, int(page), page_size)
+            page_rows = page_rows.reset_index(drop=True)
+            
+            st.markdown(f"**Total: {len(samples)} samples** · {len(filtered)} matching · page {page} of {page_count}")
+            
+            edited_samples = st.data_editor(
+                {
+                    'Select': [False] * len(page_rows),
+                    'Sample ID': page_rows['id'],
+                    'Weight': page_rows['weight'],
+                    'Unit': page_rows['unit'],
+                },
+                use_container_width=True,
+                hide_index=True,
+                disabled=['Sample ID', 'Weight', 'Unit'],
+                column_config={
+                    'Select': st.column_config.CheckboxColumn("Select", default=False, width=60),
+                    'Weight': st.column_config.NumberColumn(format="%.2f"),
+                },
+                key=f"sample_grid_{page}_{page_size}_{id_query}_{'-'.join(unit_filter)}",
+            )
+            selected_ids = [sample_id for sample_id, selected
+                            in zip(edited_samples['Sample ID'], edited_samples['Select']) if selected]
+            
+            if st.button(f"🗑️ Delete Selected ({len(selected_ids)})", use_container_width=True,
+                         disabled=not selected_ids, key="delete_selected_samples"):
+                # One store write for the whole selection
+                delete_samples(selected_ids)
+                st.session_state.samples = load_data()
+                st.toast(f"Deleted {len(selected_ids)} sample(s)")
+                st.rerun()
         else:
             st.info("No samples yet. Add your first sample!")
 
+with tab4:
+    if tab4.open:
+        primary_data_tab()
+
+# TAB 5: Portfolio analytics
+TREND_PERIODS = {'Month': 'M', 'Week': 'W', 'Year': 'Y'}
+
+def stats_table(groups, label, unit):
+    """Rows for st.dataframe from ProjectStats.by_designer()/by_month() summaries"""
+    def pct(value):
+        return round(value, 1) if value is not None else None
+    return [{
+        label: name,
+        'Projects': summary['count'],
+        'With box': summary['boxed'],
+        'Mean eff. %': pct(summary['mean_efficiency_pct']),
+        'Min eff. %': pct(summary['min_efficiency_pct']),
+        'Max eff. %': pct(summary['max_efficiency_pct']),
+        f'Box vol. ({unit})': round(dva_units.from_mm3(summary['box_volume_mm3'], unit), 2),
+        f'Product vol. ({unit})': round(dva_units.from_mm3(summary['product_volume_mm3'], unit), 2),
+        f'Void vol. ({unit})': round(dva_units.from_mm3(summary['void_volume_mm3'], unit), 2),
+    } for name, summary in groups.items()]
+
+def portfolio_tab():
+    """Portfolio tab: efficiency and void volume analytics over every stored project"""
+    st.markdown("## 📈 Portfolio Analytics")
+    
+    # Columnar snapshot from the shared cache; saves patch it row by row
+    frame = project_cache.frame()
+    if not len(frame):
+        st.info("📭 No saved projects yet. Save projects in the Analyzer tab to see portfolio analytics.")
+        return
+    
+    project_frame = dva_core.project_frame
+    unit = st.session_state.pref_volume_unit
+    present = sorted({frame.designers[c] for c in set(frame.column('designer').tolist())})
+    
+    filter_col1, filter_col2, filter_col3 = st.columns([2, 2, 1])
+    with filter_col1:
+        designers = st.multiselect("Designers", present, key="portfolio_designers",
+                                   placeholder="All designers")
+    with filter_col2:
+        date_range = ()
+        first, last = project_frame.date_span(frame)
+        if first is not None:
+            date_range = st.date_input("Project date", value=(first, last),
+                                       min_value=first, max_value=last,
+                                       # New dates widen the span; start from the full span then
+                                       key=f"portfolio_dates_{first}_{last}")
+    with filter_col3:
+        period = st.selectbox("Trend by", list(TREND_PERIODS), key="portfolio_period")
+    
+    # A range is only applied once both ends are picked
+    start, end = date_range if len(date_range) == 2 else (None, None)
+    mask = project_frame.frame_mask(frame, designers, start, end)
+    boxed = int(mask.sum())
+    
+    efficiency = frame.column('efficiency_pct')[mask]
+    metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
+    metric_col1.metric("Projects with a box", f"{boxed:,}", delta=f"of {len(frame):,} saved", delta_color="off")
+    metric_col2.metric("Mean efficiency", f"{efficiency.mean():.1f}%" if boxed else "—")
+    metric_col3.metric("At 85% or better", f"{(efficiency >= 85).mean() * 100:.1f}%" if boxed else "—")
+    metric_col4.metric(f"Void volume ({unit})",
+                       f"{dva_units.from_mm3(float(frame.column('void_volume_mm3')[mask].sum()), unit):,.2f}")
+    
+    if not boxed:
+        st.info("💡 No projects with box dimensions match these filters.")
+        return
+    
+    chart_col1, chart_col2 = st.columns(2)
+    with chart_col1:
+        st.markdown("#### Efficiency Distribution")
+        counts, edges = project_frame.efficiency_histogram(frame, mask)
+        st.plotly_chart(cached_figure(create_efficiency_histogram, tuple(counts.tolist()), tuple(edges.tolist())),
+                        use_container_width=True, key="portfolio_histogram")
+    with chart_col2:
+        st.markdown("#### Void Volume by Designer")
+        names, project_counts, voids = project_frame.void_volume_by_designer(frame, mask)
+        st.plotly_chart(cached_figure(create_designer_void_chart, tuple(names),
+                                      tuple(dva_units.from_mm3(voids, unit).tolist()),
+                                      tuple(project_counts.tolist()), unit),
+                        use_container_width=True, key="portfolio_designers_chart")
+    
+    st.markdown("#### Efficiency Trend")
+    periods, mean_efficiency, period_counts = project_frame.efficiency_trend(frame, mask, TREND_PERIODS[period])
+    if len(periods):
+        st.plotly_chart(cached_figure(create_efficiency_trend_chart, tuple(periods.astype(str).tolist()),
+                                      tuple(mean_efficiency.tolist()), tuple(period_counts.tolist())),
+                        use_container_width=True, key="portfolio_trend")
+    else:
+        st.caption("None of these projects has a valid date.")
+    
+    # Unfiltered running totals, maintained on save and delete and stored with the projects
+    totals_panel = st.expander("📋 Running Totals by Designer and Month", expanded=False,
+                               key="portfolio_totals", on_change="rerun")
+    with totals_panel:
+        if totals_panel.open:
+            stats = project_cache.stats()
+            st.dataframe(stats_table(stats.by_designer(), 'Designer', unit),
+                         use_container_width=True, hide_index=True)
+            st.dataframe(stats_table(stats.by_month(), 'Month', unit),
+                         use_container_width=True, hide_index=True)
+
+with tab5:
+    if tab5.open:
+        portfolio_tab()
+
+# DEBUG: Shared figure cache counters (all sessions since server start)
+if st.checkbox("🔍 Debug Figure Cache", value=False, key="debug_figure_cache"):
+    st.json(get_figure_cache().stats())
+
 # Footer
 st.markdown("---")
 st.markdown("""